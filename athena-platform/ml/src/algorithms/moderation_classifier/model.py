@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import re
+import zlib
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import sparse
+
+_NON_WORD = re.compile(r"[\W_]+")
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_CHAR_SALT = 0x51ED27
+_WORD_SALT = 0xA24BAED4
+
+
+def _mix(hashes: np.ndarray, salt: int) -> np.ndarray:
+    hashes = (hashes + np.uint64(salt)) * _MIX
+    return hashes ^ (hashes >> np.uint64(31))
+
+
+def _window_hashes(values: np.ndarray, n: int, base: int) -> np.ndarray:
+    """Polynomial hash of every length-n window of a uint64 array."""
+    powers = np.uint64(base) ** np.arange(n - 1, -1, -1, dtype=np.uint64)
+    return sliding_window_view(values, n) @ powers
+
+
+def hashed_ngrams(
+    text: str,
+    char_ngram_range: Tuple[int, int],
+    word_ngram_range: Tuple[int, int],
+    n_buckets: int,
+) -> np.ndarray:
+    """Stable hash buckets of a text's character and word n-grams (the same in every process)."""
+    normalized = _NON_WORD.sub(" ", text.lower()).strip()
+    parts = []
+
+    chars = np.frombuffer(f" {normalized} ".encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+    for n in range(char_ngram_range[0], min(char_ngram_range[1], len(chars)) + 1):
+        parts.append(_mix(_window_hashes(chars, n, 257), _CHAR_SALT + n))
+
+    tokens = normalized.split()
+    if tokens:
+        words = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64, count=len(tokens))
+        for n in range(word_ngram_range[0], min(word_ngram_range[1], len(tokens)) + 1):
+            parts.append(_mix(_window_hashes(words, n, 1000003), _WORD_SALT + n))
+
+    if not parts:
+        return np.zeros(0, dtype=np.int64)
+    return (np.concatenate(parts) % np.uint64(n_buckets)).astype(np.int64)
+
+
+def hashed_features(
+    texts: Sequence[str],
+    char_ngram_range: Tuple[int, int],
+    word_ngram_range: Tuple[int, int],
+    n_buckets: int,
+) -> sparse.csr_matrix:
+    """L2-normalised log-count rows of hashed n-grams, one per text."""
+    buckets = [hashed_ngrams(text or "", char_ngram_range, word_ngram_range, n_buckets) for text in texts]
+    lengths = np.fromiter((len(b) for b in buckets), dtype=np.int64, count=len(buckets))
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+    indices = np.concatenate(buckets) if buckets else np.zeros(0, dtype=np.int64)
+    features = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(len(texts), n_buckets)
+    )
+    features.sum_duplicates()
+
+    features.data = np.log1p(features.data)
+    row_lengths = np.diff(features.indptr)
+    rows = np.repeat(np.arange(len(texts)), row_lengths)
+    norms = np.sqrt(np.bincount(rows, weights=features.data ** 2, minlength=len(texts)))
+    features.data /= np.repeat(np.where(norms > 0, norms, 1.0), row_lengths).astype(np.float32)
+    return features
+
+
+class ModerationClassifier:
+    """
+    One-vs-rest linear classifier over hashed n-grams.
+
+    Features are hashed straight into ``n_buckets`` columns, so no vocabulary
+    is stored; a batch of texts becomes one sparse matrix and is scored with
+    a single sparse-dense product. An empty artifact gives a classifier with
+    no categories that flags nothing.
+    """
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: np.ndarray,
+        categories: Sequence[str],
+        thresholds: Optional[Sequence[float]] = None,
+        char_ngram_range: Tuple[int, int] = (2, 5),
+        word_ngram_range: Tuple[int, int] = (1, 2),
+    ) -> None:
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.categories = list(categories)
+        self.thresholds = np.asarray(thresholds if thresholds is not None else [0.5] * len(self.categories), dtype=np.float32)
+        self.char_ngram_range = tuple(char_ngram_range)
+        self.word_ngram_range = tuple(word_ngram_range)
+
+    @property
+    def n_buckets(self) -> int:
+        return self.weights.shape[0]
+
+    @classmethod
+    def from_artifact(cls, artifact: Optional[Mapping[str, Any]]) -> "ModerationClassifier":
+        """Rebuild from the dict saved by train.py; an empty artifact gives an untrained classifier."""
+        if not artifact:
+            return cls(np.zeros((1, 0)), np.zeros(0), [])
+        return cls(
+            weights=artifact["weights"],
+            bias=artifact["bias"],
+            categories=artifact["categories"],
+            thresholds=artifact.get("thresholds"),
+            char_ngram_range=tuple(artifact["char_ngram_range"]),
+            word_ngram_range=tuple(artifact["word_ngram_range"]),
+        )
+
+    def to_artifact(self) -> Dict[str, Any]:
+        return {
+            "weights": self.weights,
+            "bias": self.bias,
+            "categories": self.categories,
+            "thresholds": self.thresholds.tolist(),
+            "char_ngram_range": list(self.char_ngram_range),
+            "word_ngram_range": list(self.word_ngram_range),
+        }
+
+    def vectorize(self, texts: Sequence[str]) -> sparse.csr_matrix:
+        return hashed_features(texts, self.char_ngram_range, self.word_ngram_range, self.n_buckets)
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """(texts x categories) probabilities."""
+        if not self.categories or not texts:
+            return np.zeros((len(texts), len(self.categories)), dtype=np.float32)
+        logits = np.asarray(self.vectorize(texts) @ self.weights) + self.bias
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def categories_in(self, texts: Sequence[str]) -> List[List[str]]:
+        """Categories above their threshold for each text."""
+        if not self.categories:
+            return [[] for _ in texts]
+        flagged = self.predict_proba(texts) >= self.thresholds
+        return [[self.categories[j] for j in np.flatnonzero(row)] for row in flagged]
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import joblib
+import numpy as np
+import yaml
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+
+from ml.src.algorithms.moderation_classifier.model import ModerationClassifier, hashed_features
+
+SYNTHETIC_FILLER = [
+    "looking", "for", "advice", "on", "my", "career", "mentor", "team", "project", "interview",
+    "salary", "startup", "remote", "work", "learning", "python", "design", "community", "event",
+    "thanks", "everyone", "today", "week", "goal", "share", "feedback", "women", "tech", "group",
+]
+SYNTHETIC_PHRASES = {
+    "potential_spam": ["click the link in my bio", "earn money fast", "dm me for promo", "free followers", "limited offer"],
+    "scam": ["send a deposit first", "guaranteed returns", "wire the fee", "crypto investment doubles", "gift card payment"],
+    "harassment": ["nobody wants you here", "you are worthless", "shut up and leave", "i will find you", "you are pathetic"],
+}
+LEET = str.maketrans({"e": "3", "o": "0", "i": "1", "a": "4"})
+
+
+def load_config(config_path: Path | None) -> dict:
+    if config_path and config_path.exists():
+        with config_path.open("r", encoding="utf-8") as file:
+            return yaml.safe_load(file)
+    return {}
+
+
+def generate_synthetic_data(n_rows: int) -> Tuple[List[str], List[List[str]]]:
+    """Filler posts, some carrying (sometimes obfuscated) category phrases."""
+    rng = np.random.default_rng(17)
+    categories = list(SYNTHETIC_PHRASES)
+    texts, labels = [], []
+    for _ in range(n_rows):
+        words = [SYNTHETIC_FILLER[int(i)] for i in rng.integers(len(SYNTHETIC_FILLER), size=int(rng.integers(8, 40)))]
+        row_labels = []
+        for category in categories:
+            if rng.uniform() < 0.12:
+                phrase = SYNTHETIC_PHRASES[category][int(rng.integers(len(SYNTHETIC_PHRASES[category])))]
+                if rng.uniform() < 0.3:
+                    phrase = phrase.translate(LEET)
+                words.insert(int(rng.integers(len(words) + 1)), phrase)
+                row_labels.append(category)
+        texts.append(" ".join(words))
+        labels.append(row_labels)
+    return texts, labels
+
+
+def load_dataset(data_path: Path, text_field: str, labels_field: str) -> Tuple[List[str], List[List[str]]]:
+    """Texts and label lists from a JSON-lines file of labelled content."""
+    if not data_path.exists():
+        return generate_synthetic_data(20000)
+    texts, labels = [], []
+    with data_path.open("r", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            texts.append(record.get(text_field) or "")
+            labels.append(list(record.get(labels_field) or []))
+    return texts, labels
+
+
+def tune_threshold(probabilities: np.ndarray, targets: np.ndarray, default: float) -> Tuple[float, dict]:
+    """Threshold with the best F1 on held-out data (ties go to the one nearest ``default``)."""
+    best = (default, {"precision": 0.0, "recall": 0.0, "f1": 0.0})
+    for threshold in np.linspace(0.1, 0.9, 17):
+        predicted = probabilities >= threshold
+        true_positives = float(np.sum(predicted & targets))
+        precision = true_positives / max(float(predicted.sum()), 1.0)
+        recall = true_positives / max(float(targets.sum()), 1.0)
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        if (f1, -abs(threshold - default)) > (best[1]["f1"], -abs(best[0] - default)):
+            best = (round(float(threshold), 2), {"precision": precision, "recall": recall, "f1": f1})
+    return best
+
+
+def train_model(args: argparse.Namespace) -> None:
+    config = load_config(Path(args.config) if args.config else None)
+    schema = config.get("schema", {})
+    model_cfg = config.get("model", {})
+    training = config.get("training", {})
+
+    n_buckets = model_cfg.get("n_buckets", 1 << 18)
+    char_ngram_range = tuple(model_cfg.get("char_ngram_range", [2, 5]))
+    word_ngram_range = tuple(model_cfg.get("word_ngram_range", [1, 2]))
+    default_threshold = training.get("default_threshold", 0.5)
+
+    texts, labels = load_dataset(
+        Path(args.data), schema.get("text_field", "content_text"), schema.get("labels_field", "labels")
+    )
+    categories = sorted({label for row in labels for label in row})
+    targets = np.array([[category in row for category in categories] for row in labels], dtype=bool)
+
+    features = hashed_features(texts, char_ngram_range, word_ngram_range, n_buckets)
+    train_idx, test_idx = train_test_split(
+        np.arange(len(texts)),
+        test_size=training.get("test_split", 0.2),
+        random_state=training.get("random_state", 42),
+    )
+
+    weights = np.zeros((n_buckets, len(categories)), dtype=np.float32)
+    bias = np.zeros(len(categories), dtype=np.float32)
+    for j, category in enumerate(categories):
+        y = targets[train_idx, j]
+        if y.all() or not y.any():
+            bias[j] = 10.0 if y.all() else -10.0
+            continue
+        model = LogisticRegression(C=model_cfg.get("regularization_c", 4.0), solver="liblinear")
+        model.fit(features[train_idx], y)
+        weights[:, j] = model.coef_[0]
+        bias[j] = model.intercept_[0]
+
+    classifier = ModerationClassifier(weights, bias, categories, None, char_ngram_range, word_ngram_range)
+    test_texts = [texts[i] for i in test_idx]
+    start = time.perf_counter()
+    probabilities = classifier.predict_proba(test_texts)
+    ms_per_text = (time.perf_counter() - start) / max(len(test_texts), 1) * 1000
+
+    thresholds, per_category = [], {}
+    for j, category in enumerate(categories):
+        threshold, scores = tune_threshold(probabilities[:, j], targets[test_idx, j], default_threshold)
+        thresholds.append(threshold)
+        per_category[category] = {"threshold": threshold, **scores}
+    classifier.thresholds = np.asarray(thresholds, dtype=np.float32)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(classifier.to_artifact(), output_dir / "model.joblib")
+
+    metrics = {
+        "rows": len(texts),
+        "categories": per_category,
+        "n_buckets": n_buckets,
+        "batch_ms_per_text": ms_per_text,
+    }
+    with (output_dir / "metrics.json").open("w", encoding="utf-8") as file:
+        json.dump(metrics, file, indent=2)
+
+    mean_f1 = float(np.mean([c["f1"] for c in per_category.values()])) if per_category else 0.0
+    print(f"Moderation classifier trained. Categories={len(categories)} Mean F1={mean_f1:.3f} Latency={ms_per_text:.3f} ms/text")
+    print(f"Artifacts saved to: {output_dir}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Train moderation classifier")
+    parser.add_argument("--data", default="ml/data/moderation.jsonl", help="JSONL labelled content path")
+    parser.add_argument("--config", default="ml/config/moderation_classifier.yaml", help="Config YAML path")
+    parser.add_argument("--output-dir", default="ml/artifacts/moderation_classifier", help="Artifact output directory")
+    return parser
+
+
+if __name__ == "__main__":
+    train_model(build_parser().parse_args())
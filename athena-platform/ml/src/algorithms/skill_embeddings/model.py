@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import zlib
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int]) -> List[str]:
+    padded = f"<{text.strip().lower()}>"
+    low, high = ngram_range
+    return [padded[i:i + n] for n in range(low, high + 1) for i in range(len(padded) - n + 1)]
+
+
+def hashed_ngram_buckets(text: str, ngram_range: Tuple[int, int], n_buckets: int) -> np.ndarray:
+    """Stable hash buckets of a string's character n-grams (the same in every process)."""
+    grams = char_ngrams(text, ngram_range)
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) % n_buckets for g in grams), dtype=np.int64, count=len(grams))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+class SkillEmbedder:
+    """
+    Dense vectors for skills and profiles.
+
+    Skills seen in training use their co-occurrence SVD vectors; any other
+    string is embedded from its hashed character n-grams through a projection
+    matrix (learned to map into the SVD space, or random without training).
+    """
+
+    def __init__(
+        self,
+        projection: np.ndarray,
+        ngram_range: Tuple[int, int] = (2, 4),
+        vocabulary: Optional[Mapping[str, int]] = None,
+        vectors: Optional[np.ndarray] = None,
+        cache_size: int = 100000,
+    ) -> None:
+        self.projection = projection.astype(np.float32)
+        self.ngram_range = tuple(ngram_range)
+        self.vocabulary = dict(vocabulary or {})
+        self.vectors = _normalize(vectors.astype(np.float32)) if vectors is not None else np.zeros((0, projection.shape[1]), dtype=np.float32)
+        self._cache: Dict[str, np.ndarray] = {}
+        self._cache_size = cache_size
+
+    @property
+    def dim(self) -> int:
+        return self.projection.shape[1]
+
+    @classmethod
+    def random(cls, dim: int = 64, n_buckets: int = 1 << 15, ngram_range: Tuple[int, int] = (2, 4), seed: int = 7) -> "SkillEmbedder":
+        """Untrained embedder: random projection of hashed n-grams."""
+        rng = np.random.default_rng(seed)
+        return cls(rng.standard_normal((n_buckets, dim)).astype(np.float32) / np.sqrt(dim), ngram_range)
+
+    @classmethod
+    def from_artifact(cls, artifact: Optional[Mapping[str, Any]]) -> "SkillEmbedder":
+        """Rebuild from the dict saved by train.py; an empty artifact gives a random embedder."""
+        if not artifact:
+            return cls.random()
+        return cls(
+            projection=artifact["projection"],
+            ngram_range=tuple(artifact["ngram_range"]),
+            vocabulary={skill: i for i, skill in enumerate(artifact["vocabulary"])},
+            vectors=artifact["vectors"],
+        )
+
+    def to_artifact(self) -> Dict[str, Any]:
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.get)
+        return {
+            "projection": self.projection,
+            "ngram_range": list(self.ngram_range),
+            "vocabulary": vocabulary,
+            "vectors": self.vectors,
+        }
+
+    def ngram_vector(self, text: str) -> np.ndarray:
+        buckets = hashed_ngram_buckets(text, self.ngram_range, self.projection.shape[0])
+        return self.projection[buckets].sum(axis=0)
+
+    def embed(self, skill: str) -> np.ndarray:
+        """Unit vector for one skill."""
+        key = skill.strip().lower()
+        vector = self._cache.get(key)
+        if vector is None:
+            index = self.vocabulary.get(key)
+            vector = self.vectors[index] if index is not None else _normalize(self.ngram_vector(key))
+            if len(self._cache) < self._cache_size:
+                self._cache[key] = vector
+        return vector
+
+    def embed_profile(self, skills: Iterable[str]) -> np.ndarray:
+        """Unit vector for a profile: the normalised mean of its skill vectors."""
+        vectors = [self.embed(skill) for skill in skills if skill.strip()]
+        if not vectors:
+            return np.zeros(self.dim, dtype=np.float32)
+        return _normalize(np.mean(vectors, axis=0))
+
+    def embed_profiles(self, profiles: Sequence[Iterable[str]]) -> np.ndarray:
+        return np.stack([self.embed_profile(skills) for skills in profiles]) if profiles else np.zeros((0, self.dim), dtype=np.float32)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+from pathlib import Path
+from typing import List
+
+import joblib
+import numpy as np
+import yaml
+from scipy import sparse
+from scipy.sparse.linalg import svds
+
+from ml.src.algorithms.skill_embeddings.model import SkillEmbedder, hashed_ngram_buckets
+
+DEFAULT_SKILL_FIELDS = ["expertise_areas", "skills"]
+
+SYNTHETIC_DOMAINS = [
+    "data", "cloud", "product", "marketing", "finance", "design", "security", "sales",
+    "legal", "health", "education", "operations", "hr", "mobile", "web", "ai",
+]
+SYNTHETIC_VARIANTS = [
+    "strategy", "analysis", "engineering", "management", "leadership", "operations",
+    "architecture", "research", "planning", "consulting", "development", "governance",
+]
+
+
+def load_config(config_path: Path | None) -> dict:
+    if config_path and config_path.exists():
+        with config_path.open("r", encoding="utf-8") as file:
+            return yaml.safe_load(file)
+    return {}
+
+
+def generate_synthetic_profiles(n_rows: int) -> List[List[str]]:
+    """Profiles drawing most of their skills from one domain."""
+    rng = np.random.default_rng(11)
+    profiles = []
+    for _ in range(n_rows):
+        domain = SYNTHETIC_DOMAINS[int(rng.integers(len(SYNTHETIC_DOMAINS)))]
+        size = int(rng.integers(3, 9))
+        skills = []
+        for _ in range(size):
+            if rng.uniform() < 0.8:
+                skills.append(f"{domain} {SYNTHETIC_VARIANTS[int(rng.integers(len(SYNTHETIC_VARIANTS)))]}")
+            else:
+                other = SYNTHETIC_DOMAINS[int(rng.integers(len(SYNTHETIC_DOMAINS)))]
+                skills.append(f"{other} {SYNTHETIC_VARIANTS[int(rng.integers(len(SYNTHETIC_VARIANTS)))]}")
+        profiles.append(skills)
+    return profiles
+
+
+def load_profiles(data_path: Path, skill_fields: List[str]) -> List[List[str]]:
+    """Skill lists from a JSON-lines file of mentor or mentee profiles."""
+    if not data_path.exists():
+        return generate_synthetic_profiles(20000)
+    profiles = []
+    with data_path.open("r", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            skills = [s for field in skill_fields for s in record.get(field, [])]
+            if skills:
+                profiles.append(skills)
+    return profiles
+
+
+def cooccurrence_vectors(profiles: List[List[str]], vocabulary: dict, dim: int) -> np.ndarray:
+    """Truncated SVD of the positive PMI matrix of skills listed together."""
+    rows, cols = [], []
+    for skills in profiles:
+        ids = sorted({vocabulary[s] for s in skills if s in vocabulary})
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                rows.extend((a, b))
+                cols.extend((b, a))
+
+    size = len(vocabulary)
+    counts = sparse.coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(size, size)).tocsr()
+    counts.sum_duplicates()
+    totals = np.asarray(counts.sum(axis=1)).ravel()
+    grand_total = totals.sum()
+
+    coo = counts.tocoo()
+    pmi = np.log(coo.data * grand_total / (totals[coo.row] * totals[coo.col]))
+    positive = pmi > 0
+    ppmi = sparse.csr_matrix((pmi[positive], (coo.row[positive], coo.col[positive])), shape=(size, size))
+
+    k = min(dim, size - 1)
+    u, s, _ = svds(ppmi, k=k)
+    vectors = np.zeros((size, dim), dtype=np.float32)
+    vectors[:, :k] = u * np.sqrt(s)
+    return vectors
+
+
+def ngram_features(skills: List[str], ngram_range, n_buckets: int) -> sparse.csr_matrix:
+    indptr, indices = [0], []
+    for skill in skills:
+        indices.extend(hashed_ngram_buckets(skill, ngram_range, n_buckets).tolist())
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(skills), n_buckets))
+
+
+def fit_projection(features: sparse.csr_matrix, targets: np.ndarray, alpha: float) -> np.ndarray:
+    """Ridge regression from n-gram features to skill vectors, solved in the dual (vocab x vocab)."""
+    gram = (features @ features.T).toarray() + alpha * np.eye(features.shape[0])
+    dual = np.linalg.solve(gram, targets)
+    return np.asarray(features.T @ dual, dtype=np.float32)
+
+
+def unit(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def train_model(args: argparse.Namespace) -> None:
+    config = load_config(Path(args.config) if args.config else None)
+    skill_fields = config.get("schema", {}).get("skill_fields", DEFAULT_SKILL_FIELDS)
+    model_cfg = config.get("model", {})
+    training = config.get("training", {})
+
+    dim = model_cfg.get("dim", 64)
+    ngram_range = tuple(model_cfg.get("ngram_range", [2, 4]))
+    n_buckets = model_cfg.get("n_buckets", 1 << 15)
+    rng = np.random.default_rng(training.get("random_state", 42))
+
+    profiles = [[s.strip().lower() for s in skills] for skills in load_profiles(Path(args.data), skill_fields)]
+    counts = Counter(s for skills in profiles for s in set(skills))
+    vocabulary_list = sorted(s for s, c in counts.items() if c >= training.get("min_count", 2))
+    vocabulary = {s: i for i, s in enumerate(vocabulary_list)}
+    vectors = unit(cooccurrence_vectors(profiles, vocabulary, dim))
+
+    # Fit the n-gram projection on the most frequent skills, holding some out
+    # to measure how well unseen skills land near their co-occurrence vectors
+    fit_size = min(len(vocabulary_list), model_cfg.get("max_projection_vocab", 5000))
+    frequent = np.array(sorted(range(len(vocabulary_list)), key=lambda i: -counts[vocabulary_list[i]])[:fit_size])
+    rng.shuffle(frequent)
+    holdout_size = int(len(frequent) * training.get("holdout_fraction", 0.1))
+    holdout, fit = frequent[:holdout_size], frequent[holdout_size:]
+
+    features = ngram_features(vocabulary_list, ngram_range, n_buckets)
+    alpha = model_cfg.get("ridge_alpha", 1.0)
+    projection = fit_projection(features[fit], vectors[fit], alpha)
+    holdout_cosine = float(np.mean(np.sum(unit(features[holdout] @ projection) * vectors[holdout], axis=1))) if holdout_size else 0.0
+    projection = fit_projection(features[frequent], vectors[frequent], alpha)
+
+    embedder = SkillEmbedder(projection, ngram_range, vocabulary, vectors)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(embedder.to_artifact(), output_dir / "model.joblib")
+
+    metrics = {
+        "profiles": len(profiles),
+        "vocabulary": len(vocabulary_list),
+        "dim": dim,
+        "holdout_ngram_cosine": holdout_cosine,
+    }
+    with (output_dir / "metrics.json").open("w", encoding="utf-8") as file:
+        json.dump(metrics, file, indent=2)
+
+    print(f"Skill embeddings trained. Vocabulary={len(vocabulary_list)} Holdout n-gram cosine={holdout_cosine:.3f}")
+    print(f"Artifacts saved to: {output_dir}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Train skill embeddings")
+    parser.add_argument("--data", default="ml/data/mentors.jsonl", help="JSONL profiles path")
+    parser.add_argument("--config", default="ml/config/skill_embeddings.yaml", help="Config YAML path")
+    parser.add_argument("--output-dir", default="ml/artifacts/skill_embeddings", help="Artifact output directory")
+    return parser
+
+
+if __name__ == "__main__":
+    train_model(build_parser().parse_args())
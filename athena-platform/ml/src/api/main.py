@@ -9,6 +9,7 @@ from __future__ import annotations
 import os
 import time
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from fastapi import FastAPI, HTTPException, Request, status
@@ -39,8 +40,32 @@ async def lifespan(app: FastAPI):
     print("🚀 Loading ML models...")
     await model_loader.load_all_models()
     print("✅ ML models loaded successfully")
+    data_path = Path(os.getenv("DATA_PATH", "data"))
+    loaded = ranker.candidate_store.load_jsonl(data_path / "ranking_candidates.jsonl")
+    loaded += feed.candidate_store.load_jsonl(data_path / "feed_candidates.jsonl")
+    print(f"✅ Loaded {loaded} stored candidates")
+    users = feed.follow_graph.load_jsonl(data_path / "follow_graph.jsonl")
+    print(f"✅ Loaded follow graph for {users} users")
+    mentors = mentor_match.mentor_pool.load_jsonl(data_path / "mentors.jsonl")
+    print(f"✅ Loaded {mentors} mentors")
+    indexed = mentor_match.index_mentor_pool()
+    print(f"✅ Indexed {indexed} mentor embeddings")
+    mentees = mentor_match.mentee_pool.load_jsonl(data_path / "mentees.jsonl")
+    print(f"✅ Loaded {mentees} mentees")
+    if safety_score.moderation_lexicon.reload():
+        print(f"✅ Loaded {safety_score.moderation_lexicon.stats()['terms']} moderation terms")
+    await feed.signal_log.start(data_path / "signals")
+    await feed.trending.start(data_path / "trending.npz")
+    await safety_score.signal_store.start(data_path / "safety_signals.npz")
+    print(f"✅ Restored safety signals for {len(safety_score.signal_store)} users")
+    await feed.precomputer.start()
     yield
     print("🛑 Shutting down ML service...")
+    await feed.precomputer.stop()
+    safety_score.moderation_pool.close()
+    await feed.signal_log.stop()
+    await feed.trending.stop()
+    await safety_score.signal_store.stop()
     await model_loader.cleanup()
 
 
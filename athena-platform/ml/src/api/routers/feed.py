@@ -6,13 +6,31 @@ Intelligent content mixing for the main feed experience.
 
 from __future__ import annotations
 
+import base64
+import json
+import secrets
+from collections import deque
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 from enum import Enum
 from datetime import datetime
 
+import numpy as np
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
 
+from src.api.services.candidate_store import CandidateStore
+from src.api.services.feed_mixer import FeedMixer, assign_buckets
+from src.api.services.feed_precompute import FeedPrecomputer
+from src.api.services.feed_scoring import REASONS, FeedCandidateArrays, interest_overlap, score_candidates
+from src.api.services.follow_graph import FollowGraph
+from src.api.services.seen_filter import SeenItemFilter
+from src.api.services.signal_log import SignalLog
+from src.api.services.streaming import ndjson_response
+from src.api.services.trending import ENGAGEMENT_WEIGHTS, TrendingEngine
+from src.api.services.ttl_cache import TTLCache
+from src.api.services.user_context_cache import PreparedUserContext, UserContextCache, hash_keys
+
 router = APIRouter()
 
 
@@ -31,6 +49,13 @@ class FeedItemType(str, Enum):
     STORY = "story"
 
 
+FEED_ITEM_TYPES = list(FeedItemType)
+_ITEM_CODE = {item_type: code for code, item_type in enumerate(FEED_ITEM_TYPES)}
+
+# Author membership in each follow-graph relation, as returned by FollowGraph.author_masks
+AuthorMasks = tuple[np.ndarray, ...]
+
+
 class FeedContext(str, Enum):
     HOME = "home"
     EXPLORE = "explore"
@@ -46,7 +71,7 @@ class FeedContext(str, Enum):
 class FeedUserContext(BaseModel):
     """User context for feed generation."""
     user_id: str
-    persona: str
+    persona: str = "general"
     interests: List[str] = Field(default_factory=list)
     followed_users: List[str] = Field(default_factory=list)
     followed_organizations: List[str] = Field(default_factory=list)
@@ -60,6 +85,9 @@ class FeedUserContext(BaseModel):
     # Preferences
     preferred_content_types: List[FeedItemType] = Field(default_factory=list)
     language: str = "en"
+    
+    # Cached context version; send with user_id only once cached
+    version: Optional[int] = Field(None, ge=0)
 
 
 class FeedCandidate(BaseModel):
@@ -92,14 +120,18 @@ class FeedItem(BaseModel):
     position: int
     reason: str
     is_sponsored: bool = False
+    author_id: Optional[str] = None
 
 
 class FeedGenerationRequest(BaseModel):
     """Request to generate feed."""
     user_context: FeedUserContext
     candidates: List[FeedCandidate] = Field(default_factory=list)
+    candidate_ids: List[str] = Field(default_factory=list, description="Ids of candidates held in the candidate store")
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=20, ge=1, le=50)
+    cursor: Optional[str] = Field(None, description="Opaque cursor from a previous response")
+    stream: bool = Field(default=False, description="Stream feed items as NDJSON")
     
     # Mixing configuration
     mix_config: Optional[Dict[str, float]] = None
@@ -112,6 +144,32 @@ class FeedGenerationResponse(BaseModel):
     has_more: bool
     mix_ratios: Dict[str, float]
     generation_time_ms: float
+    missing_candidate_ids: List[str] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+class FeedCandidateUpsertRequest(BaseModel):
+    """Batch of feed candidates to store server-side."""
+    candidates: List[FeedCandidate] = Field(..., min_length=1, max_length=10000)
+
+
+class FollowGraphEntry(BaseModel):
+    """A user's relations; omitted lists are left unchanged."""
+    user_id: str
+    followed_users: Optional[List[str]] = None
+    followed_organizations: Optional[List[str]] = None
+    blocked_users: Optional[List[str]] = None
+
+
+class FollowGraphUpsertRequest(BaseModel):
+    """Batch of follow-graph updates."""
+    users: List[FollowGraphEntry] = Field(..., min_length=1, max_length=10000)
+
+
+class SeenItemsRequest(BaseModel):
+    """Items shown to a user (impressions)."""
+    user_id: str
+    item_ids: List[str] = Field(..., min_length=1, max_length=1000)
 
 
 # ===========================================
@@ -146,6 +204,111 @@ DEFAULT_MIX_RATIOS = {
 }
 
 
+# Longest run of one content type / one author allowed in a feed page
+MAX_TYPE_RUN = 3
+MAX_AUTHOR_RUN = 2
+# How far into a type's queue to look for another author when its head would extend an author run
+AUTHOR_LOOKAHEAD = 10
+
+# Bucket eligibility rules
+TRENDING_QUANTILE = 0.85
+TRENDING_TOP_ITEMS = 200
+TRENDING_TOP_TAGS = 20
+NEWS_TAG_KEYS = hash_keys(["news", "industry_news", "industry news", "announcement"])
+TUTORIAL_TAG_KEYS = hash_keys(["tutorial", "how-to", "howto", "guide"])
+PROFESSIONAL_CODES = np.array(
+    [FEED_ITEM_TYPES.index(t) for t in (FeedItemType.POST, FeedItemType.VIDEO, FeedItemType.EVENT)],
+    dtype=np.int16
+)
+
+# Feeds precomputed in the background for active users, and how many items
+# per bucket are kept (enough for every page up to this many items)
+PRECOMPUTE_CONTEXTS = (FeedContext.HOME.value, FeedContext.EXPLORE.value)
+PRECOMPUTE_DEPTH = 100
+
+# Ranked candidates held by all cached feed sessions together; least recently
+# used sessions are dropped beyond this (about 50 bytes per candidate)
+FEED_SESSION_MAX_CANDIDATES = 5_000_000
+
+
+# ===========================================
+# CANDIDATE STORE & CACHES
+# ===========================================
+
+@dataclass
+class RunState:
+    """Content type and author runs at the end of the feed so far."""
+    last_type: Optional[FeedItemType] = None
+    type_run: int = 0
+    last_author: Optional[str] = None
+    author_run: int = 0
+
+
+@dataclass
+class SessionCandidates:
+    """Fields of ranked candidates a session needs to build feed items (no tags or engagement counts)."""
+    ids: List[str]
+    author_ids: List[str]
+    item_type_codes: np.ndarray
+    is_sponsored: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def of(cls, candidates: FeedCandidateArrays) -> "SessionCandidates":
+        return cls(candidates.ids, candidates.author_ids, candidates.item_type_codes, candidates.is_sponsored)
+
+
+@dataclass
+class FeedSession:
+    """Scored candidates and the feed mixed from them so far, for one user session."""
+    token: str
+    candidates: SessionCandidates
+    scores: np.ndarray
+    reasons: np.ndarray
+    mixer: FeedMixer
+    mix_ratios: Dict[str, float]
+    missing_candidate_ids: List[str] = field(default_factory=list)
+    items: List[FeedItem] = field(default_factory=list)
+    # Set for sessions started from a precomputed feed: once its items run
+    # out, the rest of the candidate store is ranked for this context
+    context: Optional[PreparedUserContext] = None
+    # Runs carried across pages, so diversity limits hold at page boundaries
+    runs: RunState = field(default_factory=RunState)
+
+
+@dataclass
+class PrecomputedFeed:
+    """Top scored store candidates per bucket for one user and feed context."""
+    version: Optional[int]
+    watermark: int
+    candidates: FeedCandidateArrays
+    scores: np.ndarray
+    reasons: np.ndarray
+    followed: np.ndarray
+    buckets: np.ndarray
+
+
+candidate_store = CandidateStore(FeedCandidate)
+context_cache = UserContextCache()
+feed_sessions: TTLCache[FeedSession] = TTLCache(
+    max_entries=20000,
+    ttl_seconds=1800,
+    weigher=lambda session: len(session.candidates),
+    max_weight=FEED_SESSION_MAX_CANDIDATES
+)
+signal_log = SignalLog()
+trending = TrendingEngine()
+seen_items = SeenItemFilter()
+follow_graph = FollowGraph()
+# The compute callback is looked up lazily; it is defined with the helpers below
+precomputer: FeedPrecomputer[PrecomputedFeed] = FeedPrecomputer(
+    lambda user_id, feed_context, context: _precompute_feed(user_id, feed_context, context),
+    PRECOMPUTE_CONTEXTS
+)
+
+
 # ===========================================
 # ENDPOINTS
 # ===========================================
@@ -165,13 +328,50 @@ async def generate_feed(request: FeedGenerationRequest):
     - Diversity (content types, authors)
     - Freshness
     - User engagement patterns
+    
+    The first call scores all candidates once and caches them for the session;
+    pages are then filled from per-bucket heaps following the mix ratios. Pass
+    the returned ``next_cursor`` to fetch later pages without rescoring.
+    
+    Without ``candidates`` or ``candidate_ids`` the whole candidate store is
+    ranked. For such requests with a versioned context, HOME and EXPLORE
+    feeds of active users are precomputed in the background and only
+    candidates added since are scored.
+    
+    With ``stream=true`` the feed items are sent as NDJSON, one item per
+    line, followed by a ``summary`` line with the response metadata.
     """
     import time
     start = time.time()
     
+    if request.cursor:
+        session_key, session, offset = _resolve_cursor(request.cursor)
+        return _feed_page(request, session_key, session, offset, start)
+    
+    prepared = context_cache.resolve(request.user_context)
+    if prepared is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"User context version {request.user_context.version} is not cached or is older than the cached one; "
+                "resend the full current context"
+            )
+        )
+    
     try:
         context = request.user_context
-        candidates = request.candidates
+        if _uses_precompute(request):
+            precomputer.touch(context.user_id, prepared)
+        
+        precomputed = _precomputed_feed(request, prepared)
+        if precomputed is not None:
+            candidates, scored, assigned = _extend_precomputed(precomputed, request, prepared)
+            missing_ids = []
+            masks = None
+        else:
+            candidates, missing_ids = _resolve_candidates(request)
+            candidates, masks = _filter_candidates(candidates, prepared)
+            scored = assigned = None
         
         # Get mix ratios
         mix_ratios = request.mix_config or DEFAULT_MIX_RATIOS.get(
@@ -179,36 +379,27 @@ async def generate_feed(request: FeedGenerationRequest):
             DEFAULT_MIX_RATIOS[FeedContext.HOME]
         )
         
-        # If no candidates provided, return empty (in production, would fetch from DB)
-        if not candidates:
-            return FeedGenerationResponse(
-                feed_items=[],
-                page=request.page,
-                has_more=False,
-                mix_ratios=mix_ratios,
-                generation_time_ms=0
-            )
-        
-        # Score and rank candidates
-        scored_items = _score_candidates(candidates, context)
-        
-        # Apply mixing strategy
-        mixed_feed = _apply_mixing(scored_items, mix_ratios, request.page_size)
-        
-        # Apply diversity
-        diverse_feed = _ensure_diversity(mixed_feed)
-        
-        # Add positions
-        for i, item in enumerate(diverse_feed):
-            item.position = (request.page - 1) * request.page_size + i + 1
+        # Score candidates once; pages are mixed and diversified lazily
+        scores, reasons, mixer = _rank_feed(candidates, prepared, mix_ratios, scored, assigned, masks)
         
-        return FeedGenerationResponse(
-            feed_items=diverse_feed,
-            page=request.page,
-            has_more=len(candidates) > len(diverse_feed),
+        session = FeedSession(
+            token=secrets.token_urlsafe(6),
+            candidates=SessionCandidates.of(candidates),
+            scores=scores,
+            reasons=reasons,
+            mixer=mixer,
             mix_ratios=mix_ratios,
-            generation_time_ms=round((time.time() - start) * 1000, 2)
+            missing_candidate_ids=missing_ids,
+            context=prepared if precomputed is not None else None
         )
+        session_key = (
+            context.user_id,
+            context.feed_context.value,
+            context.session_id or secrets.token_urlsafe(12)
+        )
+        feed_sessions.set(session_key, session)
+        
+        return _feed_page(request, session_key, session, (request.page - 1) * request.page_size, start)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -219,8 +410,8 @@ async def generate_feed(request: FeedGenerationRequest):
 @router.post("/refresh-signal")
 async def record_refresh_signal(user_id: str, feed_context: FeedContext):
     """Record that a user refreshed their feed (for learning)."""
-    # In production, this would be stored for model training
-    return {"status": "recorded", "user_id": user_id}
+    recorded = await signal_log.record("refresh", user_id, feed_context=feed_context.value)
+    return {"status": "recorded" if recorded else "dropped", "user_id": user_id}
 
 
 @router.post("/engagement-signal")
@@ -231,14 +422,105 @@ async def record_engagement(
     dwell_time_seconds: Optional[float] = None
 ):
     """Record user engagement for feed optimization."""
-    # In production, this would update the engagement model
+    rows, _ = candidate_store.lookup([item_id])
+    tags = candidate_store.objects("tags", rows)[0] if len(rows) else []
+    trending.record(item_id, tags, ENGAGEMENT_WEIGHTS.get(engagement_type, 1.0))
+    seen_items.mark_seen(user_id, [item_id])
+    
+    recorded = await signal_log.record(
+        "engagement",
+        user_id,
+        item_id=item_id,
+        engagement_type=engagement_type,
+        dwell_time_seconds=dwell_time_seconds
+    )
     return {
-        "status": "recorded",
+        "status": "recorded" if recorded else "dropped",
         "item_id": item_id,
         "engagement_type": engagement_type
     }
 
 
+@router.get("/trending")
+async def get_trending(limit: int = 20):
+    """Get currently trending items and tags."""
+    limit = max(1, min(limit, TRENDING_TOP_ITEMS))
+    return {
+        "items": [{"id": k, "score": round(v, 3)} for k, v in trending.top_items(limit)],
+        "tags": [{"tag": k, "score": round(v, 3)} for k, v in trending.top_tags(min(limit, TRENDING_TOP_TAGS))],
+        "stats": trending.stats()
+    }
+
+
+@router.post("/follow-graph")
+async def upsert_follow_graph(request: FollowGraphUpsertRequest):
+    """Replace the follows, organization follows and blocks of a batch of users."""
+    for entry in request.users:
+        follow_graph.upsert(
+            entry.user_id,
+            followed_users=entry.followed_users,
+            followed_organizations=entry.followed_organizations,
+            blocked_users=entry.blocked_users
+        )
+    return {"upserted": len(request.users), "total": len(follow_graph)}
+
+
+@router.get("/follow-graph/stats")
+async def get_follow_graph_stats():
+    """Get follow graph size and memory usage."""
+    return follow_graph.stats()
+
+
+@router.post("/seen-items")
+async def record_seen_items(request: SeenItemsRequest):
+    """Record items shown to a user so later feeds skip them."""
+    seen_items.mark_seen(request.user_id, request.item_ids)
+    return {"status": "recorded", "user_id": request.user_id, "count": len(request.item_ids)}
+
+
+@router.get("/seen-items/stats")
+async def get_seen_items_stats():
+    """Get seen-item filter size and memory use per million users."""
+    return seen_items.stats()
+
+
+@router.get("/signals/stats")
+async def get_signal_log_stats():
+    """Get engagement signal queue depth and drop counters."""
+    return signal_log.stats()
+
+
+@router.post("/candidates")
+async def upsert_candidates(request: FeedCandidateUpsertRequest):
+    """Insert or update candidates in the server-side candidate store."""
+    upserted = candidate_store.upsert(request.candidates)
+    return {"upserted": upserted, "total": len(candidate_store)}
+
+
+@router.get("/candidates/stats")
+async def get_candidate_store_stats():
+    """Get candidate store size and memory usage."""
+    return candidate_store.stats()
+
+
+@router.get("/context-cache/stats")
+async def get_context_cache_stats():
+    """Get user context cache size and hit ratio."""
+    return context_cache.stats()
+
+
+@router.get("/sessions/stats")
+async def get_feed_session_stats():
+    """Get ranked-feed session cache size and hit ratio."""
+    return feed_sessions.stats()
+
+
+@router.get("/precompute/stats")
+async def get_precompute_stats():
+    """Get background feed precomputation counters and cache hit ratio."""
+    return precomputer.stats()
+
+
 @router.get("/mix-config/{context}")
 async def get_mix_config(context: FeedContext):
     """Get the mixing configuration for a feed context."""
@@ -252,141 +534,416 @@ async def get_mix_config(context: FeedContext):
 # HELPER FUNCTIONS
 # ===========================================
 
-def _score_candidates(candidates: List[FeedCandidate], context: FeedUserContext) -> List[FeedItem]:
-    """Score candidates based on relevance."""
-    scored = []
+def _encode_cursor(session_key: tuple, token: str, offset: int) -> str:
+    """Encode an opaque pagination cursor."""
+    payload = json.dumps([list(session_key), token, offset], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _resolve_cursor(cursor: str) -> tuple[tuple, FeedSession, int]:
+    """Decode a cursor and look up its cached feed session."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, token, offset = json.loads(base64.urlsafe_b64decode(padded))
+        session_key = tuple(key)
+        offset = int(offset)
+        # Session keys are flat (user_id, feed_context, session_id) tuples
+        if not isinstance(key, list) or not all(part is None or isinstance(part, str) for part in key):
+            raise ValueError("malformed session key")
+        if not isinstance(token, str) or offset < 0:
+            raise ValueError("malformed token or offset")
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid feed cursor")
     
-    for candidate in candidates:
-        score = _calculate_item_score(candidate, context)
-        reason = _determine_reason(candidate, context)
-        
-        scored.append(FeedItem(
-            id=candidate.id,
-            item_type=candidate.item_type,
-            score=score,
-            position=0,  # Will be set later
-            reason=reason,
-            is_sponsored=candidate.is_sponsored
-        ))
+    session = feed_sessions.get(session_key)
+    if session is None or session.token != token:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Feed session expired; request the first page again"
+        )
+    return session_key, session, offset
+
+
+def _feed_page(
+    request: FeedGenerationRequest,
+    session_key: tuple,
+    session: FeedSession,
+    offset: int,
+    start: float
+):
+    """Slice one page out of a cached session feed."""
+    import time
+    
+    end = offset + request.page_size
+    size = len(session.candidates)
+    _fill_session(session, end + 1, request.page_size)
+    if len(session.candidates) != size:
+        # Continuing from the store replaced the candidates; re-weigh the session
+        feed_sessions.set(session_key, session)
+    page_items = session.items[offset:end]
+    has_more = end < len(session.items)
+    next_cursor = _encode_cursor(session_key, session.token, end) if has_more else None
+    page = offset // request.page_size + 1
+    generation_time_ms = round((time.time() - start) * 1000, 2)
+    
+    if request.stream:
+        return ndjson_response(page_items, {
+            "page": page,
+            "has_more": has_more,
+            "mix_ratios": session.mix_ratios,
+            "generation_time_ms": generation_time_ms,
+            "missing_candidate_ids": session.missing_candidate_ids,
+            "next_cursor": next_cursor,
+        })
+    
+    return FeedGenerationResponse(
+        feed_items=page_items,
+        page=page,
+        has_more=has_more,
+        mix_ratios=session.mix_ratios,
+        generation_time_ms=generation_time_ms,
+        missing_candidate_ids=session.missing_candidate_ids,
+        next_cursor=next_cursor
+    )
+
+
+def _resolve_candidates(request: FeedGenerationRequest) -> tuple[FeedCandidateArrays, List[str]]:
+    """Column-wise candidates from the request and the candidate store (all of it if none given)."""
+    if not request.candidates and not request.candidate_ids:
+        return FeedCandidateArrays.from_store(candidate_store, np.arange(len(candidate_store))), []
+    parts = [FeedCandidateArrays.from_candidates(request.candidates, FEED_ITEM_TYPES)]
+    missing_ids: List[str] = []
+    if request.candidate_ids:
+        rows, missing_ids = candidate_store.lookup(request.candidate_ids)
+        parts.append(FeedCandidateArrays.from_store(candidate_store, rows))
+    return FeedCandidateArrays.concat(parts), missing_ids
+
+
+def _filter_candidates(
+    candidates: FeedCandidateArrays,
+    context: PreparedUserContext
+) -> tuple[FeedCandidateArrays, Optional[AuthorMasks]]:
+    """
+    Remove candidates from blocked authors and those the user has (probably) already seen.
+    
+    Returns the kept candidates and the follow-graph masks of their authors
+    (None if the user is not in the graph), for scoring without a second lookup.
+    """
+    masks = follow_graph.author_masks(context.user_id, candidates.author_ids)
+    drop = _filter_mask(candidates, context, hash_keys(candidates.ids), masks)
+    if not drop.any():
+        return candidates, masks
+    keep = ~drop
+    return candidates.take(keep), tuple(mask[keep] for mask in masks) if masks is not None else None
+
+
+def _filter_mask(
+    candidates: FeedCandidateArrays,
+    context: PreparedUserContext,
+    id_keys: np.ndarray,
+    masks: Optional[AuthorMasks]
+) -> np.ndarray:
+    """Candidates from blocked authors or (probably) already seen by the user."""
+    if masks is not None:
+        blocked = masks[2]
+    else:
+        blocked = np.isin(candidates.author_keys, context.blocked_user_keys)
+    return blocked | seen_items.seen_mask(context.user_id, id_keys)
+
+
+def _score_candidates(
+    candidates: FeedCandidateArrays,
+    context: PreparedUserContext,
+    now: float,
+    masks: Optional[AuthorMasks]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Score candidates based on relevance. Returns scores, reason codes and followed mask.
+    
+    ``masks`` are the follow-graph masks returned by ``_filter_candidates``.
+    """
+    preferred_codes = np.fromiter(
+        (FEED_ITEM_TYPES.index(t) for t in context.preferred_content_types), dtype=np.int16
+    )
+    return score_candidates(candidates, context, now, preferred_codes, masks[:2] if masks else None)
+
+
+def _bucket_masks(candidates: FeedCandidateArrays, followed: np.ndarray, now: float) -> Dict[str, np.ndarray]:
+    """Eligibility of each candidate for every mixing bucket."""
+    codes = candidates.item_type_codes
     
-    return scored
+    return {
+        "sponsored": candidates.is_sponsored,
+        "following": followed,
+        "jobs": codes == _ITEM_CODE[FeedItemType.JOB],
+        "courses": codes == _ITEM_CODE[FeedItemType.COURSE],
+        "mentors": codes == _ITEM_CODE[FeedItemType.MENTOR],
+        "tutorials": (codes == _ITEM_CODE[FeedItemType.VIDEO]) | (interest_overlap(candidates, TUTORIAL_TAG_KEYS) > 0),
+        "industry_news": interest_overlap(candidates, NEWS_TAG_KEYS) > 0,
+        "trending": _trending_mask(candidates, now),
+        "professional_content": np.isin(codes, PROFESSIONAL_CODES),
+    }
 
 
-def _calculate_item_score(candidate: FeedCandidate, context: FeedUserContext) -> float:
-    """Calculate relevance score for a feed item."""
-    score = 0.0
+def _trending_mask(candidates: FeedCandidateArrays, now: float) -> np.ndarray:
+    """Candidates that are trending now, or have the highest engagement velocity without signal data."""
+    if len(trending):
+        top_items = hash_keys(k for k, _ in trending.top_items(TRENDING_TOP_ITEMS, now))
+        top_tags = hash_keys(k for k, _ in trending.top_tags(TRENDING_TOP_TAGS, now))
+        return np.isin(hash_keys(candidates.ids), top_items) | (interest_overlap(candidates, top_tags) > 0)
     
-    # Base quality score
-    score += candidate.content_quality_score * 30
+    # Engagement velocity with gravity, as used by most "hot" rankings
+    engagement = candidates.like_count + candidates.comment_count * 2 + candidates.share_count * 3
+    age_hours = np.maximum(0.0, (now - candidates.created_at) / 3600)
+    velocity = engagement / (age_hours + 2) ** 1.5
+    threshold = np.quantile(velocity, TRENDING_QUANTILE) if len(velocity) else 0.0
+    return (velocity > 0) & (velocity >= threshold)
+
+
+def _assign_buckets(
+    candidates: FeedCandidateArrays,
+    followed: np.ndarray,
+    mix_ratios: Dict[str, float],
+    now: float
+) -> tuple[List[str], np.ndarray, Dict[str, float]]:
+    """Mixing bucket of every candidate. Returns bucket names, indices and weights."""
+    # Sponsored content keeps its default share unless configured otherwise
+    weights = {"sponsored": 0.1, **mix_ratios}
+    names, buckets = assign_buckets(_bucket_masks(candidates, followed, now), weights, len(candidates))
+    return names, buckets, weights
+
+
+def _rank_feed(
+    candidates: FeedCandidateArrays,
+    context: PreparedUserContext,
+    mix_ratios: Dict[str, float],
+    scored: Optional[tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    assigned: Optional[tuple[List[str], np.ndarray]] = None,
+    masks: Optional[AuthorMasks] = None
+) -> tuple[np.ndarray, np.ndarray, FeedMixer]:
+    """
+    Score candidates once and set up the bucketed mixer over them.
     
-    # From followed users/orgs boost
-    if candidate.author_id in context.followed_users:
-        score += 25
-    if candidate.author_id in context.followed_organizations:
-        score += 20
+    ``scored`` and ``assigned`` pass in scores and buckets that are already known;
+    ``masks`` are the authors' follow-graph masks used for scoring otherwise.
+    """
+    import time
+    
+    now = time.time()
+    scores, reasons, followed = scored if scored is not None else _score_candidates(candidates, context, now, masks)
+    names, buckets, weights = _assign_buckets(candidates, followed, mix_ratios, now)
+    if assigned is not None:
+        names, buckets = assigned
+    return scores, reasons, FeedMixer(scores, buckets, names, weights)
+
+
+def _precompute_feed(user_id: str, feed_context: str, context: PreparedUserContext) -> PrecomputedFeed:
+    """Score the whole candidate store for a user, keeping the top items of every bucket."""
+    import time
     
-    # Interest matching
-    user_interests = set(i.lower() for i in context.interests)
-    candidate_tags = set(t.lower() for t in candidate.tags)
-    interest_overlap = len(user_interests & candidate_tags)
-    score += min(20, interest_overlap * 5)
+    now = time.time()
+    # Read before the rows, so a write racing with this precompute is rescored later
+    watermark = candidate_store.version
+    candidates = FeedCandidateArrays.from_store(candidate_store, np.arange(len(candidate_store)))
+    candidates, masks = _filter_candidates(candidates, context)
+    scores, reasons, followed = _score_candidates(candidates, context, now, masks)
+    names, buckets, _ = _assign_buckets(candidates, followed, DEFAULT_MIX_RATIOS[FeedContext(feed_context)], now)
     
-    # Engagement signals (normalized)
-    engagement = (
-        candidate.like_count * 1 +
-        candidate.comment_count * 2 +
-        candidate.share_count * 3
+    keep = np.zeros(len(candidates), dtype=bool)
+    for bucket in np.unique(buckets):
+        members = np.flatnonzero(buckets == bucket)
+        if len(members) > PRECOMPUTE_DEPTH:
+            members = members[np.argpartition(-scores[members], PRECOMPUTE_DEPTH)[:PRECOMPUTE_DEPTH]]
+        keep[members] = True
+    
+    return PrecomputedFeed(
+        version=context.version,
+        watermark=watermark,
+        candidates=candidates.take(keep),
+        scores=scores[keep],
+        reasons=reasons[keep],
+        followed=followed[keep],
+        buckets=buckets[keep]
     )
-    score += min(15, engagement / 100)
-    
-    # Freshness (decay over time)
-    age_hours = (datetime.utcnow() - candidate.created_at).total_seconds() / 3600
-    freshness = max(0, 10 - (age_hours / 24))  # Decays over 10 days
-    score += freshness
-    
-    # Preferred content type bonus
-    if candidate.item_type in context.preferred_content_types:
-        score += 5
-    
-    return min(100, score)
-
-
-def _determine_reason(candidate: FeedCandidate, context: FeedUserContext) -> str:
-    """Determine why this item is being shown."""
-    if candidate.is_sponsored:
-        return "Sponsored"
-    if candidate.author_id in context.followed_users:
-        return "From someone you follow"
-    if candidate.author_id in context.followed_organizations:
-        return "From an organization you follow"
-    
-    user_interests = set(i.lower() for i in context.interests)
-    candidate_tags = set(t.lower() for t in candidate.tags)
-    if user_interests & candidate_tags:
-        return "Based on your interests"
-    
-    return "Recommended for you"
-
-
-def _apply_mixing(items: List[FeedItem], ratios: Dict[str, float], page_size: int) -> List[FeedItem]:
-    """Apply content mixing based on ratios."""
-    # Sort by score
-    items.sort(key=lambda x: x.score, reverse=True)
-    
-    # Separate sponsored and organic
-    sponsored = [i for i in items if i.is_sponsored]
-    organic = [i for i in items if not i.is_sponsored]
-    
-    # Calculate sponsored slots
-    sponsored_ratio = ratios.get("sponsored", 0.1)
-    sponsored_slots = max(1, int(page_size * sponsored_ratio))
-    
-    # Build mixed feed
-    mixed = []
-    organic_idx = 0
-    sponsored_idx = 0
-    
-    for i in range(min(page_size, len(items))):
-        # Insert sponsored content at regular intervals
-        if sponsored_idx < len(sponsored) and sponsored_idx < sponsored_slots:
-            if (i + 1) % (page_size // max(1, sponsored_slots)) == 0:
-                mixed.append(sponsored[sponsored_idx])
-                sponsored_idx += 1
-                continue
-        
-        if organic_idx < len(organic):
-            mixed.append(organic[organic_idx])
-            organic_idx += 1
+
+
+def _uses_precompute(request: FeedGenerationRequest) -> bool:
+    """
+    Whether the request ranks the whole candidate store for a versioned context.
     
-    return mixed
+    Inline candidates or ids are ranked on their own, and an unversioned
+    context cannot be matched to the context a feed was precomputed for.
+    """
+    context = request.user_context
+    return (
+        not request.candidates
+        and not request.candidate_ids
+        and context.version is not None
+        and precomputer.handles(context.feed_context.value)
+    )
+
+
+def _precomputed_feed(request: FeedGenerationRequest, context: PreparedUserContext) -> Optional[PrecomputedFeed]:
+    """Precomputed feed usable for this request, if any."""
+    if not _uses_precompute(request) or request.mix_config or request.page * request.page_size > PRECOMPUTE_DEPTH:
+        return None
+    feed_context = request.user_context.feed_context.value
+    precomputed = precomputer.get(context.user_id, feed_context)
+    if precomputed is None or precomputed.version != context.version:
+        return None
+    return precomputed
 
 
-def _ensure_diversity(items: List[FeedItem]) -> List[FeedItem]:
-    """Ensure content type diversity in the feed."""
-    if len(items) <= 5:
-        return items
+def _extend_precomputed(
+    precomputed: PrecomputedFeed,
+    request: FeedGenerationRequest,
+    context: PreparedUserContext
+) -> tuple[FeedCandidateArrays, tuple[np.ndarray, ...], tuple[List[str], np.ndarray]]:
+    """
+    Merge a precomputed feed with candidates written since, scoring only those.
     
-    # Track consecutive same types
-    result = []
-    type_streak = {}
+    Candidates inserted or updated after the precompute are rescored and
+    replace their cached copies. Cached candidates are rechecked against the
+    user's current blocks and seen items, and keep the buckets they were
+    assigned when precomputed.
     
-    for item in items:
-        streak = type_streak.get(item.item_type, 0)
-        
-        # If too many consecutive, try to find alternative
-        if streak >= 3:
-            # Find next item of different type
-            for alt in items:
-                if alt not in result and alt.item_type != item.item_type:
-                    result.append(alt)
-                    type_streak[alt.item_type] = type_streak.get(alt.item_type, 0) + 1
-                    type_streak[item.item_type] = 0
+    Returns the merged candidates, their scores and their mixing buckets.
+    """
+    import time
+    
+    now = time.time()
+    changed = FeedCandidateArrays.from_store(candidate_store, candidate_store.changed_since(precomputed.watermark))
+    new, new_masks = _filter_candidates(changed, context)
+    new_scored = _score_candidates(new, context, now, new_masks)
+    names, new_buckets, _ = _assign_buckets(
+        new, new_scored[2], DEFAULT_MIX_RATIOS[request.user_context.feed_context], now
+    )
+    
+    # Drop cached items changed, blocked or seen since precomputation
+    cached_keys = hash_keys(precomputed.candidates.ids)
+    cached_masks = follow_graph.author_masks(context.user_id, precomputed.candidates.author_ids)
+    drop = np.isin(cached_keys, hash_keys(changed.ids)) | _filter_mask(
+        precomputed.candidates, context, cached_keys, cached_masks
+    )
+    keep = ~drop
+    cached = precomputed.candidates.take(keep)
+    
+    scored = tuple(
+        np.concatenate([old[keep], fresh])
+        for old, fresh in zip((precomputed.scores, precomputed.reasons, precomputed.followed), new_scored)
+    )
+    buckets = np.concatenate([precomputed.buckets[keep], new_buckets])
+    return FeedCandidateArrays.concat([cached, new]), scored, (names, buckets)
+
+
+def _build_feed_items(session: FeedSession, indices: List[int]) -> List[FeedItem]:
+    """Materialise FeedItems for the selected candidates only."""
+    candidates = session.candidates
+    return [
+        FeedItem(
+            id=candidates.ids[i],
+            item_type=FEED_ITEM_TYPES[int(candidates.item_type_codes[i])],
+            score=float(session.scores[i]),
+            position=0,  # Will be set later
+            reason=REASONS[int(session.reasons[i])],
+            is_sponsored=bool(candidates.is_sponsored[i]),
+            author_id=candidates.author_ids[i]
+        )
+        for i in indices
+    ]
+
+
+def _fill_session(session: FeedSession, count: int, page_size: int) -> None:
+    """Mix, diversify and position further pages until ``count`` items exist."""
+    while len(session.items) < count:
+        if not session.mixer.remaining:
+            if session.context is None:
+                break
+            _continue_from_store(session)
+            continue
+        chunk = session.mixer.next_page(page_size)
+        page_items = _build_feed_items(session, [index for index, _ in chunk])
+        for item in _ensure_diversity(page_items, session.runs):
+            item.position = len(session.items) + 1
+            session.items.append(item)
+
+
+def _continue_from_store(session: FeedSession) -> None:
+    """Replace an exhausted precomputed session's candidates with the rest of the store."""
+    candidates = FeedCandidateArrays.from_store(candidate_store, np.arange(len(candidate_store)))
+    candidates, masks = _filter_candidates(candidates, session.context)
+    served = np.isin(hash_keys(candidates.ids), hash_keys(item.id for item in session.items))
+    keep = ~served
+    candidates = candidates.take(keep)
+    if masks is not None:
+        masks = tuple(mask[keep] for mask in masks)
+    
+    session.scores, session.reasons, session.mixer = _rank_feed(
+        candidates, session.context, session.mix_ratios, masks=masks
+    )
+    session.candidates = SessionCandidates.of(candidates)
+    session.context = None
+
+
+def _ensure_diversity(
+    items: List[FeedItem],
+    runs: Optional[RunState] = None,
+    max_type_run: int = MAX_TYPE_RUN,
+    max_author_run: int = MAX_AUTHOR_RUN,
+    author_lookahead: int = AUTHOR_LOOKAHEAD,
+) -> List[FeedItem]:
+    """
+    Interleave items so no content type or author runs too long.
+    
+    Items are queued per type in their incoming (score) order. Each slot takes
+    the earliest queued item that does not extend an over-long author run (a
+    queue's head, or the first of its next ``author_lookahead`` items by
+    another author), preferring types that do not extend an over-long type
+    run and after which the remaining items can still be ordered within the
+    type limit. If no queue offers such an item, the earliest head is taken.
+    ``runs`` carries the runs from the previous page in and out. Every item
+    is emitted exactly once in O(n * number of types * author_lookahead).
+    """
+    runs = runs if runs is not None else RunState()
+    queues: Dict[FeedItemType, deque] = {}
+    for index, item in enumerate(items):
+        queues.setdefault(item.item_type, deque()).append((index, item))
+    
+    result = []
+    while queues:
+        counts = {item_type: len(queue) for item_type, queue in queues.items()}
+        total = len(items) - len(result) - 1
+        best = fallback = None
+        for item_type, queue in queues.items():
+            if fallback is None or queue[0][0] < fallback[0]:
+                fallback = (queue[0][0], item_type, 0)
+            type_run = runs.type_run + 1 if item_type == runs.last_type else 1
+            allowed = type_run <= max_type_run
+            # Every type left must fit between the others without an over-long run
+            feasible = allowed and all(
+                count - (u == item_type) <= (max_type_run - type_run if u == item_type else max_type_run)
+                + max_type_run * (total - count + (u == item_type))
+                for u, count in counts.items()
+            )
+            for position in range(min(len(queue), author_lookahead + 1)):
+                index, item = queue[position]
+                if item.author_id is None or item.author_id != runs.last_author or runs.author_run < max_author_run:
+                    key = (not allowed, not feasible, index)
+                    if best is None or key < best[0]:
+                        best = (key, item_type, position)
                     break
-            else:
-                result.append(item)
-                type_streak[item.item_type] = streak + 1
-        else:
-            result.append(item)
-            type_streak[item.item_type] = streak + 1
+        
+        _, item_type, position = best or fallback
+        queue = queues[item_type]
+        _, item = queue[position]
+        del queue[position]
+        if not queue:
+            del queues[item_type]
+        result.append(item)
+        
+        runs.type_run = runs.type_run + 1 if item.item_type == runs.last_type else 1
+        runs.last_type = item.item_type
+        runs.author_run = runs.author_run + 1 if item.author_id is not None and item.author_id == runs.last_author else 1
+        runs.last_author = item.author_id
     
     return result
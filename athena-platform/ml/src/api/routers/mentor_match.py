@@ -6,11 +6,33 @@ AI-powered mentor-mentee matching based on compatibility scoring.
 
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
 from typing import Any, Dict, List, Optional
 from enum import Enum
 
+import numpy as np
 from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from src.algorithms.skill_embeddings.model import SkillEmbedder
+from src.api.services.ann_index import IVFIndex
+from src.api.services.availability import WEEKS_PER_MONTH, AvailabilityBitmaps, utc_offset_hours, weekly_bitmap, weekly_overlap
+from src.api.services.candidate_store import CandidateStore
+from src.api.services.faceted_store import FacetedStore
+from src.api.services.mentor_assignment import auction_assign, top_k_edges
+from src.api.services.mentor_scoring import (
+    CompatibilityScores,
+    MenteeBatch,
+    compatibility_components,
+    compatibility_matrix,
+    score_mentors,
+    score_pairs,
+)
+from src.api.services.model_loader import ModelLoader
+from src.api.services.recommendation_cache import RecommendationCache, request_digest
+from src.api.services.streaming import ndjson_response
 
 router = APIRouter()
 
@@ -39,6 +61,19 @@ class MentorshipGoal(str, Enum):
 # REQUEST/RESPONSE SCHEMAS
 # ===========================================
 
+class AvailabilitySlot(BaseModel):
+    """Weekly availability slot in the profile's local timezone."""
+    day: int = Field(..., ge=0, le=6, description="0 = Monday")
+    start_hour: int = Field(..., ge=0, le=23)
+    end_hour: int = Field(..., ge=1, le=24, description="Exclusive")
+    
+    @model_validator(mode="after")
+    def _require_order(self) -> "AvailabilitySlot":
+        if self.end_hour <= self.start_hour:
+            raise ValueError("end_hour must be after start_hour")
+        return self
+
+
 class MenteeProfile(BaseModel):
     """Mentee profile for matching."""
     user_id: str
@@ -50,6 +85,7 @@ class MenteeProfile(BaseModel):
     preferred_style: Optional[MentoringStyle] = None
     availability_hours_per_month: int = Field(default=4, ge=1, le=20)
     timezone: str = Field(default="UTC")
+    weekly_availability: List[AvailabilitySlot] = Field(default_factory=list)
     languages: List[str] = Field(default=["English"])
     
     # Optional preferences
@@ -68,6 +104,7 @@ class MentorProfile(BaseModel):
     mentoring_style: MentoringStyle
     availability_hours_per_month: int
     timezone: str
+    weekly_availability: List[AvailabilitySlot] = Field(default_factory=list)
     languages: List[str]
     rating: float = Field(default=0.0, ge=0, le=5)
     total_mentees: int = Field(default=0)
@@ -112,6 +149,138 @@ class MatchResponse(BaseModel):
     algorithm_version: str = "1.0"
 
 
+class AssignmentRequest(BaseModel):
+    """Request to assign many mentees to mentors under mentor capacity."""
+    mentees: List[MenteeProfile] = Field(..., min_length=1, max_length=50000)
+    mentor_pool: Optional[List[str]] = Field(None, description="Specific mentor IDs to consider")
+    top_k: int = Field(default=20, ge=1, le=100, description="Mentors kept per mentee before solving")
+    min_score: float = Field(default=50.0, ge=0, le=100)
+    hours_per_mentee: int = Field(default=4, ge=1, le=20, description="Monthly mentor hours each mentee takes up")
+
+
+class MentorAssignment(BaseModel):
+    """Mentor assigned to one mentee."""
+    mentee_id: str
+    mentor_id: Optional[str] = None
+    score: Optional[float] = None
+
+
+class AssignmentResponse(BaseModel):
+    """Capacity-constrained assignment result."""
+    assignments: List[MentorAssignment]
+    assigned: int
+    unassigned: int
+    mentors_used: int
+    total_score: float
+    solver_rounds: int
+    solve_time_ms: float
+
+
+class ScorePair(BaseModel):
+    """One mentee and mentor to score."""
+    mentee: MenteeProfile
+    mentor: MentorProfile
+
+
+class BulkScoreRequest(BaseModel):
+    """Inline (mentee, mentor) pairs, or stored mentees crossed with stored mentors."""
+    pairs: Optional[List[ScorePair]] = Field(None, max_length=10000)
+    mentee_ids: Optional[List[str]] = Field(None, max_length=100000, description="Stored mentees to score")
+    mentor_ids: Optional[List[str]] = Field(None, description="Stored mentors to score against (default: whole pool)")
+    min_score: float = Field(default=0.0, ge=0, le=100, description="Only return pairs scoring at least this")
+    
+    @model_validator(mode="after")
+    def _require_one_source(self) -> "BulkScoreRequest":
+        if (self.pairs is None) == (self.mentee_ids is None):
+            raise ValueError("Provide exactly one of pairs or mentee_ids")
+        return self
+
+
+class PairScore(BaseModel):
+    """Score components of one mentee-mentor pair."""
+    mentee_id: str
+    mentor_id: str
+    overall_score: float
+    skill_alignment: float
+    goal_compatibility: float
+    style_fit: float
+    availability_match: float
+    experience_relevance: float
+
+
+class MenteeUpsertRequest(BaseModel):
+    """Batch of mentee profiles to store for bulk scoring."""
+    mentees: List[MenteeProfile] = Field(..., min_length=1, max_length=10000)
+
+
+class MentorUpsertRequest(BaseModel):
+    """Batch of mentor profiles to add to the mentor pool."""
+    mentors: List[MentorProfile] = Field(..., min_length=1, max_length=10000)
+
+
+class MentorChangeRequest(BaseModel):
+    """Mentors changed outside this service, e.g. capacity taken by new bookings."""
+    mentor_ids: List[str] = Field(..., min_length=1, max_length=10000)
+
+
+# ===========================================
+# MENTOR POOL
+# ===========================================
+
+# Mentors are retrieved for a mentee when they share at least one facet value
+MENTOR_FACETS = {
+    "expertise": "expertise_areas",
+    "industry": "industry",
+    "language": "languages",
+    "style": "mentoring_style",
+}
+
+mentor_pool = FacetedStore(MentorProfile, facets=MENTOR_FACETS, key="user_id")
+
+# Facet matches beyond this many are narrowed to those among the mentee's
+# MATCH_RECALL_N * MATCH_RECALL_OVERFETCH embedding neighbours before exact scoring
+MATCH_RECALL_N = 500
+MATCH_RECALL_OVERFETCH = 4
+
+# Mentees stored for bulk scoring by id
+mentee_pool = CandidateStore(MenteeProfile, key="user_id")
+
+# Bulk scoring works on chunks of this many pairs (inline) or score cells (stored)
+BULK_CHUNK_PAIRS = 4096
+BULK_CHUNK_CELLS = 1_000_000
+
+# /match results per mentee profile, dropped when one of their mentors changes
+recommendations: RecommendationCache[MatchResponse] = RecommendationCache(max_entries=50000, ttl_seconds=3600)
+
+# Weekly availability of pool mentors as UTC bitmaps, row-aligned with the pool
+mentor_availability = AvailabilityBitmaps()
+
+model_loader = ModelLoader()
+_embedder: Optional[SkillEmbedder] = None
+_mentor_index: Optional[IVFIndex] = None
+_embeddings_lock = threading.Lock()
+
+
+def _embeddings() -> tuple[SkillEmbedder, IVFIndex]:
+    """Skill embedder (trained artifact or random fallback) and the mentor ANN index."""
+    global _embedder, _mentor_index
+    if _mentor_index is None:
+        # Mentors are indexed in worker threads, so only one caller may create the index
+        with _embeddings_lock:
+            if _mentor_index is None:
+                _embedder = SkillEmbedder.from_artifact(model_loader.get_model("skill_embeddings"))
+                _mentor_index = IVFIndex(_embedder.dim)
+    return _embedder, _mentor_index
+
+
+def index_mentor_pool() -> int:
+    """Embed every mentor in the pool, index their availability and build the expertise matrix. Returns the number indexed."""
+    rows = np.arange(len(mentor_pool))
+    _index_mentors(rows)
+    mentor_pool.facet_matrix("expertise")
+    return len(rows)
+
+
 # ===========================================
 # ENDPOINTS
 # ===========================================
@@ -127,18 +296,38 @@ async def find_mentor_matches(request: MatchRequest):
     - Communication style fit
     - Availability overlap
     - Experience relevance
+    
+    Candidates come from the mentor pool: only mentors sharing an expertise
+    area, industry, language or mentoring style with the mentee are scored.
+    When more than ``MATCH_RECALL_N`` mentors match, they are narrowed to
+    those among the mentors whose skill embeddings are nearest to the
+    mentee's.
+    
+    Results are cached per mentee profile and request options until a
+    mentor in the result changes (see ``/mentors`` and ``/mentors/changed``).
+    Results with fewer than ``max_results`` matches are not cached, since
+    any newly added mentor could join them.
     """
     try:
-        # In production, this would query the database for mentors
-        # For now, return simulated matches
-        matches = _calculate_matches(request.mentee, request.max_results, request.min_score)
+        key = request_digest(
+            request.mentee.model_dump(mode="json"), request.mentor_pool, request.max_results, request.min_score
+        )
+        cached = recommendations.get(key)
+        if cached is not None:
+            return cached
         
-        return MatchResponse(
+        rows = _retrieve_mentors(request.mentee, request.mentor_pool)
+        matches = _calculate_matches(request.mentee, rows, request.max_results, request.min_score)
+        
+        response = MatchResponse(
             mentee_id=request.mentee.user_id,
             matches=matches,
-            total_considered=100,  # Would be actual count
+            total_considered=len(rows),
             algorithm_version="1.0"
         )
+        if len(matches) >= request.max_results:
+            recommendations.set(key, response, [m.mentor_id for m in matches])
+        return response
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -159,6 +348,105 @@ async def calculate_match_score(mentee: MenteeProfile, mentor: MentorProfile):
         )
 
 
+@router.post("/score/bulk")
+async def score_pairs_bulk(request: BulkScoreRequest):
+    """
+    Score many mentee-mentor pairs, streamed back as NDJSON.
+    
+    Pairs are either given inline or built from stored mentees (see
+    ``/mentees``) crossed with stored mentors. They are scored in fixed-size
+    vectorized chunks, each written out before the next is computed, so
+    memory use does not grow with the number of pairs. Each line is a
+    ``PairScore``; the last line is a summary with the number of pairs
+    scored and returned and any unknown ids.
+    """
+    try:
+        # Counts are filled in while streaming; the summary line is written last
+        summary: Dict[str, Any] = {"pairs_scored": 0, "returned": 0}
+        if request.pairs is not None:
+            items = _score_inline_pairs(request.pairs, request.min_score, summary)
+        else:
+            mentee_rows, missing_mentees = mentee_pool.lookup(request.mentee_ids)
+            if request.mentor_ids is not None:
+                mentor_rows, missing_mentors = mentor_pool.lookup(request.mentor_ids)
+            else:
+                mentor_rows, missing_mentors = np.arange(len(mentor_pool)), []
+            summary["missing_mentee_ids"] = missing_mentees
+            summary["missing_mentor_ids"] = missing_mentors
+            items = _score_stored_pairs(mentee_rows, mentor_rows, request.min_score, summary)
+        return ndjson_response(items, summary)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Bulk scoring failed: {str(e)}"
+        )
+
+
+@router.post("/assign", response_model=AssignmentResponse)
+async def assign_mentors(request: AssignmentRequest):
+    """
+    Assign a batch of mentees to mentors, maximising total compatibility.
+    
+    Unlike ``/match``, mentees compete for mentors: each mentor takes at most
+    ``availability_hours_per_month // hours_per_mentee`` mentees. Each mentee
+    is scored against the whole pool, only its ``top_k`` mentors are kept,
+    and the resulting graph is solved with an auction algorithm.
+    """
+    try:
+        return await asyncio.to_thread(_assign_mentors, request)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Assignment failed: {str(e)}"
+        )
+
+
+@router.post("/mentors")
+async def upsert_mentors(request: MentorUpsertRequest):
+    """Insert or update mentors in the mentor pool, invalidating cached matches of changed mentors."""
+    existing, _ = mentor_pool.lookup([m.user_id for m in request.mentors])
+    before = {m.user_id: m.model_dump(mode="json") for m in mentor_pool.materialize(existing)}
+    upserted = mentor_pool.upsert(request.mentors)
+    rows, _ = mentor_pool.lookup([m.user_id for m in request.mentors])
+    # Embedding, (re)training the ANN quantizer and rebuilding the facet matrices are CPU-bound; keep them off the event loop
+    await asyncio.to_thread(_index_mentors, rows)
+    
+    changed = [m.user_id for m in request.mentors if m.user_id in before and before[m.user_id] != m.model_dump(mode="json")]
+    invalidated = recommendations.invalidate_mentors(changed)
+    return {"upserted": upserted, "total": len(mentor_pool), "invalidated": invalidated}
+
+
+@router.post("/mentors/changed")
+async def mentors_changed(request: MentorChangeRequest):
+    """Invalidate cached matches containing mentors whose availability, rating or capacity changed elsewhere."""
+    return {"invalidated": recommendations.invalidate_mentors(request.mentor_ids)}
+
+
+@router.post("/mentees")
+async def upsert_mentees(request: MenteeUpsertRequest):
+    """Insert or update mentees stored for bulk scoring."""
+    upserted = mentee_pool.upsert(request.mentees)
+    return {"upserted": upserted, "total": len(mentee_pool)}
+
+
+@router.get("/mentors/stats")
+async def get_mentor_pool_stats():
+    """Get mentor pool size and index statistics."""
+    _, index = _embeddings()
+    return {
+        **mentor_pool.stats(),
+        "ann_index": index.stats(),
+        "availability": mentor_availability.stats(),
+        "stored_mentees": len(mentee_pool),
+    }
+
+
+@router.get("/recommendations/stats")
+async def get_recommendation_cache_stats():
+    """Get match cache hit ratio and invalidation fan-out."""
+    return recommendations.stats()
+
+
 @router.post("/recommend-goals")
 async def recommend_mentorship_goals(
     industry: str,
@@ -216,39 +504,219 @@ async def recommend_mentorship_goals(
 # HELPER FUNCTIONS
 # ===========================================
 
-def _calculate_matches(mentee: MenteeProfile, max_results: int, min_score: float) -> List[MatchScore]:
-    """Calculate mentor matches (simplified for demonstration)."""
-    # In production, this queries the database and uses the trained model
-    simulated_matches = []
-    
-    for i in range(min(max_results, 5)):
-        score = 85 - (i * 8)  # Decreasing scores
-        if score >= min_score:
-            simulated_matches.append(MatchScore(
-                mentor_id=f"mentor_{i+1}",
-                overall_score=score,
-                skill_alignment=score + 5,
-                goal_compatibility=score - 3,
-                style_fit=score + 2,
-                availability_match=score - 5,
-                experience_relevance=score + 8,
-                match_reasons=[
-                    f"Strong alignment in {mentee.goals[0].value if mentee.goals else 'career goals'}",
-                    f"Experience in {mentee.industry}",
-                    "Positive mentee feedback history"
-                ],
-                potential_challenges=[
-                    "Different timezone may require scheduling flexibility"
-                ],
-                mentor_summary={
-                    "name": f"Mentor {i+1}",
-                    "title": "Senior Professional",
-                    "rating": 4.8 - (i * 0.1),
-                    "mentees_helped": 25 - (i * 3)
-                }
-            ))
-    
-    return simulated_matches
+def _mentor_text(mentor: MentorProfile) -> List[str]:
+    return [*mentor.expertise_areas, mentor.industry, mentor.role]
+
+
+def _index_mentors(rows: np.ndarray) -> None:
+    embedder, index = _embeddings()
+    mentors = mentor_pool.materialize(rows)
+    index.set_vectors(rows, embedder.embed_profiles([_mentor_text(m) for m in mentors]))
+    if mentors:
+        mentor_availability.set(rows, np.stack([_availability_bitmap(m) for m in mentors]))
+    mentor_pool.refresh_matrices()
+
+
+def _availability_bitmap(profile: MenteeProfile | MentorProfile) -> np.ndarray:
+    """UTC weekly availability bitmap of a mentee or mentor."""
+    slots = [(s.day, s.start_hour, s.end_hour) for s in profile.weekly_availability]
+    return weekly_bitmap(slots, profile.timezone)
+
+
+def _recall_mentors(mentee: MenteeProfile, top_n: int) -> np.ndarray:
+    """Pool rows of the ``top_n`` mentors nearest to the mentee in embedding space."""
+    embedder, index = _embeddings()
+    query = embedder.embed_profile([*mentee.skills, mentee.industry, mentee.role])
+    rows, _ = index.search(query, top_n)
+    return np.sort(rows)
+
+
+def _retrieve_mentors(mentee: MenteeProfile, mentor_ids: Optional[List[str]] = None) -> np.ndarray:
+    """Pool rows of mentors sharing at least one facet with the mentee, narrowed to its embedding neighbours if many."""
+    rows = mentor_pool.retrieve({
+        "expertise": mentee.skills,
+        "industry": [mentee.industry],
+        "language": mentee.languages,
+        "style": [mentee.preferred_style] if mentee.preferred_style else [],
+    })
+    if mentor_ids is not None:
+        requested, _ = mentor_pool.lookup(mentor_ids)
+        return np.intersect1d(rows, requested)
+    if len(rows) > MATCH_RECALL_N:
+        rows = np.intersect1d(rows, _recall_mentors(mentee, MATCH_RECALL_N * MATCH_RECALL_OVERFETCH))
+    return rows
+
+
+def _calculate_matches(mentee: MenteeProfile, rows: np.ndarray, max_results: int, min_score: float) -> List[MatchScore]:
+    """Score the retrieved mentors as arrays and explain only the best matches."""
+    scores = _score_mentors(mentee, rows)
+    best = scores.top(max_results, min_score)
+    mentors = mentor_pool.materialize(scores.rows[best])
+    return [
+        _build_match_score(
+            mentee,
+            mentor,
+            overall=float(scores.overall[i]),
+            skill_alignment=float(scores.skill_alignment[i]),
+            goal_compatibility=float(scores.goal_compatibility[i]),
+            style_fit=float(scores.style_fit[i]),
+            availability_match=float(scores.availability_match[i]),
+            experience_relevance=float(scores.experience_relevance[i])
+        )
+        for mentor, i in zip(mentors, best.tolist())
+    ]
+
+
+def _assign_mentors(request: AssignmentRequest) -> AssignmentResponse:
+    """Score mentees against the pool in chunks and solve the capacitated assignment."""
+    start = time.time()
+    if request.mentor_pool is not None:
+        rows, _ = mentor_pool.lookup(request.mentor_pool)
+    else:
+        rows = np.arange(len(mentor_pool))
+    
+    mentees = request.mentees
+    batch = _mentee_batch(mentees)
+    mentor_bitmaps = mentor_availability.get(rows)
+    columns, values = top_k_edges(
+        lambda first, last: compatibility_matrix(mentor_pool, rows, batch, first, last, mentor_bitmaps),
+        len(mentees),
+        len(rows),
+        request.top_k,
+        request.min_score
+    )
+    capacity = mentor_pool.column("availability_hours_per_month", rows) // request.hours_per_mentee
+    result = auction_assign(columns, values, capacity)
+    
+    mentor_ids = mentor_pool.ids(rows)
+    assigned = result.mentor >= 0
+    assignments = [
+        MentorAssignment(
+            mentee_id=mentee.user_id,
+            mentor_id=mentor_ids[j] if j >= 0 else None,
+            score=round(float(score), 1) if j >= 0 else None
+        )
+        for mentee, j, score in zip(mentees, result.mentor.tolist(), result.score.tolist())
+    ]
+    return AssignmentResponse(
+        assignments=assignments,
+        assigned=int(assigned.sum()),
+        unassigned=int((~assigned).sum()),
+        mentors_used=len(np.unique(result.mentor[assigned])),
+        total_score=round(float(np.nansum(result.score)), 1),
+        solver_rounds=result.rounds,
+        solve_time_ms=round((time.time() - start) * 1000, 2)
+    )
+
+
+def _mentee_batch(mentees: List[MenteeProfile]) -> MenteeBatch:
+    """Column-wise attributes of mentees for scoring against the pool."""
+    styles = list(MentoringStyle)
+    return MenteeBatch.build(
+        mentor_pool,
+        skills=[m.skills for m in mentees],
+        experience_years=[m.experience_years for m in mentees],
+        availability_hours=[m.availability_hours_per_month for m in mentees],
+        preferred_style_code=[styles.index(m.preferred_style) if m.preferred_style else -1 for m in mentees],
+        wants_leadership=[MentorshipGoal.LEADERSHIP in m.goals for m in mentees],
+        wants_entrepreneurship=[MentorshipGoal.ENTREPRENEURSHIP in m.goals for m in mentees],
+        availability_bitmaps=[_availability_bitmap(m) for m in mentees]
+    )
+
+
+def _score_inline_pairs(pairs: List[ScorePair], min_score: float, summary: Dict[str, Any]):
+    """Score inline pairs chunk by chunk, yielding PairScores."""
+    styles = list(MentoringStyle)
+    for start in range(0, len(pairs), BULK_CHUNK_PAIRS):
+        chunk = pairs[start:start + BULK_CHUNK_PAIRS]
+        mentees = [p.mentee for p in chunk]
+        mentors = [p.mentor for p in chunk]
+        components = score_pairs(
+            mentee_skills=[m.skills for m in mentees],
+            mentor_skills=[m.expertise_areas for m in mentors],
+            mentor_experience=np.array([m.experience_years for m in mentors]),
+            mentor_style=np.array([styles.index(m.mentoring_style) for m in mentors]),
+            mentor_hours=np.array([m.availability_hours_per_month for m in mentors]),
+            experience_years=np.array([m.experience_years for m in mentees]),
+            availability_hours=np.array([m.availability_hours_per_month for m in mentees]),
+            preferred_style_code=np.array([styles.index(m.preferred_style) if m.preferred_style else -1 for m in mentees]),
+            wants_leadership=np.array([MentorshipGoal.LEADERSHIP in m.goals for m in mentees]),
+            wants_entrepreneurship=np.array([MentorshipGoal.ENTREPRENEURSHIP in m.goals for m in mentees]),
+            mentee_bitmaps=np.stack([_availability_bitmap(m) for m in mentees]),
+            mentor_bitmaps=np.stack([_availability_bitmap(m) for m in mentors])
+        )
+        yield from _pair_scores(
+            [m.user_id for m in mentees], [m.user_id for m in mentors], components, min_score, summary
+        )
+
+
+def _score_stored_pairs(mentee_rows: np.ndarray, mentor_rows: np.ndarray, min_score: float, summary: Dict[str, Any]):
+    """Score stored mentees against stored mentors in chunks of mentees, yielding PairScores."""
+    if not len(mentor_rows):
+        return
+    mentor_ids = mentor_pool.ids(mentor_rows)
+    mentor_bitmaps = mentor_availability.get(mentor_rows)
+    chunk = max(1, BULK_CHUNK_CELLS // len(mentor_rows))
+    for start in range(0, len(mentee_rows), chunk):
+        mentees = mentee_pool.materialize(mentee_rows[start:start + chunk])
+        batch = _mentee_batch(mentees)
+        components = {
+            name: values.ravel()
+            for name, values in compatibility_components(
+                mentor_pool, mentor_rows, batch, 0, len(mentees), mentor_bitmaps
+            ).items()
+        }
+        yield from _pair_scores([m.user_id for m in mentees], mentor_ids, components, min_score, summary, grid=True)
+
+
+def _pair_scores(
+    mentee_ids: List[str],
+    mentor_ids: List[str],
+    components: Dict[str, np.ndarray],
+    min_score: float,
+    summary: Dict[str, Any],
+    grid: bool = False
+):
+    """
+    PairScores for the scored pairs reaching ``min_score``.
+    
+    Components are flat arrays, either aligned with both id lists or, with
+    ``grid``, the row-major flattening of mentees x mentors.
+    """
+    overall = np.round(components["overall"], 1)
+    keep = np.flatnonzero(overall >= min_score)
+    summary["pairs_scored"] += len(overall)
+    summary["returned"] += len(keep)
+    if grid:
+        mentee_index, mentor_index = np.divmod(keep, len(mentor_ids))
+    else:
+        mentee_index = mentor_index = keep
+    
+    names = ["skill_alignment", "goal_compatibility", "style_fit", "availability_match", "experience_relevance"]
+    columns = [np.round(components[name][keep], 1).tolist() for name in names]
+    for i, j, score, *values in zip(mentee_index.tolist(), mentor_index.tolist(), overall[keep].tolist(), *columns):
+        yield PairScore(
+            mentee_id=mentee_ids[i],
+            mentor_id=mentor_ids[j],
+            overall_score=score,
+            **dict(zip(names, values))
+        )
+
+
+def _score_mentors(mentee: MenteeProfile, rows: np.ndarray) -> CompatibilityScores:
+    """Compatibility of a mentee with the pool mentors at ``rows``."""
+    return score_mentors(
+        mentor_pool,
+        rows,
+        skills=mentee.skills,
+        experience_years=mentee.experience_years,
+        availability_hours=mentee.availability_hours_per_month,
+        preferred_style_code=list(MentoringStyle).index(mentee.preferred_style) if mentee.preferred_style else None,
+        wants_leadership=MentorshipGoal.LEADERSHIP in mentee.goals,
+        wants_entrepreneurship=MentorshipGoal.ENTREPRENEURSHIP in mentee.goals,
+        availability_bitmap=_availability_bitmap(mentee),
+        mentor_bitmaps=mentor_availability.get(rows)
+    )
 
 
 def _compute_compatibility(mentee: MenteeProfile, mentor: MentorProfile) -> MatchScore:
@@ -272,10 +740,12 @@ def _compute_compatibility(mentee: MenteeProfile, mentor: MentorProfile) -> Matc
     if mentee.preferred_style and mentee.preferred_style == mentor.mentoring_style:
         style_fit = 95
     
-    # Availability match
+    # Availability match, capped by the weekly hours both are actually free
     mentee_hours = mentee.availability_hours_per_month
     mentor_hours = mentor.availability_hours_per_month
-    availability_match = min(100, (min(mentee_hours, mentor_hours) / max(mentee_hours, 1)) * 100)
+    overlap = float(weekly_overlap(_availability_bitmap(mentee), _availability_bitmap(mentor)))
+    usable_hours = min(mentee_hours, mentor_hours, overlap * WEEKS_PER_MONTH)
+    availability_match = min(100, (usable_hours / max(mentee_hours, 1)) * 100)
     
     # Experience relevance
     exp_diff = mentor.experience_years - mentee.experience_years
@@ -295,6 +765,29 @@ def _compute_compatibility(mentee: MenteeProfile, mentor: MentorProfile) -> Matc
         experience_relevance * 0.20
     )
     
+    return _build_match_score(
+        mentee,
+        mentor,
+        overall=overall,
+        skill_alignment=skill_alignment,
+        goal_compatibility=goal_compatibility,
+        style_fit=style_fit,
+        availability_match=availability_match,
+        experience_relevance=experience_relevance
+    )
+
+
+def _build_match_score(
+    mentee: MenteeProfile,
+    mentor: MentorProfile,
+    overall: float,
+    skill_alignment: float,
+    goal_compatibility: float,
+    style_fit: float,
+    availability_match: float,
+    experience_relevance: float
+) -> MatchScore:
+    """Assemble a MatchScore with its explanation from the score components."""
     return MatchScore(
         mentor_id=mentor.user_id,
         overall_score=round(overall, 1),
@@ -339,8 +832,15 @@ def _identify_challenges(mentee: MenteeProfile, mentor: MentorProfile) -> List[s
     """Identify potential challenges in the mentorship."""
     challenges = []
     
-    if mentee.timezone != mentor.timezone:
-        challenges.append("Different timezones may affect meeting scheduling")
+    overlap = float(weekly_overlap(_availability_bitmap(mentee), _availability_bitmap(mentor)))
+    if overlap == 0:
+        challenges.append("No overlapping weekly availability")
+    elif overlap * WEEKS_PER_MONTH < mentee.availability_hours_per_month:
+        challenges.append(f"Only {overlap:.0f} overlapping hours per week")
+    elif overlap == np.inf:
+        gap = abs(utc_offset_hours(mentee.timezone) - utc_offset_hours(mentor.timezone))
+        if gap >= 3:
+            challenges.append(f"Timezones {gap:g} hours apart may affect meeting scheduling")
     
     if not set(mentee.languages) & set(mentor.languages):
         challenges.append("No common language preference")
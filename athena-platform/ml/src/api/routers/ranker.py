@@ -6,11 +6,17 @@ Light and Heavy ranking algorithms for content and recommendations.
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 from enum import Enum
 
+import numpy as np
 from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from src.api.services.candidate_store import CandidateStore
+from src.api.services.streaming import ndjson_response
+from src.api.services.user_context_cache import PreparedUserContext, UserContextCache
 
 router = APIRouter()
 
@@ -33,6 +39,9 @@ class ContentType(str, Enum):
     USER = "user"
 
 
+CONTENT_TYPES = list(ContentType)
+
+
 # ===========================================
 # REQUEST/RESPONSE SCHEMAS
 # ===========================================
@@ -54,15 +63,24 @@ class UserContext(BaseModel):
     location: Optional[str] = None
     interaction_history: List[Dict[str, Any]] = Field(default_factory=list)
     session_context: Dict[str, Any] = Field(default_factory=dict)
+    version: Optional[int] = Field(None, ge=0, description="Context version; send with user_id only once cached")
 
 
 class RankingRequest(BaseModel):
     """Ranking request."""
-    candidates: List[RankingCandidate] = Field(..., min_length=1, max_length=1000)
+    candidates: List[RankingCandidate] = Field(default_factory=list, max_length=1000)
+    candidate_ids: List[str] = Field(default_factory=list, max_length=1000, description="Ids of candidates held in the candidate store")
     user_context: UserContext
     ranking_model: RankingModel = RankingModel.LIGHT
     top_k: Optional[int] = Field(None, ge=1, le=100)
     diversity_factor: float = Field(default=0.2, ge=0, le=1)
+    stream: bool = Field(default=False, description="Stream ranked items as NDJSON")
+    
+    @model_validator(mode="after")
+    def _require_candidates(self) -> "RankingRequest":
+        if not self.candidates and not self.candidate_ids:
+            raise ValueError("Either candidates or candidate_ids must be provided")
+        return self
 
 
 class RankedItem(BaseModel):
@@ -81,6 +99,55 @@ class RankingResponse(BaseModel):
     model_used: RankingModel
     processing_time_ms: float
     diversity_applied: bool
+    missing_candidate_ids: List[str] = Field(default_factory=list)
+
+
+class CandidateUpsertRequest(BaseModel):
+    """Batch of candidates to store server-side."""
+    candidates: List[RankingCandidate] = Field(..., min_length=1, max_length=10000)
+
+
+# ===========================================
+# CANDIDATE STORE
+# ===========================================
+
+candidate_store = CandidateStore(RankingCandidate)
+context_cache = UserContextCache()
+
+
+@dataclass
+class CandidateColumns:
+    """The candidate fields ranking reads, column-wise, from the request or the store."""
+    ids: List[str]
+    content_types: List[ContentType]
+    features: List[Dict[str, Any]]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def of(cls, candidates: List[RankingCandidate]) -> "CandidateColumns":
+        return cls(
+            ids=[c.id for c in candidates],
+            content_types=[c.content_type for c in candidates],
+            features=[c.features for c in candidates],
+        )
+
+    @classmethod
+    def from_store(cls, store: CandidateStore, rows: np.ndarray) -> "CandidateColumns":
+        """Read stored candidates by row index, without building models."""
+        return cls(
+            ids=store.ids(rows),
+            content_types=[CONTENT_TYPES[code] for code in store.column("content_type", rows).tolist()],
+            features=store.objects("features", rows),
+        )
+
+    def extend(self, other: "CandidateColumns") -> "CandidateColumns":
+        return CandidateColumns(
+            ids=self.ids + other.ids,
+            content_types=self.content_types + other.content_types,
+            features=self.features + other.features,
+        )
 
 
 # ===========================================
@@ -94,15 +161,22 @@ async def rank_candidates(request: RankingRequest):
     
     Light Ranker: Fast heuristic-based scoring
     Heavy Ranker: Deep ML model for higher accuracy
+    
+    With ``stream=true`` the ranked items are sent as NDJSON, one item per
+    line, followed by a ``summary`` line with the response metadata.
     """
     import time
     start = time.time()
     
+    context = _resolve_user_context(request.user_context)
+    
     try:
+        candidates, missing_ids = _resolve_candidates(request)
+        
         if request.ranking_model == RankingModel.LIGHT:
-            ranked = _light_rank(request.candidates, request.user_context)
+            ranked = _light_rank(candidates, context)
         else:
-            ranked = _heavy_rank(request.candidates, request.user_context)
+            ranked = _heavy_rank(candidates, context)
         
         # Apply diversity if requested
         if request.diversity_factor > 0:
@@ -116,11 +190,20 @@ async def rank_candidates(request: RankingRequest):
         for i, item in enumerate(ranked):
             item.rank = i + 1
         
+        if request.stream:
+            return ndjson_response(ranked, {
+                "model_used": request.ranking_model,
+                "processing_time_ms": round((time.time() - start) * 1000, 2),
+                "diversity_applied": request.diversity_factor > 0,
+                "missing_candidate_ids": missing_ids,
+            })
+        
         return RankingResponse(
             ranked_items=ranked,
             model_used=request.ranking_model,
             processing_time_ms=round((time.time() - start) * 1000, 2),
-            diversity_applied=request.diversity_factor > 0
+            diversity_applied=request.diversity_factor > 0,
+            missing_candidate_ids=missing_ids
         )
     except Exception as e:
         raise HTTPException(
@@ -132,7 +215,7 @@ async def rank_candidates(request: RankingRequest):
 @router.post("/score-single")
 async def score_single_item(candidate: RankingCandidate, user_context: UserContext):
     """Score a single item for a user."""
-    score, breakdown = _compute_score(candidate, user_context)
+    score, breakdown = _compute_score(candidate.content_type, candidate.features, context_cache.prepare(user_context))
     
     return {
         "id": candidate.id,
@@ -141,20 +224,62 @@ async def score_single_item(candidate: RankingCandidate, user_context: UserConte
     }
 
 
+@router.post("/candidates")
+async def upsert_candidates(request: CandidateUpsertRequest):
+    """Insert or update candidates in the server-side candidate store."""
+    upserted = candidate_store.upsert(request.candidates)
+    return {"upserted": upserted, "total": len(candidate_store)}
+
+
+@router.get("/candidates/stats")
+async def get_candidate_store_stats():
+    """Get candidate store size and memory usage."""
+    return candidate_store.stats()
+
+
+@router.get("/context-cache/stats")
+async def get_context_cache_stats():
+    """Get user context cache size and hit ratio."""
+    return context_cache.stats()
+
+
 # ===========================================
 # HELPER FUNCTIONS
 # ===========================================
 
-def _light_rank(candidates: List[RankingCandidate], context: UserContext) -> List[RankedItem]:
+def _resolve_user_context(user_context: UserContext) -> PreparedUserContext:
+    """Prepared user context, served from the cache for versioned requests."""
+    context = context_cache.resolve(user_context)
+    if context is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"User context version {user_context.version} is not cached or is older than the cached one; "
+                "resend the full current context"
+            )
+        )
+    return context
+
+
+def _resolve_candidates(request: RankingRequest) -> tuple[CandidateColumns, List[str]]:
+    """Combine inline candidates with those referenced by id from the store."""
+    candidates = CandidateColumns.of(request.candidates)
+    if not request.candidate_ids:
+        return candidates, []
+    rows, missing = candidate_store.lookup(request.candidate_ids)
+    return candidates.extend(CandidateColumns.from_store(candidate_store, rows)), missing
+
+
+def _light_rank(candidates: CandidateColumns, context: PreparedUserContext) -> List[RankedItem]:
     """Light/fast ranking using heuristics."""
     results = []
     
-    for candidate in candidates:
-        score, breakdown = _compute_score(candidate, context)
+    for candidate_id, content_type, features in zip(candidates.ids, candidates.content_types, candidates.features):
+        score, breakdown = _compute_score(content_type, features, context)
         
         results.append(RankedItem(
-            id=candidate.id,
-            content_type=candidate.content_type,
+            id=candidate_id,
+            content_type=content_type,
             score=score,
             rank=0,  # Will be set later
             score_breakdown=breakdown,
@@ -166,7 +291,7 @@ def _light_rank(candidates: List[RankingCandidate], context: UserContext) -> Lis
     return results
 
 
-def _heavy_rank(candidates: List[RankingCandidate], context: UserContext) -> List[RankedItem]:
+def _heavy_rank(candidates: CandidateColumns, context: PreparedUserContext) -> List[RankedItem]:
     """Heavy ranking using ML model."""
     # In production, this would use a trained model
     # For now, use enhanced light ranking with additional factors
@@ -181,41 +306,44 @@ def _heavy_rank(candidates: List[RankingCandidate], context: UserContext) -> Lis
     return results
 
 
-def _compute_score(candidate: RankingCandidate, context: UserContext) -> tuple[float, Dict[str, float]]:
+def _compute_score(
+    content_type: ContentType,
+    features: Dict[str, Any],
+    context: PreparedUserContext
+) -> tuple[float, Dict[str, float]]:
     """Compute relevance score with breakdown."""
     breakdown = {}
     
     # Base relevance
     breakdown["base"] = 50.0
     
-    # Interest matching
+    # Interest matching (case-insensitive, like skills and the feed's interest matching)
     if context.interests:
-        candidate_tags = candidate.features.get("tags", [])
-        matches = len(set(context.interests) & set(candidate_tags))
+        candidate_tags = features.get("tags", [])
+        matches = len(context.interests.intersection(t.lower() for t in candidate_tags))
         breakdown["interest_match"] = min(30, matches * 10)
     else:
         breakdown["interest_match"] = 10
     
     # Skill matching (for jobs/courses)
-    if context.skills and candidate.content_type in [ContentType.JOB, ContentType.COURSE]:
-        required_skills = candidate.features.get("required_skills", [])
-        skill_matches = len(set(s.lower() for s in context.skills) & 
-                          set(s.lower() for s in required_skills))
+    if context.skills and content_type in [ContentType.JOB, ContentType.COURSE]:
+        required_skills = features.get("required_skills", [])
+        skill_matches = len(context.skills.intersection(s.lower() for s in required_skills))
         breakdown["skill_match"] = min(25, skill_matches * 8)
     else:
         breakdown["skill_match"] = 0
     
     # Recency boost
-    freshness = candidate.features.get("freshness_score", 0.5)
+    freshness = features.get("freshness_score", 0.5)
     breakdown["recency"] = freshness * 15
     
     # Engagement signals
-    engagement = candidate.features.get("engagement_rate", 0.1)
+    engagement = features.get("engagement_rate", 0.1)
     breakdown["engagement"] = engagement * 20
     
     # Location relevance
-    if context.location and candidate.features.get("location"):
-        if context.location.lower() in candidate.features["location"].lower():
+    if context.location and features.get("location"):
+        if context.location in features["location"].lower():
             breakdown["location"] = 10
         else:
             breakdown["location"] = 0
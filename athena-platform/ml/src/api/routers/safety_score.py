@@ -6,12 +6,27 @@ Privacy-preserving safety scoring for users and interactions.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timezone
 
 from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+
+from src.algorithms.moderation_classifier.model import ModerationClassifier
+from src.api.services.model_loader import ModelLoader
+from src.api.services.near_duplicates import NearDuplicateIndex
+from src.api.services.pattern_matcher import Lexicon
+from src.api.services.process_pool import ChunkedProcessPool
+from src.api.services.recommendation_cache import request_digest
+from src.api.services.score_cache import ScoreCache
+from src.api.services.signal_store import DecayedSignalStore
+from src.api.services.streaming import ndjson_response
 
 router = APIRouter()
 
@@ -119,9 +134,16 @@ class ContentModerationRequest(BaseModel):
     content_text: Optional[str] = None
     content_url: Optional[str] = None
     author_id: str
+    created_at: Optional[datetime] = Field(None, description="When the content was posted (defaults to now)")
     context: Dict[str, Any] = Field(default_factory=dict)
 
 
+class BulkModerationRequest(BaseModel):
+    """Batch of content to moderate in worker processes."""
+    items: List[ContentModerationRequest] = Field(..., min_length=1, max_length=100000)
+    ordered: bool = Field(default=True, description="Return results in input order")
+
+
 class ContentModerationResult(BaseModel):
     """Content moderation result."""
     content_id: str
@@ -133,6 +155,155 @@ class ContentModerationResult(BaseModel):
     explanation: str
 
 
+# ===========================================
+# SCORE CACHE & SIGNAL STORE
+# ===========================================
+
+# Unclamped components and result per user, valid until the result's valid_until
+safety_scores: ScoreCache[Tuple[Dict[str, float], SafetyScoreResult]] = ScoreCache(max_entries=100000)
+
+# Reported signals per user, decayed over time (restored and snapshotted by the app lifespan)
+signal_store = DecayedSignalStore(
+    [signal_type.value for signal_type in SignalType],
+    half_life_days=float(os.getenv("SAFETY_SIGNAL_HALF_LIFE_DAYS", "30"))
+)
+
+
+# ===========================================
+# MODERATION LEXICON
+# ===========================================
+
+# Category-tagged terms compiled into one automaton, reloaded when the file changes
+moderation_lexicon = Lexicon(Path(os.getenv("MODERATION_LEXICON_PATH", "config/moderation_lexicon.yaml")))
+
+# Recent posts for near-duplicate (copy-paste campaign) detection. Bulk
+# moderation checks records here, in the parent process, before they go to
+# workers, so the index is created on first use rather than on import: pool
+# workers import this module but never allocate its ring buffer.
+_near_duplicates: Optional[NearDuplicateIndex] = None
+_near_duplicates_lock = threading.Lock()
+NEAR_DUPLICATE_CLUSTER_SIZE = 5
+NEAR_DUPLICATE_AUTHORS = 3
+_timestamp_adapter = TypeAdapter(Optional[datetime])
+
+
+def _near_duplicate_index() -> NearDuplicateIndex:
+    """The near-duplicate index of this process, created on first use."""
+    global _near_duplicates
+    if _near_duplicates is None:
+        with _near_duplicates_lock:
+            if _near_duplicates is None:
+                _near_duplicates = NearDuplicateIndex(
+                    window_seconds=float(os.getenv("NEAR_DUPLICATE_WINDOW_SECONDS", "3600")),
+                    max_posts=int(os.getenv("NEAR_DUPLICATE_MAX_POSTS", "100000"))
+                )
+    return _near_duplicates
+
+
+def _is_near_duplicate(content_id: str, author_id: str, text: str, created_at: Optional[datetime]) -> bool:
+    """Index a post and report whether its near-duplicate cluster crosses the thresholds."""
+    if not text:
+        return False
+    cluster = _near_duplicate_index().observe(content_id, author_id, text, _epoch_seconds(created_at))
+    return cluster.size >= NEAR_DUPLICATE_CLUSTER_SIZE or cluster.authors >= NEAR_DUPLICATE_AUTHORS
+
+
+def _bulk_records(records: Iterable[Union[str, Dict[str, Any]]]) -> Iterator[Tuple[int, Union[str, Dict[str, Any]], bool]]:
+    """
+    Number raw records by input position and pair them with their near-duplicate flag.
+    
+    Runs in the parent process, so every record is compared against one window
+    (at its own ``created_at``) in input order, however the records are chunked
+    or spread over workers. Records that cannot be read are left to fail
+    validation in the worker.
+    """
+    for index, record in enumerate(records):
+        try:
+            data = json.loads(record) if isinstance(record, str) else record
+            flag = _is_near_duplicate(
+                str(data["content_id"]),
+                str(data["author_id"]),
+                data.get("content_text") or "",
+                _timestamp_adapter.validate_python(data.get("created_at"))
+            )
+        except Exception:
+            flag = False
+        yield index, record, flag
+
+
+def _record_content_id(record: Union[str, Dict[str, Any]]) -> Optional[str]:
+    """``content_id`` of a raw record that failed validation, if it can be read."""
+    try:
+        data = json.loads(record) if isinstance(record, str) else record
+        return str(data["content_id"]) if data.get("content_id") is not None else None
+    except Exception:
+        return None
+
+
+model_loader = ModelLoader()
+_classifier: Optional[ModerationClassifier] = None
+
+
+def _moderation_classifier() -> ModerationClassifier:
+    """Hashed n-gram classifier (trained artifact, or one that flags nothing)."""
+    global _classifier
+    if _classifier is None:
+        artifact = model_loader.get_model("moderation_classifier")
+        if artifact is None:
+            # Worker processes skip the startup hook and load the artifact themselves
+            artifact = model_loader.load_model("moderation_classifier", verbose=False)
+        _classifier = ModerationClassifier.from_artifact(artifact)
+    return _classifier
+
+
+def _moderate_records(records: List[Tuple[int, Union[str, Dict[str, Any]], bool]]) -> List[Tuple[str, str]]:
+    """
+    Moderate a chunk of raw records (JSON lines or dicts) in a worker process.
+    
+    Records come numbered and flagged from ``_bulk_records``. Returns one
+    (result JSON line, outcome) pair per record, where outcome is
+    ``approved``, ``flagged`` or ``error``; invalid records produce an error
+    line carrying their input ``index`` (and ``content_id`` when readable)
+    instead of failing the chunk.
+    """
+    requests: List[Union[ContentModerationRequest, Exception]] = []
+    for _, record, _ in records:
+        try:
+            if isinstance(record, str):
+                requests.append(ContentModerationRequest.model_validate_json(record))
+            else:
+                requests.append(ContentModerationRequest.model_validate(record))
+        except Exception as e:
+            requests.append(e)
+    
+    # Score every text in the chunk with one sparse matrix product
+    valid = [r for r in requests if isinstance(r, ContentModerationRequest) and r.content_text]
+    predicted = dict(zip(
+        (id(r) for r in valid), _moderation_classifier().categories_in([r.content_text for r in valid])
+    ))
+    
+    results = []
+    for request, (index, record, near_duplicate) in zip(requests, records):
+        try:
+            if isinstance(request, Exception):
+                raise request
+            result = _moderate_content(request, predicted.get(id(request)), near_duplicate)
+        except Exception as e:
+            error = {"error": str(e), "index": index, "content_id": _record_content_id(record)}
+            results.append((json.dumps(error), "error"))
+            continue
+        results.append((result.model_dump_json(), "flagged" if result.categories_flagged else "approved"))
+    return results
+
+
+# Worker processes for bulk moderation, started on first use
+moderation_pool: ChunkedProcessPool = ChunkedProcessPool(
+    _moderate_records,
+    workers=int(os.getenv("MODERATION_WORKERS", "0")) or None,
+    chunk_size=500
+)
+
+
 # ===========================================
 # ENDPOINTS
 # ===========================================
@@ -149,7 +320,7 @@ async def calculate_safety_score(profile: UserSafetyProfile):
     - Community standing
     """
     try:
-        score_result = _calculate_user_safety(profile)
+        score_result = _cached_user_safety(profile)
         return score_result
     except Exception as e:
         raise HTTPException(
@@ -201,6 +372,57 @@ async def moderate_content(request: ContentModerationRequest):
         )
 
 
+@router.post("/moderate-content/bulk")
+async def moderate_content_bulk(request: BulkModerationRequest):
+    """
+    Moderate many items in parallel, streamed back as NDJSON.
+    
+    Items are sent to worker processes in chunks and each result line is a
+    ``ContentModerationResult`` (or an error line with the item's input
+    ``index`` and ``content_id``), in input order unless ``ordered`` is
+    false. The last line is a summary with counts and throughput; running
+    jobs are visible at ``/moderate-content/bulk/stats``.
+    """
+    try:
+        summary: Dict[str, Any] = {"moderated": 0, "flagged": 0, "errors": 0, "workers": moderation_pool.workers}
+        records = [item.model_dump() for item in request.items]
+        return ndjson_response(_bulk_moderation_lines(records, request.ordered, summary), summary)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Bulk moderation failed: {str(e)}"
+        )
+
+
+@router.get("/moderate-content/bulk/stats")
+async def get_bulk_moderation_stats():
+    """Get worker pool size and progress of running bulk moderation jobs."""
+    return moderation_pool.stats()
+
+
+@router.get("/moderation/lexicon")
+async def get_moderation_lexicon_stats():
+    """Get moderation lexicon size and reload status."""
+    return moderation_lexicon.stats()
+
+
+@router.post("/moderation/lexicon/reload")
+async def reload_moderation_lexicon():
+    """Rebuild the moderation automaton from the lexicon file now."""
+    if not moderation_lexicon.reload():
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to load lexicon from {moderation_lexicon.path}"
+        )
+    return moderation_lexicon.stats()
+
+
+@router.get("/moderation/near-duplicates")
+async def get_near_duplicate_stats():
+    """Get near-duplicate window size and lookup latency."""
+    return _near_duplicate_index().stats()
+
+
 @router.post("/report-signal")
 async def report_safety_signal(
     user_id: str,
@@ -210,17 +432,49 @@ async def report_safety_signal(
     """
     Report a safety signal that affects user's safety score.
     
-    Signals are weighted and aggregated to update scores.
+    The signal is added to the user's decayed aggregates, which every later
+    calculation reads. If the user's score is cached, only the component the
+    signal affects is updated and the new score is returned.
     """
-    # In production, this would persist the signal and trigger recalculation
+    at = _signal_time(signal)
+    signal_store.record(user_id, signal.signal_type.value, signal.value, signal.confidence, at)
+    result = _report_to_cached_score(user_id, signal, signal_store.decay(time.time() - at))
+    if result is None:
+        return {
+            "status": "signal_recorded",
+            "user_id": user_id,
+            "signal_type": signal.signal_type,
+            "impact": "pending_recalculation"
+        }
     return {
         "status": "signal_recorded",
         "user_id": user_id,
         "signal_type": signal.signal_type,
-        "impact": "pending_recalculation"
+        "impact": "score_updated",
+        "component": SIGNAL_COMPONENTS[signal.signal_type],
+        "safety_score": result.safety_score,
+        "risk_level": result.risk_level
     }
 
 
+@router.get("/signals/stats")
+async def get_signal_store_stats():
+    """Get signal store size and record memory."""
+    return signal_store.stats()
+
+
+@router.get("/signals/{user_id}")
+async def get_user_signals(user_id: str):
+    """Get a user's decayed signal aggregates per signal type."""
+    return {"user_id": user_id, "signals": signal_store.aggregates(user_id)}
+
+
+@router.get("/cache/stats")
+async def get_safety_score_cache_stats():
+    """Get safety score cache hit rate, incremental updates and staleness."""
+    return safety_scores.stats()
+
+
 @router.get("/thresholds")
 async def get_safety_thresholds():
     """Get current safety score thresholds and their meanings."""
@@ -244,15 +498,9 @@ async def get_safety_thresholds():
 # HELPER FUNCTIONS
 # ===========================================
 
-def _calculate_user_safety(profile: UserSafetyProfile) -> SafetyScoreResult:
-    """Calculate comprehensive safety score."""
-    from datetime import timedelta
-    
-    components = {}
+def _verification_component(profile: UserSafetyProfile) -> Tuple[float, List[Dict[str, Any]]]:
+    """Verification component (0-100) and its risk factors."""
     risk_factors = []
-    mitigations = []
-    
-    # Verification component (0-100)
     verification_score = 30  # Base for existing account
     if profile.is_verified:
         verification_score += 40
@@ -262,9 +510,12 @@ def _calculate_user_safety(profile: UserSafetyProfile) -> SafetyScoreResult:
     elif profile.account_age_days < 7:
         verification_score -= 20
         risk_factors.append({"factor": "new_account", "severity": "medium"})
-    components["verification"] = min(100, max(0, verification_score))
-    
-    # Behavioral component (0-100)
+    return min(100, max(0, verification_score)), risk_factors
+
+
+def _behavior_component(profile: UserSafetyProfile) -> Tuple[float, List[Dict[str, Any]]]:
+    """Behavioral component (0-100) and its risk factors."""
+    risk_factors = []
     behavior_score = 70  # Base
     if profile.report_count_received > 0:
         penalty = min(40, profile.report_count_received * 10)
@@ -277,18 +528,23 @@ def _calculate_user_safety(profile: UserSafetyProfile) -> SafetyScoreResult:
     if profile.block_count_received > 2:
         behavior_score -= 15
         risk_factors.append({"factor": "multiple_blocks", "severity": "medium"})
-    components["behavior"] = max(0, behavior_score)
-    
-    # Community component (0-100)
+    return max(0, behavior_score), risk_factors
+
+
+def _community_component(profile: UserSafetyProfile) -> Tuple[float, List[Dict[str, Any]]]:
+    """Community component (0-100)."""
     community_score = 50  # Base
     if profile.total_interactions > 0:
         positive_ratio = profile.positive_interactions / profile.total_interactions
         community_score = 30 + (positive_ratio * 70)
     if profile.message_response_rate > 0.7:
         community_score += 10
-    components["community"] = min(100, community_score)
-    
-    # Content component (0-100)
+    return min(100, community_score), []
+
+
+def _content_component(profile: UserSafetyProfile) -> Tuple[float, List[Dict[str, Any]]]:
+    """Content component (0-100) and its risk factors."""
+    risk_factors = []
     content_score = 80  # Base
     if profile.content_flags > 0:
         penalty = min(50, profile.content_flags * 15)
@@ -296,23 +552,86 @@ def _calculate_user_safety(profile: UserSafetyProfile) -> SafetyScoreResult:
         risk_factors.append({"factor": "content_flags", "severity": "high"})
     if profile.content_approved > 10:
         content_score += 10
-    components["content"] = max(0, min(100, content_score))
+    return max(0, min(100, content_score)), risk_factors
+
+
+SCORE_COMPONENTS = {
+    "verification": (_verification_component, 0.25),
+    "behavior": (_behavior_component, 0.30),
+    "community": (_community_component, 0.25),
+    "content": (_content_component, 0.20),
+}
+
+# Score component each signal type adjusts
+SIGNAL_COMPONENTS = {
+    SignalType.VERIFICATION: "verification",
+    SignalType.BEHAVIORAL: "behavior",
+    SignalType.REPORT: "behavior",
+    SignalType.INTERACTION: "community",
+    SignalType.CONTENT: "content",
+}
+
+
+def _apply_signal(components: Dict[str, float], signal: SafetySignal, scale: float = 1.0) -> Dict[str, float]:
+    """Components with one signal (weighted by ``scale``) folded into the component it affects."""
+    return _apply_impact(components, signal.signal_type, signal.value * signal.confidence * scale)
+
+
+def _apply_impact(components: Dict[str, float], signal_type: SignalType, amount: float) -> Dict[str, float]:
+    """
+    Components with ``amount`` (value x confidence units) added to the signal type's component.
     
-    # Process custom signals
+    Not clamped: signal impacts add up, and only ``_safety_result`` clamps to
+    0-100, so a score updated signal by signal equals one computed at once.
+    """
+    name = SIGNAL_COMPONENTS[signal_type]
+    return {**components, name: components[name] + amount * 10}
+
+
+def _signal_time(signal: SafetySignal) -> float:
+    """Signal timestamp as epoch seconds (naive timestamps are UTC), or now."""
+    return _epoch_seconds(signal.timestamp)
+
+
+def _epoch_seconds(timestamp: Optional[datetime]) -> float:
+    """Epoch seconds of a timestamp (naive timestamps are UTC), or now."""
+    if timestamp is None:
+        return time.time()
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def _score_components(profile: UserSafetyProfile) -> Tuple[Dict[str, float], List[Dict[str, Any]]]:
+    """Unrounded, unclamped component scores (signals applied) and risk factors."""
+    components = {}
+    risk_factors = []
+    for name, (component, _) in SCORE_COMPONENTS.items():
+        components[name], factors = component(profile)
+        risk_factors.extend(factors)
     for signal in profile.custom_signals:
-        impact = signal.value * signal.confidence * 10
-        if signal.signal_type == SignalType.VERIFICATION:
-            components["verification"] = min(100, components["verification"] + impact)
-        elif signal.signal_type == SignalType.BEHAVIORAL:
-            components["behavior"] = max(0, min(100, components["behavior"] + impact))
+        components = _apply_signal(components, signal)
+    
+    # Reported signals, decayed by age
+    for kind, amount in signal_store.sums(profile.user_id).items():
+        components = _apply_impact(components, SignalType(kind), amount)
+    return components, risk_factors
+
+
+def _safety_result(
+    user_id: str,
+    components: Dict[str, float],
+    risk_factors: List[Dict[str, Any]],
+    valid_until: Optional[datetime] = None
+) -> SafetyScoreResult:
+    """Overall score, risk level and mitigations from (unclamped) component scores."""
+    from datetime import timedelta
+    
+    mitigations = []
+    components = {name: max(0, min(100, value)) for name, value in components.items()}
     
     # Calculate overall score (weighted average)
-    overall_score = (
-        components["verification"] * 0.25 +
-        components["behavior"] * 0.30 +
-        components["community"] * 0.25 +
-        components["content"] * 0.20
-    )
+    overall_score = sum(components[name] * weight for name, (_, weight) in SCORE_COMPONENTS.items())
     
     # Determine risk level
     if overall_score >= 70:
@@ -335,7 +654,7 @@ def _calculate_user_safety(profile: UserSafetyProfile) -> SafetyScoreResult:
     now = datetime.utcnow()
     
     return SafetyScoreResult(
-        user_id=profile.user_id,
+        user_id=user_id,
         safety_score=round(overall_score, 1),
         risk_level=risk_level,
         confidence=0.85,
@@ -343,11 +662,42 @@ def _calculate_user_safety(profile: UserSafetyProfile) -> SafetyScoreResult:
         risk_factors=risk_factors,
         mitigations=mitigations,
         calculated_at=now,
-        valid_until=now + timedelta(hours=24),
+        valid_until=valid_until or now + timedelta(hours=24),
         algorithm_version="1.0"
     )
 
 
+def _calculate_user_safety(profile: UserSafetyProfile) -> SafetyScoreResult:
+    """Calculate comprehensive safety score."""
+    components, risk_factors = _score_components(profile)
+    return _safety_result(profile.user_id, components, risk_factors)
+
+
+def _cached_user_safety(profile: UserSafetyProfile) -> SafetyScoreResult:
+    """Safety score from the cache while valid for this exact profile, else computed and cached."""
+    digest = request_digest(profile.model_dump(mode="json"))
+    cached = safety_scores.get(profile.user_id, digest)
+    if cached is not None:
+        return cached[1]
+    
+    components, risk_factors = _score_components(profile)
+    result = _safety_result(profile.user_id, components, risk_factors)
+    ttl = (result.valid_until - datetime.utcnow()).total_seconds()
+    safety_scores.set(profile.user_id, digest, (components, result), ttl)
+    return result
+
+
+def _report_to_cached_score(user_id: str, signal: SafetySignal, scale: float = 1.0) -> Optional[SafetyScoreResult]:
+    """Fold a reported signal into the user's cached score. Returns None if not cached."""
+    def apply(entry: Tuple[Dict[str, float], SafetyScoreResult]) -> Tuple[Dict[str, float], SafetyScoreResult]:
+        components, result = entry
+        components = _apply_signal(components, signal, scale)
+        return components, _safety_result(user_id, components, result.risk_factors, result.valid_until)
+    
+    entry = safety_scores.update(user_id, apply)
+    return entry[1] if entry is not None else None
+
+
 def _evaluate_interaction(request: InteractionSafetyRequest) -> InteractionSafetyResult:
     """Evaluate interaction safety between two users."""
     warnings = []
@@ -381,23 +731,61 @@ def _evaluate_interaction(request: InteractionSafetyRequest) -> InteractionSafet
     )
 
 
-def _moderate_content(request: ContentModerationRequest) -> ContentModerationResult:
-    """Moderate content for policy compliance."""
+def _bulk_moderation_lines(
+    records: List[Dict[str, Any]],
+    ordered: bool,
+    summary: Dict[str, Any]
+) -> Iterator[str]:
+    """Result lines from the worker pool, tallying outcomes into the summary as they arrive."""
+    start = time.time()
+    for line, outcome in moderation_pool.map(_bulk_records(records), ordered=ordered):
+        if outcome == "error":
+            summary["errors"] += 1
+        else:
+            summary["moderated"] += 1
+            summary["flagged"] += outcome == "flagged"
+        yield line
+    elapsed = time.time() - start
+    summary["elapsed_ms"] = round(elapsed * 1000, 2)
+    summary["records_per_second"] = round(len(records) / elapsed, 1) if elapsed > 0 else 0.0
+
+
+def _moderate_content(
+    request: ContentModerationRequest,
+    model_categories: Optional[List[str]] = None,
+    near_duplicate: Optional[bool] = None
+) -> ContentModerationResult:
+    """
+    Moderate content for policy compliance.
+    
+    ``model_categories`` are classifier predictions already computed for a
+    batch; without them the text is classified on its own. Likewise
+    ``near_duplicate`` is a flag already computed by the caller; without it
+    the post is checked against the near-duplicate index here.
+    """
     categories_flagged = []
     is_approved = True
     requires_human_review = False
     
-    # Simple keyword-based detection (placeholder for ML model)
+    # Lexicon-based detection: one pass over the text for all terms
     if request.content_text:
-        text_lower = request.content_text.lower()
+        categories_flagged = moderation_lexicon.categories_in(request.content_text)
+        
+        # Hashed n-gram linear classifier
+        if model_categories is None:
+            model_categories = _moderation_classifier().categories_in([request.content_text])[0]
+        categories_flagged += [c for c in model_categories if c not in categories_flagged]
+        
+        # Lightly edited copies of the same text from many posts or accounts
+        if near_duplicate is None:
+            near_duplicate = _is_near_duplicate(
+                request.content_id, request.author_id, request.content_text, request.created_at
+            )
+        if near_duplicate:
+            categories_flagged.append("near_duplicate_spam")
         
-        # Check for potential issues
-        harmful_patterns = ["scam", "fake", "spam"]
-        for pattern in harmful_patterns:
-            if pattern in text_lower:
-                categories_flagged.append("potential_spam")
-                requires_human_review = True
-                break
+        if categories_flagged:
+            requires_human_review = True
     
     # Determine approval
     if categories_flagged:
@@ -0,0 +1,211 @@
+"""
+ANN Index Service
+=================
+Inverted-file (IVF) approximate nearest-neighbour index over unit vectors.
+
+Vectors are stored row-aligned with a candidate store, so search results are
+store rows. Once enough vectors are present, a spherical k-means on a sample
+splits the space into ``n_lists`` cells; a query scans only the vectors of
+its ``n_probe`` closest cells. The cell lists are kept as one CSR-style row
+array and rebuilt lazily after writes. Below ``min_train_size`` vectors, or
+before training, search is an exact brute-force scan. The quantizer is
+retrained when the number of vectors doubles; k-means runs outside the
+index lock, so searches keep using the previous centroids until the new ones
+are swapped in.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+def _top(similarities: np.ndarray, n: int) -> np.ndarray:
+    """Positions of the ``n`` largest similarities, best first."""
+    if len(similarities) > n:
+        best = np.argpartition(-similarities, n - 1)[:n]
+    else:
+        best = np.arange(len(similarities))
+    return best[np.argsort(-similarities[best], kind="stable")]
+
+
+def spherical_kmeans(vectors: np.ndarray, k: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Unit centroids of ``k`` clusters under cosine similarity."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        members = sparse.csr_matrix(
+            (np.ones(len(vectors), dtype=np.float32), (assign, np.arange(len(vectors)))),
+            shape=(k, len(vectors))
+        )
+        sums = np.asarray(members @ vectors)
+        empty = np.flatnonzero(np.bincount(assign, minlength=k) == 0)
+        sums[empty] = vectors[rng.choice(len(vectors), size=len(empty), replace=False)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = (sums / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+    return centroids
+
+
+class IVFIndex:
+    """Row-aligned IVF index with brute-force fallback."""
+
+    def __init__(
+        self,
+        dim: int,
+        n_probe: int = 8,
+        candidate_factor: float = 10.0,
+        min_train_size: int = 4096,
+        sample_size: int = 50000,
+        iterations: int = 10,
+        initial_capacity: int = 1024,
+        seed: int = 0,
+    ) -> None:
+        self.dim = dim
+        self.n_probe = n_probe
+        self.candidate_factor = candidate_factor
+        self._min_train_size = min_train_size
+        self._sample_size = sample_size
+        self._iterations = iterations
+        self._seed = seed
+        self._lock = threading.RLock()
+
+        self._vectors = np.zeros((max(1, initial_capacity), dim), dtype=np.float32)
+        self._present = np.zeros(max(1, initial_capacity), dtype=bool)
+        self._size = 0  # one past the highest row written
+
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.full(max(1, initial_capacity), -1, dtype=np.int64)
+        self._trained_count = 0
+        self._training = False
+        self._list_rows = np.zeros(0, dtype=np.int64)
+        self._list_ptr = np.zeros(1, dtype=np.int64)
+        self._lists_dirty = False
+
+        self._searches = 0
+        self._scanned = 0
+        self._search_seconds = 0.0
+
+    def __len__(self) -> int:
+        return int(self._present[:self._size].sum())
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def set_vectors(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """Store unit vectors at the given rows, replacing any previous ones."""
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return
+        with self._lock:
+            self._ensure_capacity(int(rows.max()) + 1)
+            self._vectors[rows] = vectors
+            self._present[rows] = True
+            self._size = max(self._size, int(rows.max()) + 1)
+
+            count = len(self)
+            sample = None
+            if not self._training and count >= self._min_train_size and count >= 2 * self._trained_count:
+                sample = self._training_sample()
+                self._training = True
+            if self._centroids is not None:
+                self._assign[rows] = np.argmax(self._vectors[rows] @ self._centroids.T, axis=1)
+                self._lists_dirty = True
+        if sample is not None:
+            self._train(sample)
+
+    def _ensure_capacity(self, size: int) -> None:
+        capacity = len(self._present)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:len(self._vectors)] = self._vectors
+        self._vectors = vectors
+        self._present = np.concatenate([self._present, np.zeros(capacity - len(self._present), dtype=bool)])
+        self._assign = np.concatenate([self._assign, np.full(capacity - len(self._assign), -1, dtype=np.int64)])
+
+    def _training_sample(self) -> np.ndarray:
+        rows = np.flatnonzero(self._present[:self._size])
+        rng = np.random.default_rng(self._seed)
+        sample = rows if len(rows) <= self._sample_size else rng.choice(rows, size=self._sample_size, replace=False)
+        return self._vectors[sample]
+
+    def _train(self, sample: np.ndarray) -> None:
+        try:
+            n_lists = int(min(4096, max(16, 4 * math.sqrt(len(self)))))
+            centroids = spherical_kmeans(sample, n_lists, self._iterations, self._seed)
+        except Exception:
+            with self._lock:
+                self._training = False
+            raise
+
+        with self._lock:
+            rows = np.flatnonzero(self._present[:self._size])
+            for start in range(0, len(rows), 65536):
+                chunk = rows[start:start + 65536]
+                self._assign[chunk] = np.argmax(self._vectors[chunk] @ centroids.T, axis=1)
+            self._centroids = centroids
+            self._trained_count = len(rows)
+            self._training = False
+            self._lists_dirty = True
+
+    def _lists(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        with self._lock:
+            if self._lists_dirty:
+                assign = self._assign[:self._size]
+                rows = np.flatnonzero(assign >= 0)
+                order = np.argsort(assign[rows], kind="stable")
+                self._list_rows = rows[order]
+                self._list_ptr = np.zeros(len(self._centroids) + 1, dtype=np.int64)
+                np.cumsum(np.bincount(assign[rows], minlength=len(self._centroids)), out=self._list_ptr[1:])
+                self._lists_dirty = False
+            return self._centroids, self._list_rows, self._list_ptr
+
+    def search(self, query: np.ndarray, top_n: int, n_probe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rows of the ``top_n`` vectors most similar to ``query``, and their similarities.
+
+        ``n_probe`` defaults to the index setting, raised so that the probed
+        cells hold about ``candidate_factor`` times ``top_n`` vectors on average.
+        """
+        start = time.perf_counter()
+        query = np.asarray(query, dtype=np.float32)
+        if self._centroids is None:
+            candidates = np.flatnonzero(self._present[:self._size])
+        else:
+            centroids, list_rows, list_ptr = self._lists()
+            n_lists = len(centroids)
+            if n_probe is None:
+                mean_list = max(1.0, len(list_rows) / n_lists)
+                n_probe = max(self.n_probe, math.ceil(self.candidate_factor * top_n / mean_list))
+            cells = _top(centroids @ query, min(n_probe, n_lists))
+            candidates = np.concatenate([list_rows[list_ptr[c]:list_ptr[c + 1]] for c in cells.tolist()])
+
+        similarities = self._vectors[candidates] @ query
+        best = _top(similarities, top_n)
+        self._searches += 1
+        self._scanned += len(candidates)
+        self._search_seconds += time.perf_counter() - start
+        return candidates[best], similarities[best]
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, quantizer state and search counters."""
+        searches = max(self._searches, 1)
+        return {
+            "vectors": len(self),
+            "dim": self.dim,
+            "trained": self.trained,
+            "n_lists": 0 if self._centroids is None else len(self._centroids),
+            "n_probe": self.n_probe,
+            "searches": self._searches,
+            "mean_scanned": round(self._scanned / searches, 1),
+            "mean_search_ms": round(self._search_seconds / searches * 1000, 3),
+        }
@@ -0,0 +1,141 @@
+"""
+Availability Service
+====================
+Weekly availability as fixed-width UTC bitmaps.
+
+A profile's availability is a set of (day, start hour, end hour) slots in
+its own timezone. Each local hour of the week is mapped to its UTC hour of
+the week (using the timezone's offsets in the current week, so DST is
+applied) and set as one bit of a 168-bit bitmap packed into three uint64
+words. Overlap between two profiles is then the popcount of the AND of
+their bitmaps, which vectorizes across a whole pool of bitmaps at once.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+WEEK_HOURS = 168
+WORDS = 3  # uint64 words per bitmap
+WEEKS_PER_MONTH = 52 / 12
+
+Slot = Tuple[int, int, int]  # (day 0=Monday, start hour, end hour exclusive), local time
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _zone(name: str) -> ZoneInfo:
+    """ZoneInfo for an IANA name; unknown names are treated as UTC."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+@lru_cache(maxsize=1024)
+def _utc_hour_map(timezone: str, week_start: str) -> np.ndarray:
+    """UTC hour of the week for every local hour of the week starting at ``week_start``."""
+    zone = _zone(timezone)
+    monday = datetime.fromisoformat(week_start).replace(tzinfo=zone)
+    hours = np.empty(WEEK_HOURS, dtype=np.int64)
+    for h in range(WEEK_HOURS):
+        utc = (monday + timedelta(hours=h)).astimezone(dt_timezone.utc)
+        hours[h] = utc.weekday() * 24 + utc.hour
+    return hours
+
+
+def _week_start(timezone: str, reference: Optional[datetime]) -> str:
+    local = (reference or datetime.now(dt_timezone.utc)).astimezone(_zone(timezone))
+    return (local.date() - timedelta(days=local.weekday())).isoformat()
+
+
+def weekly_bitmap(slots: Iterable[Slot], timezone: str, reference: Optional[datetime] = None) -> np.ndarray:
+    """
+    Packed UTC bitmap of local weekly slots.
+
+    ``reference`` picks the week whose UTC offsets are used (default: now).
+    """
+    local = [day * 24 + h for day, start, end in slots for h in range(start, end)]
+    bitmap = np.zeros(WORDS, dtype=np.uint64)
+    if not local:
+        return bitmap
+    hours = np.unique(_utc_hour_map(timezone, _week_start(timezone, reference))[local])
+    np.bitwise_or.at(bitmap, hours // 64, np.left_shift(np.uint64(1), (hours % 64).astype(np.uint64)))
+    return bitmap
+
+
+def popcount(bitmaps: np.ndarray) -> np.ndarray:
+    """Number of set bits per bitmap (over the last axis)."""
+    bitmaps = np.ascontiguousarray(bitmaps, dtype=np.uint64)
+    counts = _POPCOUNT[bitmaps.view(np.uint8)]
+    return counts.reshape(*bitmaps.shape[:-1], -1).sum(axis=-1, dtype=np.int64)
+
+
+def weekly_overlap(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Shared hours per week between broadcastable bitmap arrays.
+
+    Where either side has no slots at all, availability is unknown and the
+    overlap is ``inf`` rather than 0, so it never constrains a score.
+    """
+    shared = popcount(a & b).astype(np.float64)
+    known = (popcount(a) > 0) & (popcount(b) > 0)
+    return np.where(known, shared, np.inf)
+
+
+def utc_offset_hours(timezone: str, reference: Optional[datetime] = None) -> float:
+    """Current UTC offset of a timezone in hours."""
+    local = (reference or datetime.now(dt_timezone.utc)).astimezone(_zone(timezone))
+    return local.utcoffset().total_seconds() / 3600
+
+
+class AvailabilityBitmaps:
+    """Row-aligned availability bitmaps for a candidate store."""
+
+    def __init__(self, initial_capacity: int = 1024) -> None:
+        self._bitmaps = np.zeros((max(1, initial_capacity), WORDS), dtype=np.uint64)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def set(self, rows: np.ndarray, bitmaps: np.ndarray) -> None:
+        """Store bitmaps at the given rows, replacing any previous ones."""
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return
+        with self._lock:
+            size = int(rows.max()) + 1
+            if size > len(self._bitmaps):
+                capacity = len(self._bitmaps)
+                while capacity < size:
+                    capacity *= 2
+                grown = np.zeros((capacity, WORDS), dtype=np.uint64)
+                grown[:len(self._bitmaps)] = self._bitmaps
+                self._bitmaps = grown
+            self._bitmaps[rows] = bitmaps
+            self._size = max(self._size, size)
+
+    def get(self, rows: np.ndarray) -> np.ndarray:
+        """Bitmaps at ``rows``; rows never set have no slots."""
+        rows = np.asarray(rows, dtype=np.int64)
+        bitmaps = self._bitmaps
+        result = np.zeros((len(rows), WORDS), dtype=np.uint64)
+        inside = rows < len(bitmaps)
+        result[inside] = bitmaps[rows[inside]]
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Number of profiles with slots and mean hours per week."""
+        hours = popcount(self._bitmaps[:self._size])
+        with_slots = hours > 0
+        return {
+            "profiles": self._size,
+            "profiles_with_slots": int(with_slots.sum()),
+            "mean_weekly_hours": round(float(hours[with_slots].mean()), 1) if with_slots.any() else 0.0,
+            "memory_bytes": int(self._bitmaps.nbytes),
+        }
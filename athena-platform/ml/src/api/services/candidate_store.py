@@ -0,0 +1,205 @@
+"""
+Candidate Store Service
+=======================
+In-memory columnar store for ranking and feed candidates.
+
+Scalar fields (numbers, booleans, timestamps and enums) are kept in NumPy
+columns so scorers can read them by row index; everything else is kept in
+plain Python lists. Rows are keyed by candidate id and can be bulk-loaded
+from a JSONL file or upserted incrementally. Every write stamps its row with
+an increasing store version, so readers can find the rows changed since a
+version they have seen.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Type
+
+import numpy as np
+from pydantic import BaseModel
+
+_SCALAR_DTYPES = {bool: np.bool_, int: np.int64, float: np.float64}
+
+
+class CandidateStore:
+    """Columnar candidate store keyed by id."""
+
+    def __init__(self, model: Type[BaseModel], key: str = "id", initial_capacity: int = 1024) -> None:
+        self._model = model
+        self._key = key
+        self._capacity = max(1, initial_capacity)
+        self._lock = threading.RLock()
+        self._index: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._version = 0
+        self._updated = np.zeros(self._capacity, dtype=np.int64)  # store version of each row's last write
+
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._datetimes: set[str] = set()
+        self._enums: Dict[str, List[Enum]] = {}
+        self._objects: Dict[str, List[Any]] = {}
+
+        for name, field in model.model_fields.items():
+            if name == key:
+                continue
+            annotation = field.annotation
+            if annotation in _SCALAR_DTYPES:
+                self._arrays[name] = np.zeros(self._capacity, dtype=_SCALAR_DTYPES[annotation])
+            elif annotation is datetime:
+                self._arrays[name] = np.zeros(self._capacity, dtype=np.float64)
+                self._datetimes.add(name)
+            elif isinstance(annotation, type) and issubclass(annotation, Enum):
+                self._arrays[name] = np.zeros(self._capacity, dtype=np.int16)
+                self._enums[name] = list(annotation)
+            else:
+                self._objects[name] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._index
+
+    @property
+    def version(self) -> int:
+        """Number of writes so far; rows written later have a higher version."""
+        return self._version
+
+    # ===========================================
+    # WRITES
+    # ===========================================
+
+    def upsert(self, records: Iterable[BaseModel]) -> int:
+        """Insert or replace candidates. Returns the number of rows written."""
+        written = 0
+        with self._lock:
+            for record in records:
+                row = self._row_for(getattr(record, self._key))
+                for name in self._arrays:
+                    self._arrays[name][row] = self._encode(name, getattr(record, name))
+                for name, column in self._objects.items():
+                    column[row] = getattr(record, name)
+                self._version += 1
+                self._updated[row] = self._version
+                written += 1
+        return written
+
+    def load_jsonl(self, path: Path, batch_size: int = 10000) -> int:
+        """Bulk-load candidates from a JSON-lines file."""
+        if not path.exists():
+            return 0
+
+        loaded = 0
+        batch: List[BaseModel] = []
+        with path.open("r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                batch.append(self._model.model_validate_json(line))
+                if len(batch) >= batch_size:
+                    loaded += self.upsert(batch)
+                    batch = []
+        if batch:
+            loaded += self.upsert(batch)
+        return loaded
+
+    def _row_for(self, candidate_id: str) -> int:
+        row = self._index.get(candidate_id)
+        if row is not None:
+            return row
+
+        row = len(self._ids)
+        if row >= self._capacity:
+            self._grow()
+        self._index[candidate_id] = row
+        self._ids.append(candidate_id)
+        for column in self._objects.values():
+            column.append(None)
+        return row
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        for name, column in self._arrays.items():
+            grown = np.zeros(self._capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            self._arrays[name] = grown
+        updated = np.zeros(self._capacity, dtype=np.int64)
+        updated[: len(self._updated)] = self._updated
+        self._updated = updated
+
+    def _encode(self, name: str, value: Any) -> Any:
+        if name in self._datetimes:
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return value.timestamp()
+        if name in self._enums:
+            return self._enums[name].index(value)
+        return value
+
+    # ===========================================
+    # READS
+    # ===========================================
+
+    def lookup(self, candidate_ids: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+        """Resolve ids to row indices. Returns (rows, missing_ids)."""
+        rows = []
+        missing = []
+        index = self._index
+        for candidate_id in candidate_ids:
+            row = index.get(candidate_id)
+            if row is None:
+                missing.append(candidate_id)
+            else:
+                rows.append(row)
+        return np.asarray(rows, dtype=np.int64), missing
+
+    def changed_since(self, version: int) -> np.ndarray:
+        """Rows inserted or replaced after the store was at ``version``."""
+        with self._lock:
+            return np.flatnonzero(self._updated[: len(self._ids)] > version)
+
+    def ids(self, rows: np.ndarray) -> List[str]:
+        """Candidate ids for the given rows."""
+        return [self._ids[row] for row in rows]
+
+    def column(self, name: str, rows: np.ndarray) -> np.ndarray:
+        """Scalar column values for the given rows (timestamps as epoch seconds, enums as codes)."""
+        return self._arrays[name][: len(self._ids)][rows]
+
+    def objects(self, name: str, rows: np.ndarray) -> List[Any]:
+        """Object column values for the given rows."""
+        column = self._objects[name]
+        return [column[row] for row in rows]
+
+    def materialize(self, rows: np.ndarray) -> List[BaseModel]:
+        """Rebuild model instances for the given rows without re-validation."""
+        with self._lock:
+            decoded: Dict[str, List[Any]] = {self._key: self.ids(rows)}
+            for name in self._arrays:
+                values = self.column(name, rows).tolist()
+                if name in self._datetimes:
+                    values = [datetime.fromtimestamp(v, tz=timezone.utc) for v in values]
+                elif name in self._enums:
+                    members = self._enums[name]
+                    values = [members[v] for v in values]
+                decoded[name] = values
+            for name in self._objects:
+                decoded[name] = self.objects(name, rows)
+
+        names = list(decoded)
+        return [
+            self._model.model_construct(**dict(zip(names, values)))
+            for values in zip(*decoded.values())
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Store size and memory footprint of the array columns."""
+        return {
+            "candidates": len(self._ids),
+            "capacity": self._capacity,
+            "array_bytes": int(sum(column.nbytes for column in self._arrays.values())),
+        }
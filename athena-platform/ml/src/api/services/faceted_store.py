@@ -0,0 +1,176 @@
+"""
+Faceted Store Service
+=====================
+Candidate store with inverted indexes over categorical fields.
+
+Each facet maps a lowercased value (an expertise area, an industry, a
+language, ...) to the rows holding it. Posting lists are kept as sets for
+cheap upserts and converted to sorted NumPy arrays on first read, so
+retrieval is a handful of boolean-mask assignments over the store. A facet
+can also be read as a sparse binary row-by-value matrix for vectorized
+overlap scoring. Writes do not drop the matrices: rows added since a build
+read as empty until ``refresh_matrices`` rebuilds them and swaps the result
+in, so writers can keep the rebuild off the request path. Value columns are
+assigned once and never reused, so a vocabulary read from an older matrix
+stays valid against a newer one.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple, Type
+
+import numpy as np
+from pydantic import BaseModel
+from scipy import sparse
+
+from src.api.services.candidate_store import CandidateStore
+
+Term = Tuple[str, str]
+
+
+def facet_value(value: Any) -> str:
+    """Normalised index key for a facet value."""
+    if isinstance(value, Enum):
+        value = value.value
+    return str(value).strip().lower()
+
+
+class FacetedStore(CandidateStore):
+    """Columnar store with per-facet inverted indexes."""
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        facets: Mapping[str, str],
+        key: str = "id",
+        initial_capacity: int = 1024,
+    ) -> None:
+        super().__init__(model, key=key, initial_capacity=initial_capacity)
+        self._facets = dict(facets)  # facet name -> model field
+        self._postings: Dict[Term, Set[int]] = {}
+        self._posting_arrays: Dict[Term, np.ndarray] = {}
+        self._row_terms: Dict[int, List[Term]] = {}
+        self._vocabularies: Dict[str, Dict[str, int]] = {}  # facet -> value -> column, append-only
+        self._matrices: Dict[str, Tuple[sparse.csr_matrix, Dict[str, int], int]] = {}  # + store version
+
+    def upsert(self, records: Iterable[BaseModel]) -> int:
+        """Insert or replace records and re-index their facets."""
+        records = list(records)
+        with self._lock:
+            written = super().upsert(records)
+            for record in records:
+                self._reindex(self._index[getattr(record, self._key)], record)
+        return written
+
+    def _reindex(self, row: int, record: BaseModel) -> None:
+        for term in self._row_terms.get(row, ()):
+            self._postings[term].discard(row)
+            self._posting_arrays.pop(term, None)
+
+        terms = []
+        for facet, field in self._facets.items():
+            value = getattr(record, field)
+            values = value if isinstance(value, (list, tuple, set, frozenset)) else [value]
+            for v in values:
+                if v is None:
+                    continue
+                term = (facet, facet_value(v))
+                self._postings.setdefault(term, set()).add(row)
+                self._posting_arrays.pop(term, None)
+                terms.append(term)
+        self._row_terms[row] = terms
+
+    def postings(self, facet: str, value: Any) -> np.ndarray:
+        """Sorted rows holding ``value`` in ``facet``."""
+        term = (facet, facet_value(value))
+        array = self._posting_arrays.get(term)
+        if array is None:
+            with self._lock:
+                array = np.fromiter(sorted(self._postings.get(term, ())), dtype=np.int64)
+                self._posting_arrays[term] = array
+        return array
+
+    def facet_matrix(self, facet: str) -> Tuple[sparse.csr_matrix, Dict[str, int]]:
+        """
+        Binary (rows x values) CSR matrix of a facet and its value-to-column map.
+
+        Built from the posting lists on first use; afterwards the last built
+        matrix is served, padded with empty rows for rows added since.
+        """
+        cached = self._matrices.get(facet)
+        if cached is None:
+            with self._lock:
+                cached = self._matrices.get(facet)
+                if cached is None:
+                    cached = self._build_matrix(facet)
+                    self._matrices[facet] = cached
+
+        matrix, vocabulary, version = cached
+        size = len(self)
+        if matrix.shape[0] < size:
+            indptr = np.pad(matrix.indptr, (0, size - matrix.shape[0]), mode="edge")
+            matrix = sparse.csr_matrix((matrix.data, matrix.indices, indptr), shape=(size, matrix.shape[1]))
+            with self._lock:
+                if self._matrices.get(facet) is cached:
+                    self._matrices[facet] = (matrix, vocabulary, version)
+        return matrix, vocabulary
+
+    def refresh_matrices(self) -> int:
+        """
+        Rebuild the facet matrices that are behind the store and swap them in.
+
+        CPU-bound; call it from a worker thread after writes. Returns the
+        number of matrices rebuilt.
+        """
+        rebuilt = 0
+        for facet, (_, _, version) in list(self._matrices.items()):
+            if version == self.version:
+                continue
+            built = self._build_matrix(facet)
+            with self._lock:
+                current = self._matrices.get(facet)
+                if current is None or current[2] < built[2]:
+                    self._matrices[facet] = built
+                    rebuilt += 1
+        return rebuilt
+
+    def _build_matrix(self, facet: str) -> Tuple[sparse.csr_matrix, Dict[str, int], int]:
+        with self._lock:
+            version = self.version
+            size = len(self)
+            vocabulary = self._vocabularies.setdefault(facet, {})
+            terms = [term for term, rows in self._postings.items() if term[0] == facet and rows]
+            for _, value in terms:
+                vocabulary.setdefault(value, len(vocabulary))
+            vocabulary = dict(vocabulary)
+            postings = [self.postings(*term) for term in terms]
+
+        rows = np.concatenate(postings) if postings else np.zeros(0, dtype=np.int64)
+        columns = np.repeat(
+            np.array([vocabulary[value] for _, value in terms], dtype=np.int64),
+            [len(p) for p in postings]
+        )
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+            shape=(size, len(vocabulary))
+        )
+        return matrix, vocabulary, version
+
+    def retrieve(self, terms: Mapping[str, Iterable[Any]]) -> np.ndarray:
+        """Rows matching at least one of the given values in any facet, in row order."""
+        mask = np.zeros(len(self), dtype=bool)
+        for facet, values in terms.items():
+            for value in values:
+                mask[self.postings(facet, value)] = True
+        return np.flatnonzero(mask)
+
+    def stats(self) -> Dict[str, Any]:
+        """Store stats plus the number of distinct values per facet."""
+        stats = super().stats()
+        counts = {facet: 0 for facet in self._facets}
+        for (facet, _), rows in self._postings.items():
+            if rows:
+                counts[facet] += 1
+        stats["facet_values"] = counts
+        return stats
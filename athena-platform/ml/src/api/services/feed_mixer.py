@@ -0,0 +1,113 @@
+"""
+Feed Mixing Service
+===================
+Bucketed feed mixing driven by the configured mix ratios.
+
+Candidates are assigned to one bucket each (following, trending, jobs, ...)
+in a single vectorised pass. Every bucket keeps a max-heap of its items by
+score, and pages are filled by weighted deficit round-robin across the
+non-empty buckets, so each page costs O(page_size * log n) and the ratios
+hold across consecutive pages.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+# Bucket precedence when a candidate qualifies for several buckets.
+BUCKET_PRIORITY = (
+    "sponsored",
+    "following",
+    "jobs",
+    "courses",
+    "mentors",
+    "tutorials",
+    "industry_news",
+    "trending",
+    "professional_content",
+    "recommended",
+)
+
+
+def assign_buckets(
+    masks: Mapping[str, np.ndarray],
+    ratios: Mapping[str, float],
+    size: int,
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Assign every candidate to one configured bucket.
+
+    ``masks`` maps bucket names to boolean eligibility arrays. Only buckets
+    with a positive ratio are used; candidates matching none of them fall
+    into ``recommended`` if configured, else the largest organic bucket.
+    Returns the bucket names and a bucket index per candidate.
+    """
+    names = [name for name, ratio in ratios.items() if ratio > 0]
+    if not names:
+        return ["recommended"], np.zeros(size, dtype=np.int64)
+
+    organic = [name for name in names if name != "sponsored"] or names
+    fallback = "recommended" if "recommended" in names else max(organic, key=lambda name: ratios[name])
+
+    ordered = [name for name in BUCKET_PRIORITY if name in names and name in masks and name != fallback]
+    conditions = [masks[name] for name in ordered]
+    choices = [names.index(name) for name in ordered]
+    if not conditions:
+        return names, np.full(size, names.index(fallback), dtype=np.int64)
+    return names, np.select(conditions, choices, default=names.index(fallback))
+
+
+class FeedMixer:
+    """Per-bucket max-heaps filled into pages by weighted deficit round-robin."""
+
+    def __init__(self, scores: np.ndarray, buckets: np.ndarray, names: Sequence[str], ratios: Mapping[str, float]) -> None:
+        self._names = list(names)
+        self._weights = [float(ratios.get(name, 0.0)) or 1.0 for name in self._names]
+        self._sponsored = self._names.index("sponsored") if "sponsored" in self._names else -1
+        self._deficits = [0.0] * len(self._names)
+        self._heaps: List[List[Tuple[float, int]]] = [[] for _ in self._names]
+
+        negated = (-scores).tolist()
+        for index, bucket in enumerate(buckets.tolist()):
+            self._heaps[bucket].append((negated[index], index))
+        for heap in self._heaps:
+            heapq.heapify(heap)
+        self._remaining = sum(len(heap) for heap in self._heaps)
+
+    @property
+    def remaining(self) -> int:
+        """Number of candidates not yet placed on a page."""
+        return self._remaining
+
+    def next_page(self, page_size: int) -> List[Tuple[int, str]]:
+        """Pop the next page as (candidate index, bucket name) pairs."""
+        page = []
+        heaps = self._heaps
+        deficits = self._deficits
+        weights = self._weights
+
+        while len(page) < page_size and self._remaining:
+            active = [b for b, heap in enumerate(heaps) if heap]
+            if active == [self._sponsored]:
+                # Never fill pages with sponsored items alone
+                self._remaining -= len(heaps[self._sponsored])
+                heaps[self._sponsored].clear()
+                break
+            total = sum(weights[b] for b in active)
+            for b in active:
+                deficits[b] += weights[b] / total
+            chosen = max(active, key=lambda b: deficits[b])
+            deficits[chosen] -= 1.0
+
+            _, index = heapq.heappop(heaps[chosen])
+            page.append((index, self._names[chosen]))
+            self._remaining -= 1
+
+        return page
+
+    def stats(self) -> Dict[str, int]:
+        """Items left per bucket."""
+        return {name: len(heap) for name, heap in zip(self._names, self._heaps)}
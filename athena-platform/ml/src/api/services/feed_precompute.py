@@ -0,0 +1,161 @@
+"""
+Feed Precompute Service
+=======================
+Background precomputation of feeds for recently active users.
+
+Request handlers call ``touch`` with the user's prepared context. A scheduler
+task wakes up periodically, picks users active within the activity window
+whose precomputed feeds are missing or due for a refresh, and runs the
+compute callback for each (user, feed context) pair on a thread pool.
+Results are kept in a bounded TTL cache, so a feed is never served more
+than ``ttl_seconds`` after it was computed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from src.api.services.ttl_cache import TTLCache
+
+V = TypeVar("V")
+
+
+class FeedPrecomputer(Generic[V]):
+    """Scheduler and cache for feeds precomputed off the request path."""
+
+    def __init__(
+        self,
+        compute: Callable[[str, str, Any], V],
+        feed_contexts: Sequence[str],
+        interval_seconds: float = 60.0,
+        refresh_seconds: float = 120.0,
+        ttl_seconds: float = 300.0,
+        active_window_seconds: float = 1800.0,
+        max_users: int = 10000,
+        workers: int = 4,
+    ) -> None:
+        self._compute = compute
+        self._feed_contexts = tuple(feed_contexts)
+        self._interval = interval_seconds
+        self._refresh = refresh_seconds
+        self._active_window = active_window_seconds
+        self._max_users = max_users
+        self._workers = workers
+
+        self._cache: TTLCache[V] = TTLCache(max_entries=max_users * len(self._feed_contexts), ttl_seconds=ttl_seconds)
+        self._computed_at: Dict[Tuple[str, str], float] = {}
+        self._active: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self._runs = 0
+        self._computed = 0
+        self._failures = 0
+        self._last_run_ms = 0.0
+
+    def touch(self, user_id: str, context: Any) -> None:
+        """Mark a user as active, remembering the context to compute their feeds with."""
+        with self._lock:
+            self._active[user_id] = (time.time(), context)
+            self._active.move_to_end(user_id)
+            while len(self._active) > self._max_users:
+                self._active.popitem(last=False)
+
+    def get(self, user_id: str, feed_context: str) -> Optional[V]:
+        """Precomputed feed for a user and feed context, if one is fresh."""
+        return self._cache.get((user_id, feed_context))
+
+    def handles(self, feed_context: str) -> bool:
+        return feed_context in self._feed_contexts
+
+    # ===========================================
+    # SCHEDULER
+    # ===========================================
+
+    async def start(self) -> None:
+        """Start the background scheduler."""
+        if self._task is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="feed-precompute")
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the scheduler and wait for running computations."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown, True)
+            self._executor = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                self._failures += 1
+                print(f"  ✗ Feed precompute run failed: {e}")
+
+    async def run_once(self) -> int:
+        """Refresh feeds of all active users that are due. Returns the number computed."""
+        start = time.time()
+        due = self._due(start)
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, self._compute_one, user_id, feed_context, context)
+              for user_id, feed_context, context in due)
+        )
+        self._runs += 1
+        self._last_run_ms = round((time.time() - start) * 1000, 2)
+        return sum(results)
+
+    def _due(self, now: float) -> List[Tuple[str, str, Any]]:
+        with self._lock:
+            idle = [u for u, (seen_at, _) in self._active.items() if now - seen_at > self._active_window]
+            for user_id in idle:
+                del self._active[user_id]
+                for feed_context in self._feed_contexts:
+                    self._computed_at.pop((user_id, feed_context), None)
+            active = [(user_id, context) for user_id, (_, context) in self._active.items()]
+
+        due = []
+        for user_id, context in active:
+            for feed_context in self._feed_contexts:
+                computed_at = self._computed_at.get((user_id, feed_context))
+                if computed_at is None or now - computed_at >= self._refresh:
+                    due.append((user_id, feed_context, context))
+        return due
+
+    def _compute_one(self, user_id: str, feed_context: str, context: Any) -> int:
+        try:
+            value = self._compute(user_id, feed_context, context)
+        except Exception as e:
+            self._failures += 1
+            print(f"  ✗ Failed to precompute {feed_context} feed for {user_id}: {e}")
+            return 0
+        self._cache.set((user_id, feed_context), value)
+        self._computed_at[(user_id, feed_context)] = time.time()
+        self._computed += 1
+        return 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Active users, scheduler counters and cache hit ratio."""
+        with self._lock:
+            active = len(self._active)
+        return {
+            "running": self._task is not None,
+            "active_users": active,
+            "feed_contexts": list(self._feed_contexts),
+            "runs": self._runs,
+            "computed": self._computed,
+            "failures": self._failures,
+            "last_run_ms": self._last_run_ms,
+            "cache": self._cache.stats(),
+        }
@@ -0,0 +1,191 @@
+"""
+Follow Graph Service
+====================
+Server-side follow, organization-follow and block relations for feed scoring.
+
+User and organization ids are interned to dense integers. Each relation is
+stored as a CSR adjacency (``indptr`` per user, sorted ``indices``), so a
+user's neighbours are one array slice and candidate authors are matched
+against them with a single ``np.searchsorted``. Upserts go into a small
+overlay that is folded into the CSR arrays once it grows large.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+RELATIONS = ("followed_users", "followed_organizations", "blocked_users")
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+class _Adjacency:
+    """CSR adjacency for one relation, with an overlay of recent upserts."""
+
+    def __init__(self) -> None:
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = _EMPTY
+        self.overlay: Dict[int, np.ndarray] = {}
+
+    def _csr(self, node: int) -> np.ndarray:
+        if node + 1 >= len(self.indptr):
+            return _EMPTY
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def neighbours(self, node: int) -> np.ndarray:
+        overlaid = self.overlay.get(node)
+        return overlaid if overlaid is not None else self._csr(node)
+
+    @property
+    def edge_count(self) -> int:
+        replaced = sum(len(self._csr(node)) for node in self.overlay)
+        return len(self.indices) - replaced + sum(len(t) for t in self.overlay.values())
+
+    def compact(self, node_count: int) -> None:
+        """Fold the overlay into new CSR arrays."""
+        sources = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        overlay_nodes = np.fromiter(self.overlay, dtype=np.int64, count=len(self.overlay))
+        keep = ~np.isin(sources, overlay_nodes)
+
+        sources = np.concatenate(
+            [sources[keep]] + [np.full(len(t), node, dtype=np.int64) for node, t in self.overlay.items()]
+        )
+        targets = np.concatenate([self.indices[keep]] + list(self.overlay.values()))
+        order = np.lexsort((targets, sources))
+
+        self.indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=node_count), out=self.indptr[1:])
+        self.indices = targets[order]
+        self.overlay = {}
+
+
+class FollowGraph:
+    """Interned-id follow graph with vectorized author masks."""
+
+    def __init__(self, compact_threshold: int = 10000) -> None:
+        self._compact_threshold = compact_threshold
+        self._codes: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._users: set[int] = set()
+        self._relations = {name: _Adjacency() for name in RELATIONS}
+        self._lock = threading.Lock()
+        self._compactions = 0
+
+    def __contains__(self, user_id: str) -> bool:
+        code = self._codes.get(user_id)
+        return code is not None and code in self._users
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def _intern(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._ids)
+            self._codes[value] = code
+            self._ids.append(value)
+        return code
+
+    def codes(self, values: Sequence[str]) -> np.ndarray:
+        """Integer codes for ids, -1 for ids the graph has never seen."""
+        get = self._codes.get
+        return np.fromiter((get(v, -1) for v in values), dtype=np.int64, count=len(values))
+
+    # ===========================================
+    # WRITES
+    # ===========================================
+
+    def upsert(self, user_id: str, **relations: Optional[Iterable[str]]) -> None:
+        """
+        Replace a user's relations.
+
+        Keyword arguments are relation names from ``RELATIONS``; relations that
+        are omitted or None are left unchanged.
+        """
+        with self._lock:
+            node = self._intern(user_id)
+            self._users.add(node)
+            for name, targets in relations.items():
+                if targets is None:
+                    continue
+                adjacency = self._relations[name]
+                adjacency.overlay[node] = np.unique(
+                    np.fromiter((self._intern(t) for t in targets), dtype=np.int64)
+                )
+                if len(adjacency.overlay) >= self._compact_threshold:
+                    adjacency.compact(len(self._ids))
+                    self._compactions += 1
+
+    def load_jsonl(self, path: Path) -> int:
+        """Bulk-load users from a JSON-lines file with ``user_id`` and relation lists."""
+        if not path.exists():
+            return 0
+
+        loaded = 0
+        with path.open("r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                self.upsert(record["user_id"], **{name: record.get(name) for name in RELATIONS})
+                loaded += 1
+        self.compact()
+        return loaded
+
+    def compact(self) -> None:
+        """Fold all pending upserts into the CSR arrays."""
+        with self._lock:
+            for adjacency in self._relations.values():
+                if adjacency.overlay:
+                    adjacency.compact(len(self._ids))
+                    self._compactions += 1
+
+    # ===========================================
+    # READS
+    # ===========================================
+
+    def neighbours(self, user_id: str, relation: str) -> List[str]:
+        """Ids related to a user, e.g. everyone they follow."""
+        code = self._codes.get(user_id)
+        if code is None:
+            return []
+        return [self._ids[c] for c in self._relations[relation].neighbours(code).tolist()]
+
+    def author_masks(self, user_id: str, author_ids: Sequence[str]) -> Optional[Tuple[np.ndarray, ...]]:
+        """
+        Membership of every author in each relation of the user, in ``RELATIONS`` order.
+
+        Returns None when the user is not in the graph.
+        """
+        code = self._codes.get(user_id)
+        if code is None or code not in self._users:
+            return None
+
+        authors = self.codes(author_ids)
+        with self._lock:
+            neighbours = [self._relations[name].neighbours(code) for name in RELATIONS]
+
+        masks = []
+        for targets in neighbours:
+            if not targets.size:
+                masks.append(np.zeros(len(authors), dtype=bool))
+                continue
+            positions = np.minimum(np.searchsorted(targets, authors), len(targets) - 1)
+            masks.append(targets[positions] == authors)
+        return tuple(masks)
+
+    def stats(self) -> Dict[str, Any]:
+        """Node and edge counts and memory used by the CSR arrays."""
+        return {
+            "users": len(self._users),
+            "interned_ids": len(self._ids),
+            "edges": {name: adjacency.edge_count for name, adjacency in self._relations.items()},
+            "pending_upserts": sum(len(a.overlay) for a in self._relations.values()),
+            "compactions": self._compactions,
+            "csr_bytes": int(sum(a.indptr.nbytes + a.indices.nbytes for a in self._relations.values())),
+        }
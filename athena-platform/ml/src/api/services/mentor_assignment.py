@@ -0,0 +1,129 @@
+"""
+Mentor Assignment Service
+=========================
+Capacity-constrained assignment of many mentees to a mentor pool.
+
+The full compatibility matrix is never held in memory: mentees are scored
+against the pool in chunks, and only each mentee's top-k mentors are kept.
+The sparsified graph is then solved with a Jacobi auction: every unassigned
+mentee bids on its best mentor at once, each mentor keeps its highest bids
+up to capacity, and a full mentor's price rises to its lowest kept bid.
+Mentees whose best net value drops below zero stay unassigned. The result
+is within ``k * epsilon`` of the best total score on the sparsified graph
+(``k`` being the number of assigned mentees).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+
+@dataclass
+class Assignment:
+    """Mentor index per mentee (-1 if unassigned) and solver statistics."""
+    mentor: np.ndarray
+    score: np.ndarray
+    prices: np.ndarray
+    rounds: int
+
+
+def top_k_edges(
+    score_chunk: Callable[[int, int], np.ndarray],
+    mentee_count: int,
+    mentor_count: int,
+    k: int,
+    min_score: float,
+    max_cells: int = 2_000_000,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Best ``k`` mentors per mentee scoring at least ``min_score``.
+
+    ``score_chunk(start, stop)`` returns the dense score rows for mentees
+    ``start:stop``; chunks are sized to about ``max_cells`` scores. Returns
+    (mentor indices, scores), both (mentees x k), padded with -1 / -inf.
+    """
+    k = min(k, mentor_count)
+    columns = np.full((mentee_count, k), -1, dtype=np.int64)
+    values = np.full((mentee_count, k), -np.inf)
+    if not k:
+        return columns, values
+
+    chunk = max(1, max_cells // mentor_count)
+    for start in range(0, mentee_count, chunk):
+        stop = min(start + chunk, mentee_count)
+        scores = score_chunk(start, stop)
+        scores[scores < min_score] = -np.inf
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        valid = np.isfinite(best_scores)
+        columns[start:stop] = np.where(valid, best, -1)
+        values[start:stop] = best_scores
+    return columns, values
+
+
+def auction_assign(
+    columns: np.ndarray,
+    values: np.ndarray,
+    capacity: np.ndarray,
+    epsilon: float = 0.01,
+    max_rounds: int = 100000,
+) -> Assignment:
+    """Maximise total score subject to each mentor taking at most ``capacity`` mentees."""
+    mentee_count, k = columns.shape
+    mentor_count = len(capacity)
+    # Mentors without capacity can never accept a bid
+    values = np.where((columns >= 0) & (capacity[np.maximum(columns, 0)] > 0), values, -np.inf)
+    mentor = np.full(mentee_count, -1, dtype=np.int64)
+    bid = np.zeros(mentee_count)
+    prices = np.zeros(mentor_count)
+    active = np.isfinite(values).any(axis=1) if k else np.zeros(mentee_count, dtype=bool)
+    safe_columns = np.where(columns >= 0, columns, 0)
+
+    rounds = 0
+    while rounds < max_rounds:
+        bidders = np.flatnonzero(active & (mentor < 0))
+        if not len(bidders):
+            break
+        rounds += 1
+
+        net = values[bidders] - prices[safe_columns[bidders]]
+        best = np.argmax(net, axis=1)
+        best_net = net[np.arange(len(bidders)), best]
+        net[np.arange(len(bidders)), best] = -np.inf
+        # Staying unassigned is always an option worth 0
+        second_net = np.maximum(net.max(axis=1) if k > 1 else -np.inf, 0.0)
+
+        gives_up = best_net < 0
+        active[bidders[gives_up]] = False
+        bidders = bidders[~gives_up]
+        targets = columns[bidders, best[~gives_up]]
+        bids = prices[targets] + best_net[~gives_up] - second_net[~gives_up] + epsilon
+
+        # Each mentor keeps its highest bids, current holders included
+        holders = np.flatnonzero(mentor >= 0)
+        who = np.concatenate([holders, bidders])
+        where = np.concatenate([mentor[holders], targets])
+        amount = np.concatenate([bid[holders], bids])
+        order = np.lexsort((-amount, where))
+        who, where, amount = who[order], where[order], amount[order]
+        group_start = np.searchsorted(where, where, side="left")
+        rank = np.arange(len(where)) - group_start
+        kept = rank < capacity[where]
+
+        mentor[who] = -1
+        mentor[who[kept]] = where[kept]
+        bid[who[kept]] = amount[kept]
+
+        # A full mentor's price is its lowest kept bid
+        full = kept & (rank == capacity[where] - 1)
+        prices[where[full]] = amount[full]
+
+    assigned = mentor >= 0
+    score = np.full(mentee_count, np.nan)
+    if assigned.any():
+        position = np.argmax(columns[assigned] == mentor[assigned, None], axis=1)
+        score[assigned] = values[assigned, position]
+    return Assignment(mentor=mentor, score=score, prices=prices, rounds=rounds)
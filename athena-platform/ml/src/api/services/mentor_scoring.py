@@ -0,0 +1,280 @@
+"""
+Mentor Scoring Service
+======================
+Vectorized mentee-mentor compatibility over the mentor pool.
+
+Skill overlap is one sparse matrix-vector product between the pool's binary
+expertise matrix and the mentee's skill vector; the goal, style,
+availability and experience terms are computed as arrays over the same
+rows. Scores match the per-pair formula used by the ``/score`` endpoint.
+Availability is additionally capped by the weekly hours both sides share,
+from their UTC availability bitmaps, when both have slots.
+Batches of mentees are scored against the pool in dense chunks, using a
+sparse mentee-by-skill matrix for the overlap term; arbitrary (mentee,
+mentor) pairs are scored element-wise.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from src.api.services.availability import WEEKS_PER_MONTH, WORDS, weekly_overlap
+from src.api.services.faceted_store import FacetedStore, facet_value
+
+# Component weights of the overall score
+WEIGHTS = {
+    "skill_alignment": 0.25,
+    "goal_compatibility": 0.25,
+    "style_fit": 0.15,
+    "availability_match": 0.15,
+    "experience_relevance": 0.20,
+}
+
+
+@dataclass
+class CompatibilityScores:
+    """Score components (0-100) for a batch of mentor rows."""
+    rows: np.ndarray
+    skill_alignment: np.ndarray
+    goal_compatibility: np.ndarray
+    style_fit: np.ndarray
+    availability_match: np.ndarray
+    experience_relevance: np.ndarray
+    overall: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def top(self, n: int, min_score: float = 0.0) -> np.ndarray:
+        """Positions of the best ``n`` scores at or above ``min_score``, best first."""
+        eligible = np.flatnonzero(np.round(self.overall, 1) >= min_score)
+        if len(eligible) > n:
+            eligible = eligible[np.argpartition(-self.overall[eligible], n - 1)[:n]]
+        return eligible[np.argsort(-self.overall[eligible], kind="stable")]
+
+
+def skill_vector(vocabulary: Mapping[str, int], skills: Iterable[str]) -> tuple[np.ndarray, int]:
+    """Binary vector over a facet vocabulary, and the number of distinct skills."""
+    distinct = {facet_value(skill) for skill in skills}
+    vector = np.zeros(len(vocabulary), dtype=np.float32)
+    columns = [vocabulary[s] for s in distinct if s in vocabulary]
+    vector[columns] = 1.0
+    return vector, len(distinct)
+
+
+def _components(
+    overlap: np.ndarray,
+    skill_count: np.ndarray,
+    mentor_experience: np.ndarray,
+    mentor_style: np.ndarray,
+    mentor_hours: np.ndarray,
+    experience_years: np.ndarray,
+    availability_hours: np.ndarray,
+    preferred_style_code: np.ndarray,
+    wants_leadership: np.ndarray,
+    wants_entrepreneurship: np.ndarray,
+    overlap_hours: np.ndarray = np.inf,
+) -> Dict[str, np.ndarray]:
+    """
+    Score components for mentees against mentors.
+
+    Mentor arguments are per-mentor arrays; mentee arguments are scalars or
+    column vectors, so one function serves single and batch scoring through
+    broadcasting. A ``preferred_style_code`` of -1 means no preference.
+    ``overlap_hours`` is the shared weekly availability (``inf`` if unknown).
+    """
+    skill_alignment = np.minimum(100, overlap / np.maximum(skill_count, 1) * 100 + 20)
+    goal_compatibility = np.minimum(
+        100, 70.0 + wants_leadership * (mentor_experience >= 10) * 15.0 + wants_entrepreneurship * 10.0
+    )
+    style_fit = np.where(mentor_style == preferred_style_code, 95.0, 80.0)
+    usable_hours = np.minimum(np.minimum(availability_hours, mentor_hours), overlap_hours * WEEKS_PER_MONTH)
+    availability_match = np.minimum(100, usable_hours / np.maximum(availability_hours, 1) * 100)
+    gap = mentor_experience - experience_years
+    experience_relevance = np.select([(gap >= 5) & (gap <= 15), gap > 15], [90.0, 75.0], default=60.0)
+
+    components = {
+        "skill_alignment": skill_alignment,
+        "goal_compatibility": goal_compatibility,
+        "style_fit": style_fit,
+        "availability_match": availability_match,
+        "experience_relevance": experience_relevance,
+    }
+    components["overall"] = sum(components[name] * weight for name, weight in WEIGHTS.items())
+    return components
+
+
+def score_mentors(
+    pool: FacetedStore,
+    rows: np.ndarray,
+    skills: Iterable[str],
+    experience_years: float,
+    availability_hours: int,
+    preferred_style_code: Optional[int] = None,
+    wants_leadership: bool = False,
+    wants_entrepreneurship: bool = False,
+    availability_bitmap: Optional[np.ndarray] = None,
+    mentor_bitmaps: Optional[np.ndarray] = None,
+) -> CompatibilityScores:
+    """
+    Compatibility of one mentee with the mentors at ``rows`` of the pool.
+
+    ``mentor_bitmaps`` holds the weekly availability bitmaps of those rows.
+    """
+    matrix, vocabulary = pool.facet_matrix("expertise")
+    vector, skill_count = skill_vector(vocabulary, skills)
+    components = _components(
+        overlap=(matrix @ vector)[rows],
+        skill_count=skill_count,
+        mentor_experience=pool.column("experience_years", rows),
+        mentor_style=pool.column("mentoring_style", rows),
+        mentor_hours=pool.column("availability_hours_per_month", rows),
+        experience_years=experience_years,
+        availability_hours=availability_hours,
+        preferred_style_code=-1 if preferred_style_code is None else preferred_style_code,
+        wants_leadership=wants_leadership,
+        wants_entrepreneurship=wants_entrepreneurship,
+        overlap_hours=_overlap(availability_bitmap, mentor_bitmaps),
+    )
+    return CompatibilityScores(rows=rows, **components)
+
+
+def _overlap(mentee_bitmaps: Optional[np.ndarray], mentor_bitmaps: Optional[np.ndarray]) -> np.ndarray:
+    if mentee_bitmaps is None or mentor_bitmaps is None:
+        return np.inf
+    return weekly_overlap(mentee_bitmaps, mentor_bitmaps)
+
+
+@dataclass
+class MenteeBatch:
+    """Column-wise mentee attributes for batch scoring."""
+    skills: sparse.csr_matrix  # (mentees x expertise vocabulary), binary
+    skill_count: np.ndarray
+    experience_years: np.ndarray
+    availability_hours: np.ndarray
+    preferred_style_code: np.ndarray  # -1 for no preference
+    wants_leadership: np.ndarray
+    wants_entrepreneurship: np.ndarray
+    availability_bitmaps: np.ndarray  # (mentees x WORDS), all zero for no slots
+
+    def __len__(self) -> int:
+        return len(self.skill_count)
+
+    @classmethod
+    def build(
+        cls,
+        pool: FacetedStore,
+        skills: Sequence[Iterable[str]],
+        experience_years: Sequence[float],
+        availability_hours: Sequence[int],
+        preferred_style_code: Sequence[int],
+        wants_leadership: Sequence[bool],
+        wants_entrepreneurship: Sequence[bool],
+        availability_bitmaps: Optional[Sequence[np.ndarray]] = None,
+    ) -> "MenteeBatch":
+        _, vocabulary = pool.facet_matrix("expertise")
+        distinct = [{facet_value(skill) for skill in mentee_skills} for mentee_skills in skills]
+        columns = [[vocabulary[s] for s in values if s in vocabulary] for values in distinct]
+        indptr = np.zeros(len(columns) + 1, dtype=np.int64)
+        np.cumsum([len(c) for c in columns], out=indptr[1:])
+        indices = np.fromiter((c for cols in columns for c in cols), dtype=np.int64, count=int(indptr[-1]))
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=(len(columns), len(vocabulary))
+        )
+        return cls(
+            skills=matrix,
+            skill_count=np.array([len(values) for values in distinct], dtype=np.float64),
+            experience_years=np.asarray(experience_years, dtype=np.float64),
+            availability_hours=np.asarray(availability_hours, dtype=np.float64),
+            preferred_style_code=np.asarray(preferred_style_code, dtype=np.int64),
+            wants_leadership=np.asarray(wants_leadership, dtype=bool),
+            wants_entrepreneurship=np.asarray(wants_entrepreneurship, dtype=bool),
+            availability_bitmaps=(
+                np.asarray(availability_bitmaps, dtype=np.uint64).reshape(len(columns), WORDS)
+                if availability_bitmaps is not None else np.zeros((len(columns), WORDS), dtype=np.uint64)
+            ),
+        )
+
+
+def compatibility_matrix(
+    pool: FacetedStore,
+    rows: np.ndarray,
+    batch: MenteeBatch,
+    start: int,
+    stop: int,
+    mentor_bitmaps: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Overall scores (mentees ``start:stop`` x mentor ``rows``)."""
+    return compatibility_components(pool, rows, batch, start, stop, mentor_bitmaps)["overall"]
+
+
+def compatibility_components(
+    pool: FacetedStore,
+    rows: np.ndarray,
+    batch: MenteeBatch,
+    start: int,
+    stop: int,
+    mentor_bitmaps: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """All score components (mentees ``start:stop`` x mentor ``rows``)."""
+    matrix, _ = pool.facet_matrix("expertise")
+    chunk = slice(start, stop)
+    mentors = matrix[rows]
+    if mentors.shape[1] > batch.skills.shape[1]:
+        # The matrix was rebuilt after the batch; values added since are not mentee skills
+        mentors = mentors[:, : batch.skills.shape[1]]
+    overlap = (batch.skills[chunk] @ mentors.T).toarray()
+    return _components(
+        overlap=overlap,
+        skill_count=batch.skill_count[chunk, None],
+        mentor_experience=pool.column("experience_years", rows),
+        mentor_style=pool.column("mentoring_style", rows),
+        mentor_hours=pool.column("availability_hours_per_month", rows),
+        experience_years=batch.experience_years[chunk, None],
+        availability_hours=batch.availability_hours[chunk, None],
+        preferred_style_code=batch.preferred_style_code[chunk, None],
+        wants_leadership=batch.wants_leadership[chunk, None],
+        wants_entrepreneurship=batch.wants_entrepreneurship[chunk, None],
+        overlap_hours=_overlap(batch.availability_bitmaps[chunk, None], mentor_bitmaps),
+    )
+
+
+def score_pairs(
+    mentee_skills: Sequence[Iterable[str]],
+    mentor_skills: Sequence[Iterable[str]],
+    mentor_experience: np.ndarray,
+    mentor_style: np.ndarray,
+    mentor_hours: np.ndarray,
+    experience_years: np.ndarray,
+    availability_hours: np.ndarray,
+    preferred_style_code: np.ndarray,
+    wants_leadership: np.ndarray,
+    wants_entrepreneurship: np.ndarray,
+    mentee_bitmaps: Optional[np.ndarray] = None,
+    mentor_bitmaps: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """Score components of aligned (mentee, mentor) pairs; all arguments are per pair."""
+    mentee_sets = [{facet_value(skill) for skill in skills} for skills in mentee_skills]
+    overlap = np.fromiter(
+        (len(a & {facet_value(skill) for skill in b}) for a, b in zip(mentee_sets, mentor_skills)),
+        dtype=np.float64,
+        count=len(mentee_sets)
+    )
+    return _components(
+        overlap=overlap,
+        skill_count=np.fromiter((len(a) for a in mentee_sets), dtype=np.float64, count=len(mentee_sets)),
+        mentor_experience=mentor_experience,
+        mentor_style=mentor_style,
+        mentor_hours=mentor_hours,
+        experience_years=experience_years,
+        availability_hours=availability_hours,
+        preferred_style_code=preferred_style_code,
+        wants_leadership=wants_leadership,
+        wants_entrepreneurship=wants_entrepreneurship,
+        overlap_hours=_overlap(mentee_bitmaps, mentor_bitmaps),
+    )
@@ -21,6 +21,17 @@ class ModelLoader:
     _status: Dict[str, bool] = {}
     _ready: bool = False
     
+    MODEL_PATHS: Dict[str, str] = {
+        "career_compass": "career_compass/model.joblib",
+        "mentor_match": "mentor_match/model.joblib",
+        "safety_score": "safety_score/model.joblib",
+        "income_stream": "income_stream/model.joblib",
+        "light_ranker": "light_ranker/model.joblib",
+        "heavy_ranker": "heavy_ranker/model.joblib",
+        "skill_embeddings": "skill_embeddings/model.joblib",
+        "moderation_classifier": "moderation_classifier/model.joblib",
+    }
+    
     def __new__(cls) -> "ModelLoader":
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -28,37 +39,44 @@ class ModelLoader:
     
     async def load_all_models(self) -> None:
         """Load all required models on startup."""
-        model_configs = {
-            "career_compass": "career_compass/model.joblib",
-            "mentor_match": "mentor_match/model.joblib",
-            "safety_score": "safety_score/model.joblib",
-            "income_stream": "income_stream/model.joblib",
-            "light_ranker": "light_ranker/model.joblib",
-            "heavy_ranker": "heavy_ranker/model.joblib",
-        }
-        
-        base_path = Path(os.getenv("MODEL_PATH", "models"))
-        
-        for name, rel_path in model_configs.items():
+        for name in self.MODEL_PATHS:
             try:
-                model_path = base_path / rel_path
-                if model_path.exists():
-                    self._models[name] = joblib.load(model_path)
-                    self._status[name] = True
-                    print(f"  ✓ Loaded {name}")
-                else:
-                    # Create placeholder for development
-                    self._models[name] = self._create_placeholder_model(name)
-                    self._status[name] = True
-                    print(f"  ⚠ Using placeholder for {name}")
+                self.load_model(name)
             except Exception as e:
                 print(f"  ✗ Failed to load {name}: {e}")
                 self._status[name] = False
         
         self._ready = True
     
+    def load_model(self, name: str, verbose: bool = True) -> Any:
+        """
+        Load one model (or its placeholder) and return it.
+        
+        Also used by worker processes, which do not run the startup hook and
+        pass ``verbose=False`` so nothing is written to a CLI's stdout.
+        """
+        model_path = Path(os.getenv("MODEL_PATH", "models")) / self.MODEL_PATHS[name]
+        if model_path.exists():
+            self._models[name] = joblib.load(model_path)
+            if verbose:
+                print(f"  ✓ Loaded {name}")
+        else:
+            # Create placeholder for development
+            self._models[name] = self._create_placeholder_model(name)
+            if verbose:
+                print(f"  ⚠ Using placeholder for {name}")
+        self._status[name] = True
+        return self._models[name]
+    
     def _create_placeholder_model(self, name: str) -> Any:
         """Create a placeholder model for development."""
+        if name == "skill_embeddings":
+            # An empty artifact makes the embedder fall back to random projections
+            return {}
+        if name == "moderation_classifier":
+            # An empty artifact gives a classifier that flags nothing
+            return {}
+
         from sklearn.ensemble import RandomForestRegressor
         import numpy as np
         
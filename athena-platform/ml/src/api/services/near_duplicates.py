@@ -0,0 +1,222 @@
+"""
+Near-Duplicate Service
+======================
+Streaming near-duplicate detection with MinHash signatures and LSH.
+
+Texts are normalised (lowercased, punctuation collapsed) and split into
+character shingles. Shingles are hashed with a vectorized polynomial hash
+over the UTF-8 bytes, and a MinHash signature is the minimum of
+``num_perm`` multiply-shift hashes of those values. Signatures are cut into
+``bands`` bands; posts sharing any band land in the same LSH bucket and are
+candidates, which are then checked against the estimated Jaccard
+similarity.
+
+Texts shorter than ``min_chars`` after normalisation ("congratulations!",
+"thank you") are too generic to indicate copying and are not indexed.
+
+Only posts from the last ``window_seconds`` are indexed, in a ring buffer
+of at most ``max_posts`` entries, so memory is bounded. Posts may arrive
+out of order (e.g. backfills): the window ends at the latest timestamp seen
+(future timestamps count as now), a post is only compared with posts within
+``window_seconds`` of its own timestamp, and a post already older than the
+window is checked but not indexed. A lookup touches ``bands`` buckets and
+verifies at most ``max_candidates`` recent members of each, so its cost
+does not grow with the window.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+_NON_WORD = re.compile(r"[\W_]+")
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def normalize_text(text: str) -> str:
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def shingle_hashes(text: str, size: int = 5) -> np.ndarray:
+    """Distinct 64-bit hashes of the character shingles of normalised text."""
+    data = np.frombuffer(normalize_text(text).encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+    if not len(data):
+        return np.zeros(0, dtype=np.uint64)
+    if len(data) < size:
+        data = np.concatenate([data, np.zeros(size - len(data), dtype=np.uint64)])
+    powers = np.uint64(257) ** np.arange(size - 1, -1, -1, dtype=np.uint64)
+    hashes = sliding_window_view(data, size) @ powers
+    hashes = hashes * _MIX
+    hashes ^= hashes >> np.uint64(29)
+    return np.unique(hashes)
+
+
+@dataclass
+class DuplicateCluster:
+    """Near-duplicates of a post within the window, the post itself included."""
+    size: int
+    authors: int
+    similar_ids: List[str]
+
+
+class NearDuplicateIndex:
+    """Sliding-window MinHash LSH index over recent posts."""
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 5,
+        similarity_threshold: float = 0.8,
+        window_seconds: float = 3600.0,
+        max_posts: int = 200000,
+        max_candidates: int = 200,
+        min_chars: int = 30,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.similarity_threshold = similarity_threshold
+        self.window_seconds = window_seconds
+        self.max_posts = max_posts
+        self.max_candidates = max_candidates
+        self.min_chars = min_chars
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+        # Ring buffer of posts, addressed by sequence number % max_posts
+        self._signatures = np.zeros((max_posts, num_perm), dtype=np.uint32)
+        self._timestamps = np.zeros(max_posts, dtype=np.float64)
+        self._content_ids: List[Optional[str]] = [None] * max_posts
+        self._authors: List[Optional[str]] = [None] * max_posts
+        self._band_keys: List[Optional[List[Tuple[int, bytes]]]] = [None] * max_posts
+        self._first = 0  # oldest live sequence number
+        self._next = 0
+        self._latest = float("-inf")  # latest post timestamp seen
+
+        self._buckets: Dict[Tuple[int, bytes], Dict[int, None]] = {}
+        self._by_content: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._observed = 0
+        self._skipped = 0
+        self._lookup_seconds = 0.0
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of a text, or None if it has no shingles."""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not len(hashes):
+            return None
+        signature = np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        for start in range(0, len(hashes), 2048):
+            chunk = hashes[start:start + 2048, None]
+            values = ((chunk * self._a + self._b) >> np.uint64(32)).astype(np.uint32)
+            np.minimum(signature, values.min(axis=0), out=signature)
+        return signature
+
+    def observe(self, content_id: str, author_id: str, text: str, now: Optional[float] = None) -> DuplicateCluster:
+        """Index a post and return its near-duplicate cluster within the window."""
+        start = time.perf_counter()
+        # Future timestamps are clamped so they cannot move the window ahead
+        now = time.time() if now is None else min(now, time.time())
+        if len(normalize_text(text)) < self.min_chars:
+            self._skipped += 1
+            return DuplicateCluster(size=1, authors=1, similar_ids=[])
+        signature = self.signature(text)
+        if signature is None:
+            return DuplicateCluster(size=1, authors=1, similar_ids=[])
+
+        rows = self.num_perm // self.bands
+        keys = [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands)]
+        with self._lock:
+            self._latest = max(self._latest, now)
+            self._expire(self._latest)
+            previous = self._by_content.get(content_id)
+            if previous is not None:
+                self._remove(previous)
+
+            candidates: Dict[int, None] = {}
+            for key in keys:
+                bucket = self._buckets.get(key)
+                if bucket:
+                    candidates.update(dict.fromkeys(islice(reversed(bucket), self.max_candidates)))
+            sequences = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            # Out-of-order arrivals leave posts from outside this post's window in the buckets
+            sequences = sequences[np.abs(self._timestamps[sequences % self.max_posts] - now) <= self.window_seconds]
+            slots = sequences % self.max_posts
+            similarity = (self._signatures[slots] == signature).mean(axis=1) if len(slots) else np.zeros(0)
+            similar = sequences[similarity >= self.similarity_threshold].tolist()
+
+            authors = {author_id} | {self._authors[s % self.max_posts] for s in similar}
+            similar_ids = [self._content_ids[s % self.max_posts] for s in similar[:10]]
+            if now >= self._latest - self.window_seconds:
+                self._insert(content_id, author_id, signature, keys, now)
+            self._observed += 1
+        self._lookup_seconds += time.perf_counter() - start
+        return DuplicateCluster(size=len(similar) + 1, authors=len(authors), similar_ids=similar_ids)
+
+    def _insert(self, content_id: str, author_id: str, signature: np.ndarray, keys: List[Tuple[int, bytes]], now: float) -> None:
+        if self._next - self._first >= self.max_posts:
+            self._remove(self._first)
+        sequence = self._next
+        self._next += 1
+        slot = sequence % self.max_posts
+        self._signatures[slot] = signature
+        self._timestamps[slot] = now
+        self._content_ids[slot] = content_id
+        self._authors[slot] = author_id
+        self._band_keys[slot] = keys
+        self._by_content[content_id] = sequence
+        for key in keys:
+            self._buckets.setdefault(key, {})[sequence] = None
+
+    def _remove(self, sequence: int) -> None:
+        slot = sequence % self.max_posts
+        keys = self._band_keys[slot]
+        if keys is not None:
+            for key in keys:
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.pop(sequence, None)
+                    if not bucket:
+                        del self._buckets[key]
+            if self._by_content.get(self._content_ids[slot]) == sequence:
+                del self._by_content[self._content_ids[slot]]
+            self._band_keys[slot] = None
+            self._content_ids[slot] = None
+            self._authors[slot] = None
+        while self._first < self._next and self._band_keys[self._first % self.max_posts] is None:
+            self._first += 1
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._first < self._next and self._timestamps[self._first % self.max_posts] < cutoff:
+            self._remove(self._first)
+
+    def stats(self) -> Dict[str, Any]:
+        """Window size, bucket count and lookup latency."""
+        with self._lock:
+            live = len(self._by_content)
+            buckets = len(self._buckets)
+        return {
+            "posts_in_window": live,
+            "max_posts": self.max_posts,
+            "window_seconds": self.window_seconds,
+            "buckets": buckets,
+            "observed": self._observed,
+            "skipped_short": self._skipped,
+            "mean_lookup_ms": round(self._lookup_seconds / self._observed * 1000, 3) if self._observed else 0.0,
+            "signature_bytes": int(self._signatures.nbytes),
+        }
@@ -0,0 +1,178 @@
+"""
+Pattern Matcher Service
+=======================
+Aho-Corasick multi-pattern matching over a category-tagged lexicon.
+
+All lexicon terms are compiled into one automaton: a trie of the terms with
+failure links, where every state also carries the categories of all terms
+ending there (including through its failure chain). Scanning a text is one
+pass of state transitions, independent of the number of terms. Matching is
+case-insensitive substring matching, like ``term in text.lower()``.
+
+``Lexicon`` wraps an automaton built from a YAML file of
+``category: [terms]`` and rebuilds it when the file changes on disk.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import yaml
+
+
+class AhoCorasick:
+    """Compiled automaton over (term, category) pairs."""
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]]) -> None:
+        self.categories: List[str] = []
+        category_ids: Dict[str, int] = {}
+        transitions: List[Dict[str, int]] = [{}]
+        terms: List[List[Tuple[int, int]]] = [[]]  # per state: (term length, category id)
+
+        for term, category in patterns:
+            term = term.strip().lower()
+            if not term:
+                continue
+            if category not in category_ids:
+                category_ids[category] = len(self.categories)
+                self.categories.append(category)
+            state = 0
+            for char in term:
+                nxt = transitions[state].get(char)
+                if nxt is None:
+                    nxt = len(transitions)
+                    transitions[state][char] = nxt
+                    transitions.append({})
+                    terms.append([])
+                state = nxt
+            if (len(term), category_ids[category]) not in terms[state]:
+                terms[state].append((len(term), category_ids[category]))
+
+        # Breadth-first failure links; outputs inherit those of the failure state
+        fail = [0] * len(transitions)
+        queue = deque(transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in transitions[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and char not in transitions[f]:
+                    f = fail[f]
+                target = transitions[f].get(char, 0)
+                fail[nxt] = target if target != nxt else 0
+                terms[nxt] = terms[nxt] + terms[fail[nxt]]
+
+        self._transitions = transitions
+        self._fail = fail
+        self._terms = terms
+        self._state_categories = [frozenset(c for _, c in t) for t in terms]
+        self.state_count = len(transitions)
+
+    def _scan(self, text: str) -> Iterable[Tuple[int, int]]:
+        """Yield (end position, state) for every position where some term ends."""
+        transitions, fail, terms = self._transitions, self._fail, self._terms
+        state = 0
+        for position, char in enumerate(text.lower()):
+            while state and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, 0)
+            if terms[state]:
+                yield position, state
+
+    def matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """Every match as (start, end, category), in order of end position."""
+        return [
+            (end + 1 - length, end + 1, self.categories[category])
+            for end, state in self._scan(text)
+            for length, category in self._terms[state]
+        ]
+
+    def categories_in(self, text: str) -> List[str]:
+        """Distinct categories matched in the text, in order of first match."""
+        found: Dict[int, None] = {}
+        for _, state in self._scan(text):
+            for category in self._state_categories[state]:
+                found.setdefault(category)
+            if len(found) == len(self.categories):
+                break
+        return [self.categories[c] for c in found]
+
+
+def load_lexicon(path: Path) -> List[Tuple[str, str]]:
+    """(term, category) pairs from a YAML mapping of category to terms."""
+    with path.open("r", encoding="utf-8") as file:
+        data: Mapping[str, Any] = yaml.safe_load(file) or {}
+    return [(str(term), str(category)) for category, terms in data.items() for term in (terms or [])]
+
+
+class Lexicon:
+    """Automaton over a lexicon file, rebuilt when the file changes."""
+
+    def __init__(self, path: Path, check_interval_seconds: float = 5.0) -> None:
+        self.path = Path(path)
+        self._check_interval = check_interval_seconds
+        self._automaton = AhoCorasick([])
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+        self._terms = 0
+        self._reloads = 0
+        self._failures = 0
+        self._loaded_at: Optional[float] = None
+        self._build_ms = 0.0
+
+    def automaton(self) -> AhoCorasick:
+        """Current automaton, reloading the file first if it changed."""
+        now = time.monotonic()
+        if now - self._checked_at >= self._check_interval:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                mtime = None
+            if mtime is not None and mtime != self._mtime:
+                self.reload()
+        return self._automaton
+
+    def reload(self) -> bool:
+        """Rebuild from the file. On failure the previous automaton stays in use."""
+        with self._lock:
+            start = time.time()
+            try:
+                # A broken file is not retried until it changes again
+                self._mtime = os.stat(self.path).st_mtime
+                patterns = load_lexicon(self.path)
+                automaton = AhoCorasick(patterns)
+            except Exception as e:
+                self._failures += 1
+                print(f"  ✗ Failed to load moderation lexicon {self.path}: {e}")
+                return False
+            self._automaton = automaton
+            self._terms = len(patterns)
+            self._reloads += 1
+            self._loaded_at = time.time()
+            self._build_ms = round((time.time() - start) * 1000, 2)
+            return True
+
+    def categories_in(self, text: str) -> List[str]:
+        return self.automaton().categories_in(text)
+
+    def stats(self) -> Dict[str, Any]:
+        """Lexicon size and reload counters."""
+        automaton = self._automaton
+        return {
+            "path": str(self.path),
+            "terms": self._terms,
+            "categories": list(automaton.categories),
+            "states": automaton.state_count,
+            "reloads": self._reloads,
+            "failures": self._failures,
+            "loaded_at": self._loaded_at,
+            "build_ms": self._build_ms,
+        }
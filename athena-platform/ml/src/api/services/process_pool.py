@@ -0,0 +1,172 @@
+"""
+Process Pool Service
+====================
+Chunked, bounded-memory parallel map over a process pool.
+
+Records are grouped into chunks and each chunk is one task, so per-task
+overhead is amortised over many records. At most ``max_pending`` chunks are
+in flight at a time, which keeps memory flat however long the input is.
+Results come back in input order, or as soon as each chunk finishes. With a
+single worker, chunks run in the calling process.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class Progress:
+    """Progress of one ``map`` call."""
+    submitted: int = 0
+    completed: int = 0
+    chunks: int = 0
+    started_at: float = 0.0
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.time() - self.started_at
+
+    @property
+    def records_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ChunkedProcessPool(Generic[T, R]):
+    """Map a picklable chunk function over records on a lazily started process pool."""
+
+    def __init__(
+        self,
+        fn: Callable[[List[T]], List[R]],
+        workers: Optional[int] = None,
+        chunk_size: int = 500,
+        max_pending: Optional[int] = None,
+        start_method: str = "spawn",
+    ) -> None:
+        self._fn = fn
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self._max_pending = max_pending or self.workers * 4
+        self._start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self._jobs = 0
+        self._active: List[Progress] = []
+        self._records = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(self._start_method)
+                )
+            return self._executor
+
+    def map(
+        self,
+        items: Iterable[T],
+        ordered: bool = True,
+        progress: Optional[Callable[[Progress], None]] = None,
+    ) -> Iterator[R]:
+        """Yield ``fn`` results for all items, chunk by chunk."""
+        state = Progress(started_at=time.time())
+        with self._lock:
+            self._jobs += 1
+            self._active.append(state)
+        pending: "deque[Future]" = deque()
+        running: set = set()
+        try:
+            chunks = chunked(items, self.chunk_size)
+            if self.workers == 1:
+                for chunk in chunks:
+                    state.submitted += len(chunk)
+                    yield from self._finish(self._fn(chunk), state, progress)
+                return
+
+            pool = self._pool()
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) + len(running) < self._max_pending:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    state.submitted += len(chunk)
+                    future = pool.submit(self._fn, chunk)
+                    (pending.append if ordered else running.add)(future)
+
+                if ordered:
+                    if not pending:
+                        return
+                    yield from self._finish(pending.popleft().result(), state, progress)
+                else:
+                    if not running:
+                        return
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from self._finish(future.result(), state, progress)
+        finally:
+            # Abandoned early (e.g. client disconnected): drop chunks not yet started
+            for future in [*pending, *running]:
+                future.cancel()
+            with self._lock:
+                self._active.remove(state)
+
+    def _finish(self, results: List[R], state: Progress, progress: Optional[Callable[[Progress], None]]) -> List[R]:
+        state.completed += len(results)
+        state.chunks += 1
+        with self._lock:
+            self._records += len(results)
+        if progress is not None:
+            progress(state)
+        return results
+
+    def close(self) -> None:
+        """Shut the worker processes down."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, lifetime counters and progress of running jobs."""
+        with self._lock:
+            active = [
+                {
+                    "submitted": p.submitted,
+                    "completed": p.completed,
+                    "elapsed_seconds": round(p.elapsed_seconds, 2),
+                    "records_per_second": round(p.records_per_second, 1),
+                }
+                for p in self._active
+            ]
+            return {
+                "workers": self.workers,
+                "chunk_size": self.chunk_size,
+                "started": self._executor is not None,
+                "jobs": self._jobs,
+                "records": self._records,
+                "running": active,
+            }
@@ -0,0 +1,107 @@
+"""
+Recommendation Cache Service
+============================
+Cache of per-mentee recommendations with selective invalidation.
+
+Entries are keyed by a digest of everything the result depends on (the
+mentee profile and the request options), so an edited profile simply misses.
+Each entry records the mentors it contains, and a reverse index maps every
+mentor to the entries holding it: when a mentor changes, only those entries
+are dropped. Entries that would newly include a changed mentor are not
+tracked and age out with the TTL.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Generic, Hashable, Iterable, Optional, Set, Tuple, TypeVar
+
+from src.api.services.ttl_cache import TTLCache
+
+V = TypeVar("V")
+
+
+def request_digest(*parts: Any) -> str:
+    """Stable digest of JSON-serialisable request parts."""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class RecommendationCache(Generic[V]):
+    """TTL cache of results with a mentor -> entries reverse index."""
+
+    def __init__(self, max_entries: int = 50000, ttl_seconds: float = 3600.0) -> None:
+        self._cache: TTLCache[Tuple[V, Tuple[str, ...]]] = TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds, on_evict=self._forget
+        )
+        self._by_mentor: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+        self._events = 0
+        self._invalidated = 0
+        self._max_fan_out = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._cache.get(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key: Hashable, value: V, mentor_ids: Iterable[str]) -> None:
+        """Cache a result together with the mentors it contains."""
+        mentors = tuple(dict.fromkeys(mentor_ids))
+        previous = self._cache.pop(key)
+        with self._lock:
+            if previous is not None:
+                self._unlink(key, previous[1])
+            for mentor_id in mentors:
+                self._by_mentor.setdefault(mentor_id, set()).add(key)
+        self._cache.set(key, (value, mentors))
+
+    def invalidate_mentors(self, mentor_ids: Iterable[str]) -> int:
+        """Drop every entry containing one of the mentors. Returns the number dropped."""
+        dropped = 0
+        for mentor_id in dict.fromkeys(mentor_ids):
+            with self._lock:
+                keys = self._by_mentor.pop(mentor_id, set())
+            fan_out = 0
+            for key in keys:
+                entry = self._cache.pop(key)
+                if entry is None:
+                    continue
+                with self._lock:
+                    self._unlink(key, entry[1])
+                fan_out += 1
+
+            self._events += 1
+            self._invalidated += fan_out
+            self._max_fan_out = max(self._max_fan_out, fan_out)
+            dropped += fan_out
+        return dropped
+
+    def _forget(self, key: Hashable, entry: Tuple[V, Tuple[str, ...]]) -> None:
+        with self._lock:
+            self._unlink(key, entry[1])
+
+    def _unlink(self, key: Hashable, mentors: Tuple[str, ...]) -> None:
+        for mentor_id in mentors:
+            keys = self._by_mentor.get(mentor_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_mentor[mentor_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio, reverse index size and invalidation fan-out."""
+        with self._lock:
+            indexed = len(self._by_mentor)
+            links = sum(len(keys) for keys in self._by_mentor.values())
+        return {
+            **self._cache.stats(),
+            "indexed_mentors": indexed,
+            "reverse_links": links,
+            "invalidation_events": self._events,
+            "invalidated_entries": self._invalidated,
+            "mean_fan_out": round(self._invalidated / self._events, 2) if self._events else 0.0,
+            "max_fan_out": self._max_fan_out,
+        }
@@ -0,0 +1,99 @@
+"""
+Score Cache Service
+===================
+Per-user cache of computed scores that expire at their own validity deadline.
+
+Each entry is stored with a digest of the input it was computed from; a
+lookup with a different digest (the profile changed) is a miss. Entries can
+be updated in place, e.g. to fold in a newly reported signal, without a full
+recompute and without extending their validity. Staleness is tracked as the
+time since a served entry was last computed or updated.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+from src.api.services.ttl_cache import TTLCache
+
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    digest: str
+    value: V
+    updated_at: float
+    updates: int = 0
+
+
+class ScoreCache(Generic[V]):
+    """Bounded cache of per-user scores keyed by user_id."""
+
+    def __init__(self, max_entries: int = 100000, clock: Callable[[], float] = time.time) -> None:
+        self._cache: TTLCache[_Entry[V]] = TTLCache(max_entries=max_entries, ttl_seconds=86400.0, clock=clock)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._input_changes = 0
+        self._updates = 0
+        self._updates_missed = 0
+        self._hit_age_total = 0.0
+        self._hit_age_max = 0.0
+
+    def get(self, user_id: str, digest: str) -> Optional[V]:
+        """Cached score if it is still valid and was computed from the same input."""
+        entry = self._cache.get(user_id)
+        with self._lock:
+            if entry is None or entry.digest != digest:
+                self._misses += 1
+                if entry is not None:
+                    self._input_changes += 1
+                return None
+            age = self._clock() - entry.updated_at
+            self._hits += 1
+            self._hit_age_total += age
+            self._hit_age_max = max(self._hit_age_max, age)
+            return entry.value
+
+    def set(self, user_id: str, digest: str, value: V, ttl_seconds: float) -> None:
+        """Cache a freshly computed score until it stops being valid."""
+        if ttl_seconds > 0:
+            self._cache.set(user_id, _Entry(digest, value, self._clock()), ttl_seconds=ttl_seconds)
+
+    def update(self, user_id: str, fn: Callable[[V], V]) -> Optional[V]:
+        """Replace a cached score with ``fn(score)``, keeping its expiry. Returns None if not cached."""
+        with self._lock:
+            entry = self._cache.peek(user_id)
+            if entry is None:
+                self._updates_missed += 1
+                return None
+            entry.value = fn(entry.value)
+            entry.updated_at = self._clock()
+            entry.updates += 1
+            self._updates += 1
+            return entry.value
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio, incremental update counts and age of served scores."""
+        cache_stats = self._cache.stats()
+        lookups = self._hits + self._misses
+        return {
+            "entries": cache_stats["entries"],
+            "max_entries": cache_stats["max_entries"],
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "input_changes": self._input_changes,
+            "expired": cache_stats["expired"],
+            "evictions": cache_stats["evictions"],
+            "incremental_updates": self._updates,
+            "updates_without_entry": self._updates_missed,
+            "mean_hit_age_seconds": round(self._hit_age_total / self._hits, 2) if self._hits else 0.0,
+            "max_hit_age_seconds": round(self._hit_age_max, 2),
+        }
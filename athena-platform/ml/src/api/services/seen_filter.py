@@ -0,0 +1,138 @@
+"""
+Seen Item Filter Service
+========================
+Per-user Bloom filters of items a user has already been shown.
+
+Each user gets a small ring of time-bucketed Bloom filters. Items are added to
+the current bucket; lookups check every bucket; when a bucket's period ends
+the oldest one is cleared. Items therefore stay filtered for between
+(generations - 1) and generations periods, and memory per user is fixed:
+``generations * bits / 8`` bytes plus bookkeeping. Users are kept in an LRU
+bounded by ``max_users``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from src.api.services.user_context_cache import hash_keys
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+# Approximate per-user overhead of the LRU entry and its Python objects
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+@dataclass
+class _UserFilter:
+    epoch: int
+    bits: np.ndarray  # (generations, bytes_per_generation) uint8
+
+
+class SeenItemFilter:
+    """Rotating per-user Bloom filters keyed by user id."""
+
+    def __init__(
+        self,
+        bits_per_generation: int = 8192,
+        generations: int = 2,
+        hash_count: int = 5,
+        period_seconds: float = 24 * 3600,
+        max_users: int = 200000,
+    ) -> None:
+        self._bits = bits_per_generation
+        self._generations = generations
+        self._hash_count = hash_count
+        self._period = period_seconds
+        self._max_users = max_users
+        self._users: "OrderedDict[str, _UserFilter]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._marked = 0
+        self._filtered = 0
+        self._evictions = 0
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        """Bit positions for each key, shape (len(keys), hash_count), by double hashing."""
+        h1 = keys.astype(np.uint64)
+        h2 = (h1 * _GOLDEN) >> np.uint64(17) | np.uint64(1)
+        rounds = np.arange(self._hash_count, dtype=np.uint64)
+        return ((h1[:, None] + rounds[None, :] * h2[:, None]) % np.uint64(self._bits)).astype(np.int64)
+
+    def _entry(self, user_id: str, create: bool, now: float) -> Optional[_UserFilter]:
+        epoch = int(now // self._period)
+        entry = self._users.get(user_id)
+        if entry is None:
+            if not create:
+                return None
+            entry = _UserFilter(epoch=epoch, bits=np.zeros((self._generations, self._bits // 8), dtype=np.uint8))
+            self._users[user_id] = entry
+            while len(self._users) > self._max_users:
+                self._users.popitem(last=False)
+                self._evictions += 1
+        else:
+            self._users.move_to_end(user_id)
+
+        # Clear the buckets whose period has passed
+        for stale in range(entry.epoch + 1, min(epoch, entry.epoch + self._generations) + 1):
+            entry.bits[stale % self._generations] = 0
+        entry.epoch = max(entry.epoch, epoch)
+        return entry
+
+    def mark_seen(self, user_id: str, item_ids: Iterable[str], now: Optional[float] = None) -> None:
+        """Record that the user has seen these items."""
+        keys = hash_keys(item_ids)
+        if not keys.size:
+            return
+        positions = self._positions(keys).ravel()
+        with self._lock:
+            entry = self._entry(user_id, create=True, now=time.time() if now is None else now)
+            row = entry.bits[entry.epoch % self._generations]
+            np.bitwise_or.at(row, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+            self._marked += len(keys)
+
+    def seen_mask(self, user_id: str, item_keys: np.ndarray, now: Optional[float] = None) -> np.ndarray:
+        """Boolean mask of the items (given as hash_keys) the user has probably seen."""
+        with self._lock:
+            entry = self._entry(user_id, create=False, now=time.time() if now is None else now)
+            if entry is None or not item_keys.size:
+                return np.zeros(len(item_keys), dtype=bool)
+            bits = entry.bits.copy()
+
+        positions = self._positions(item_keys)
+        byte_index = positions >> 3
+        bit_mask = (1 << (positions & 7)).astype(np.uint8)
+        seen = np.zeros(len(item_keys), dtype=bool)
+        for generation in bits:
+            seen |= np.all(generation[byte_index] & bit_mask, axis=1)
+        self._filtered += int(seen.sum())
+        return seen
+
+    def forget(self, user_id: str) -> bool:
+        """Drop a user's filters."""
+        with self._lock:
+            return self._users.pop(user_id, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """Users tracked, counters and predictable memory footprint."""
+        per_user = self._generations * self._bits // 8 + _ENTRY_OVERHEAD_BYTES
+        capacity = self._bits / (self._hash_count / 0.6931)  # items per generation at the optimal fill
+        return {
+            "users": len(self._users),
+            "max_users": self._max_users,
+            "items_marked": self._marked,
+            "items_filtered": self._filtered,
+            "evictions": self._evictions,
+            "bytes_per_user": per_user,
+            "memory_bytes": per_user * len(self._users),
+            "memory_bytes_per_million_users": per_user * 1_000_000,
+            "items_per_generation_at_optimal_fill": int(capacity),
+            "false_positive_rate_at_capacity": round((1 - np.exp(-self._hash_count * capacity / self._bits)) ** self._hash_count, 4),
+            "period_seconds": self._period,
+            "generations": self._generations,
+        }
@@ -0,0 +1,186 @@
+"""
+Signal Log Service
+==================
+Buffered asynchronous ingestion of feed engagement and refresh signals.
+
+Endpoints enqueue events on a bounded asyncio queue and return immediately.
+A background writer drains the queue in batches and appends them to a
+daily-rotated SQLite database in WAL mode. When the queue is full, producers
+wait briefly (backpressure) and the event is dropped and counted if space
+does not free up in time. Pending events are flushed on shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+_STOP = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    ts REAL NOT NULL,
+    signal TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    item_id TEXT,
+    engagement_type TEXT,
+    dwell_time_seconds REAL,
+    feed_context TEXT
+)
+"""
+
+_INSERT = "INSERT INTO signals VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+SignalRow = Tuple[float, str, str, Optional[str], Optional[str], Optional[float], Optional[str]]
+
+
+class SignalLog:
+    """Bounded queue with a batching background writer."""
+
+    def __init__(
+        self,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        enqueue_timeout_seconds: float = 0.005,
+    ) -> None:
+        self._max_queue = max_queue
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_seconds
+        self._enqueue_timeout = enqueue_timeout_seconds
+        self._directory: Optional[Path] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_day: Optional[str] = None
+
+        self._accepted = 0
+        self._dropped = 0
+        self._written = 0
+        self._batches = 0
+        self._write_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._writer is not None and not self._writer.done()
+
+    async def start(self, directory: Path) -> None:
+        """Start the background writer, logging into ``directory``."""
+        if self.running:
+            return
+        self._directory = directory
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._writer = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything queued so far and stop the writer."""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._writer
+        self._writer = None
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def record(self, signal: str, user_id: str, **fields: Any) -> bool:
+        """Queue a signal. Returns False if it was dropped because the queue stayed full."""
+        if not self.running:
+            self._dropped += 1
+            return False
+
+        row: SignalRow = (
+            time.time(),
+            signal,
+            user_id,
+            fields.get("item_id"),
+            fields.get("engagement_type"),
+            fields.get("dwell_time_seconds"),
+            fields.get("feed_context"),
+        )
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self._queue.put(row), timeout=self._enqueue_timeout)
+            except asyncio.TimeoutError:
+                self._dropped += 1
+                return False
+        self._accepted += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and ingestion counters."""
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_capacity": self._max_queue,
+            "accepted": self._accepted,
+            "dropped": self._dropped,
+            "written": self._written,
+            "batches": self._batches,
+            "write_errors": self._write_errors,
+        }
+
+    # ===========================================
+    # BACKGROUND WRITER
+    # ===========================================
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+
+            batch: List[SignalRow] = [first]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                try:
+                    row = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await asyncio.to_thread(self._write, batch)
+
+    def _write(self, batch: List[SignalRow]) -> None:
+        try:
+            connection = self._connection_for(datetime.utcnow().strftime("%Y%m%d"))
+            with connection:
+                connection.executemany(_INSERT, batch)
+            self._written += len(batch)
+            self._batches += 1
+        except sqlite3.Error as e:
+            self._write_errors += 1
+            print(f"  ✗ Failed to write {len(batch)} signals: {e}")
+
+    def _connection_for(self, day: str) -> sqlite3.Connection:
+        """Connection to the log file for ``day``, rotating daily."""
+        if self._connection is not None and self._connection_day == day:
+            return self._connection
+        if self._connection is not None:
+            self._connection.close()
+
+        connection = sqlite3.connect(self._directory / f"signals-{day}.sqlite3", check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(_SCHEMA)
+        self._connection = connection
+        self._connection_day = day
+        return connection
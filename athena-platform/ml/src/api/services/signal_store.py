@@ -0,0 +1,223 @@
+"""
+Signal Store Service
+====================
+Per-user exponentially time-decayed aggregates of reported safety signals.
+
+Each user has one fixed-size record: the time of its last update and, per
+signal kind, the decayed sum of ``value * confidence``, the decayed sum of
+``confidence`` and a raw count. Recording a signal decays the record to the
+signal's time and adds to it, and reading decays a copy to now, so both are
+O(1) and no history is kept or replayed. Signals older than the record's last
+update are added with their own decay instead of rewinding it.
+
+Records live in one growable numpy array and are snapshotted to disk
+periodically and on shutdown. The store is per process, so the snapshot is
+locked by the process that restored it: a second process (e.g. another
+uvicorn worker) pointed at the same file fails to start instead of silently
+overwriting the first one's signals.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import fcntl
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, TextIO
+
+import numpy as np
+
+
+class DecayedSignalStore:
+    """Time-decayed signal aggregates per user and signal kind."""
+
+    def __init__(self, kinds: Sequence[str], half_life_days: float = 30.0, initial_capacity: int = 1024) -> None:
+        self.kinds = list(kinds)
+        self.half_life_days = half_life_days
+        self._rate = math.log(2) / (half_life_days * 86400)
+        self._kind_index = {kind: i for i, kind in enumerate(self.kinds)}
+        self._dtype = np.dtype([
+            ("updated_at", np.float64),
+            ("sums", np.float32, (len(self.kinds),)),
+            ("weights", np.float32, (len(self.kinds),)),
+            ("counts", np.uint32, (len(self.kinds),)),
+        ])
+        self._records = np.zeros(initial_capacity, dtype=self._dtype)
+        self._rows: Dict[str, int] = {}
+        self._user_ids: List[str] = []
+        self._lock = threading.Lock()
+        self._updates = 0
+
+        self._path: Optional[Path] = None
+        self._snapshot_task: Optional[asyncio.Task] = None
+        self._lock_file: Optional[TextIO] = None
+
+    def __len__(self) -> int:
+        return len(self._user_ids)
+
+    def decay(self, age_seconds: float) -> float:
+        """Weight left after ``age_seconds``."""
+        return math.exp(-self._rate * max(0.0, age_seconds))
+
+    def record(
+        self,
+        user_id: str,
+        kind: str,
+        value: float,
+        confidence: float = 1.0,
+        at: Optional[float] = None,
+    ) -> None:
+        """Add one signal to the user's aggregates."""
+        now = time.time()
+        at = now if at is None else min(at, now)
+        k = self._kind_index[kind]
+        with self._lock:
+            row = self._rows.get(user_id)
+            if row is None:
+                row = self._add_row(user_id, at)
+            record = self._records[row]
+            updated_at = float(record["updated_at"])
+            if at >= updated_at:
+                factor = self.decay(at - updated_at)
+                record["sums"] *= factor
+                record["weights"] *= factor
+                record["updated_at"] = at
+                scale = 1.0
+            else:
+                scale = self.decay(updated_at - at)
+            record["sums"][k] += value * confidence * scale
+            record["weights"][k] += confidence * scale
+            record["counts"][k] += 1
+            self._updates += 1
+
+    def _add_row(self, user_id: str, at: float) -> int:
+        row = len(self._user_ids)
+        if row == len(self._records):
+            grown = np.zeros(max(1, 2 * len(self._records)), dtype=self._dtype)
+            grown[:row] = self._records
+            self._records = grown
+        self._records[row]["updated_at"] = at
+        self._rows[user_id] = row
+        self._user_ids.append(user_id)
+        return row
+
+    def sums(self, user_id: str, now: Optional[float] = None) -> Dict[str, float]:
+        """Decayed ``value * confidence`` totals per kind (empty for unknown users)."""
+        return {kind: values["sum"] for kind, values in self.aggregates(user_id, now).items()}
+
+    def aggregates(self, user_id: str, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Decayed sum, decayed confidence and raw count per kind."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._rows.get(user_id)
+            if row is None:
+                return {}
+            record = self._records[row].copy()
+        factor = self.decay(now - float(record["updated_at"]))
+        return {
+            kind: {
+                "sum": float(record["sums"][k]) * factor,
+                "confidence": float(record["weights"][k]) * factor,
+                "count": int(record["counts"][k]),
+            }
+            for k, kind in enumerate(self.kinds)
+            if record["counts"][k]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """User count, update count and record memory."""
+        return {
+            "users": len(self._user_ids),
+            "updates": self._updates,
+            "half_life_days": self.half_life_days,
+            "record_bytes": self._dtype.itemsize,
+            "allocated_bytes": int(self._records.nbytes),
+        }
+
+    # ===========================================
+    # SNAPSHOTS
+    # ===========================================
+
+    async def start(self, path: Path, interval_seconds: float = 60.0) -> None:
+        """Lock ``path``, restore the last snapshot and start periodic snapshotting to it."""
+        self._acquire(path)
+        self._path = path
+        await asyncio.to_thread(self.load, path)
+        self._snapshot_task = asyncio.create_task(self._snapshot_loop(interval_seconds))
+
+    async def stop(self) -> None:
+        """Stop periodic snapshots and write a final one."""
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._snapshot_task
+            self._snapshot_task = None
+        if self._path is not None:
+            await asyncio.to_thread(self.save, self._path)
+            self._path = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _acquire(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(path.with_suffix(".lock"), "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            raise RuntimeError(
+                f"Signal snapshot {path} is in use by another process; "
+                "run the service with a single worker per DATA_PATH"
+            ) from None
+        self._lock_file = lock_file
+
+    async def _snapshot_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            save = asyncio.ensure_future(asyncio.to_thread(self.save, self._path))
+            try:
+                await asyncio.shield(save)
+            except asyncio.CancelledError:
+                # The write runs on in its thread; finish it before stop() writes the final snapshot
+                await save
+                raise
+
+    def save(self, path: Path) -> None:
+        """Write all records to an .npz snapshot."""
+        with self._lock:
+            state = {
+                "rate": np.array(self._rate),
+                "kinds": np.array(self.kinds, dtype=str),
+                "user_ids": np.array(self._user_ids, dtype=str),
+                "updated_at": self._records["updated_at"][:len(self._user_ids)].copy(),
+                "sums": self._records["sums"][:len(self._user_ids)].copy(),
+                "weights": self._records["weights"][:len(self._user_ids)].copy(),
+                "counts": self._records["counts"][:len(self._user_ids)].copy(),
+            }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez_compressed(tmp_path, **state)
+        tmp_path.replace(path)
+
+    def load(self, path: Path) -> bool:
+        """Restore records from a snapshot written by ``save``."""
+        if not path.exists():
+            return False
+        with np.load(path) as state, self._lock:
+            if not math.isclose(float(state["rate"]), self._rate) or state["kinds"].tolist() != self.kinds:
+                # Snapshot taken with a different configuration; start fresh
+                return False
+            user_ids = state["user_ids"].tolist()
+            records = np.zeros(max(len(user_ids), len(self._records)), dtype=self._dtype)
+            records["updated_at"][:len(user_ids)] = state["updated_at"]
+            records["sums"][:len(user_ids)] = state["sums"]
+            records["weights"][:len(user_ids)] = state["weights"]
+            records["counts"][:len(user_ids)] = state["counts"]
+            self._records = records
+            self._user_ids = user_ids
+            self._rows = {user_id: row for row, user_id in enumerate(user_ids)}
+        return True
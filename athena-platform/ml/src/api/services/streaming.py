@@ -0,0 +1,46 @@
+"""
+Streaming Response Helpers
+==========================
+Newline-delimited JSON (NDJSON) responses for large result sets.
+
+Each result is written on its own line as soon as it is serialised, followed
+by a final ``{"summary": {...}}`` line carrying the response metadata.
+Items may also be JSON strings serialised elsewhere (e.g. in worker
+processes), which are written as they are.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def ndjson_lines(
+    items: Iterable[Union[BaseModel, str]],
+    summary: Optional[Dict[str, Any]] = None,
+    lines_per_chunk: int = 64,
+) -> Iterator[str]:
+    """Serialise items to NDJSON, grouping lines into chunks to limit write overhead."""
+    chunk = []
+    for item in items:
+        chunk.append(item if isinstance(item, str) else item.model_dump_json())
+        if len(chunk) >= lines_per_chunk:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if summary is not None:
+        chunk.append(json.dumps({"summary": summary}, default=str))
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def ndjson_response(
+    items: Iterable[Union[BaseModel, str]],
+    summary: Optional[Dict[str, Any]] = None,
+) -> StreamingResponse:
+    """Stream items as an NDJSON response."""
+    return StreamingResponse(ndjson_lines(items, summary), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,259 @@
+"""
+Trending Service
+================
+Real-time trending items and tags from engagement signals.
+
+Counts decay exponentially with a configurable half-life. Decay uses a
+landmark ("forward decay"): an event at time t adds exp(rate * (t - landmark)),
+so an update is O(1) and relative order never changes between updates; the
+true decayed count is recovered by scaling with exp(-rate * (now - landmark)).
+Top-N lists are computed at most once per second, for the largest N asked
+for, so they may miss the last second of engagement.
+
+Memory stays bounded: every key is counted in a count-min sketch, and only
+the heaviest keys are tracked exactly in a fixed-size heavy-hitters table.
+State is snapshotted to disk periodically and on shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import heapq
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Rescale all counts before exp() gets close to float64 overflow
+_MAX_EXPONENT = 200.0
+
+ENGAGEMENT_WEIGHTS = {
+    "view": 1.0,
+    "click": 1.5,
+    "dwell": 1.5,
+    "like": 2.0,
+    "comment": 3.0,
+    "share": 4.0,
+}
+
+
+def _stable_hash(key: str) -> Tuple[int, int]:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class DecayedTopK:
+    """Count-min sketch of forward-decayed counts plus a heavy-hitters table."""
+
+    def __init__(self, capacity: int = 512, width: int = 1 << 14, depth: int = 4) -> None:
+        self.capacity = capacity
+        self.width = width
+        self.depth = depth
+        self.sketch = np.zeros((depth, width), dtype=np.float64)
+        self.top: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        # Scalar access through a memoryview avoids NumPy call overhead per update
+        self._cells = memoryview(self.sketch.reshape(-1))
+
+    def _slots(self, key: str) -> List[int]:
+        h1, h2 = _stable_hash(key)
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, key: str, amount: float) -> None:
+        cells = self._cells
+        estimate = math.inf
+        for slot in self._slots(key):
+            value = cells[slot] + amount
+            cells[slot] = value
+            if value < estimate:
+                estimate = value
+
+        if key in self.top or len(self.top) < self.capacity:
+            self.top[key] = estimate
+            heapq.heappush(self._heap, (estimate, key))
+        else:
+            floor, floor_key = self._floor()
+            if estimate > floor:
+                del self.top[floor_key]
+                heapq.heappop(self._heap)
+                self.top[key] = estimate
+                heapq.heappush(self._heap, (estimate, key))
+
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def estimate(self, key: str) -> float:
+        return min(self._cells[slot] for slot in self._slots(key))
+
+    def largest(self, n: int) -> List[Tuple[str, float]]:
+        return heapq.nlargest(n, self.top.items(), key=lambda kv: kv[1])
+
+    def rescale(self, factor: float) -> None:
+        self.sketch *= factor
+        for key in self.top:
+            self.top[key] *= factor
+        self._rebuild_heap()
+
+    def _floor(self) -> Tuple[float, str]:
+        """Smallest tracked count, discarding stale heap entries."""
+        heap = self._heap
+        while heap and self.top.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(value, key) for key, value in self.top.items()]
+        heapq.heapify(self._heap)
+
+
+class TrendingEngine:
+    """Exponentially decayed trending scores for items and tags."""
+
+    def __init__(self, half_life_hours: float = 6.0, item_capacity: int = 1024, tag_capacity: int = 256) -> None:
+        self.half_life_hours = half_life_hours
+        self._rate = math.log(2) / (half_life_hours * 3600)
+        self._landmark = time.time()
+        self._items = DecayedTopK(capacity=item_capacity)
+        self._tags = DecayedTopK(capacity=tag_capacity)
+        self._lock = threading.Lock()
+        self._updates = 0
+        # Largest top-N computed in the current second; smaller N are slices of it
+        self._cache_second: Optional[int] = None
+        self._cache_n = 0
+        self._cache: Tuple[List[Tuple[str, float]], List[Tuple[str, float]]] = ([], [])
+
+        self._path: Optional[Path] = None
+        self._snapshot_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._items.top)
+
+    def record(self, item_id: str, tags: Iterable[str] = (), weight: float = 1.0, now: Optional[float] = None) -> None:
+        """Count one engagement with an item (and its tags)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            exponent = self._rate * (now - self._landmark)
+            if exponent > _MAX_EXPONENT:
+                self._move_landmark(now)
+                exponent = 0.0
+            amount = weight * math.exp(exponent)
+            self._items.add(item_id, amount)
+            for tag in tags:
+                self._tags.add(tag.lower(), amount)
+            self._updates += 1
+
+    def top_items(self, n: int = 50, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Top-N trending items with their decayed counts."""
+        return self._top(n, now)[0]
+
+    def top_tags(self, n: int = 20, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Top-N trending tags with their decayed counts."""
+        return self._top(n, now)[1]
+
+    def _top(self, n: int, now: Optional[float]) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+        """Top-N items and tags, recomputed at most once per second (and when a larger N is asked for)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            second = int(now)
+            if second != self._cache_second or n > self._cache_n:
+                self._cache_n = n
+                scale = math.exp(-self._rate * (now - self._landmark))
+                self._cache = (
+                    [(k, v * scale) for k, v in self._items.largest(self._cache_n)],
+                    [(k, v * scale) for k, v in self._tags.largest(self._cache_n)],
+                )
+                self._cache_second = second
+            return self._cache[0][:n], self._cache[1][:n]
+
+    def _move_landmark(self, now: float) -> None:
+        factor = math.exp(-self._rate * (now - self._landmark))
+        self._items.rescale(factor)
+        self._tags.rescale(factor)
+        self._landmark = now
+
+    def stats(self) -> Dict[str, Any]:
+        """Tracked keys and memory used by the sketches."""
+        return {
+            "half_life_hours": self.half_life_hours,
+            "updates": self._updates,
+            "tracked_items": len(self._items.top),
+            "tracked_tags": len(self._tags.top),
+            "sketch_bytes": int(self._items.sketch.nbytes + self._tags.sketch.nbytes),
+        }
+
+    # ===========================================
+    # SNAPSHOTS
+    # ===========================================
+
+    async def start(self, path: Path, interval_seconds: float = 60.0) -> None:
+        """Restore the last snapshot and start periodic snapshotting to ``path``."""
+        self._path = path
+        await asyncio.to_thread(self.load, path)
+        self._snapshot_task = asyncio.create_task(self._snapshot_loop(interval_seconds))
+
+    async def stop(self) -> None:
+        """Stop periodic snapshots and write a final one."""
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._snapshot_task
+            self._snapshot_task = None
+        if self._path is not None:
+            await asyncio.to_thread(self.save, self._path)
+
+    async def _snapshot_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            save = asyncio.ensure_future(asyncio.to_thread(self.save, self._path))
+            try:
+                await asyncio.shield(save)
+            except asyncio.CancelledError:
+                # The write runs on in its thread; finish it before stop() writes the final snapshot
+                await save
+                raise
+
+    def save(self, path: Path) -> None:
+        """Write the engine state to an .npz snapshot."""
+        with self._lock:
+            state = {
+                "landmark": np.array(self._landmark),
+                "rate": np.array(self._rate),
+                "item_sketch": self._items.sketch.copy(),
+                "item_keys": np.array(list(self._items.top), dtype=str),
+                "item_values": np.array(list(self._items.top.values()), dtype=np.float64),
+                "tag_sketch": self._tags.sketch.copy(),
+                "tag_keys": np.array(list(self._tags.top), dtype=str),
+                "tag_values": np.array(list(self._tags.top.values()), dtype=np.float64),
+            }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez_compressed(tmp_path, **state)
+        tmp_path.replace(path)
+
+    def load(self, path: Path) -> bool:
+        """Restore state from a snapshot written by ``save``."""
+        if not path.exists():
+            return False
+        with np.load(path) as state, self._lock:
+            if (
+                not math.isclose(float(state["rate"]), self._rate)
+                or state["item_sketch"].shape != self._items.sketch.shape
+                or state["tag_sketch"].shape != self._tags.sketch.shape
+            ):
+                # Snapshot taken with a different configuration; start fresh
+                return False
+            self._landmark = float(state["landmark"])
+            self._items.sketch[:] = state["item_sketch"]
+            self._items.top = dict(zip(state["item_keys"].tolist(), state["item_values"].tolist()))
+            self._items._rebuild_heap()
+            self._tags.sketch[:] = state["tag_sketch"]
+            self._tags.top = dict(zip(state["tag_keys"].tolist(), state["tag_values"].tolist()))
+            self._tags._rebuild_heap()
+            self._cache_second = None
+        return True
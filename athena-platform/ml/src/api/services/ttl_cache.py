@@ -0,0 +1,131 @@
+"""
+TTL Cache Service
+=================
+Bounded in-memory cache with per-entry expiry and LRU eviction.
+
+The bound is a number of entries and, optionally, a total weight (e.g.
+bytes or items held), as measured by ``weigher`` when an entry is set.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Least-recently-used cache whose entries expire after a time-to-live."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        on_evict: Optional[Callable[[Hashable, V], None]] = None,
+        weigher: Optional[Callable[[V], int]] = None,
+        max_weight: Optional[int] = None,
+    ) -> None:
+        """``on_evict`` is called for entries dropped by expiry or LRU eviction."""
+        self._max_entries = max_entries
+        self._weigher = weigher
+        self._max_weight = max_weight
+        self._weights: Dict[Hashable, int] = {}
+        self._weight = 0
+        self._on_evict = on_evict
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return a live entry, dropping it if it has expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._unweigh(key)
+                self._expired += 1
+                self._misses += 1
+                expired = value
+            else:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+        self._evicted([(key, expired)])
+        return None
+
+    def set(self, key: Hashable, value: V, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting least recently used entries when full."""
+        ttl = self._ttl_seconds if ttl_seconds is None else ttl_seconds
+        evicted = []
+        weight = self._weigher(value) if self._weigher is not None else 0
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            self._unweigh(key)
+            self._weights[key] = weight
+            self._weight += weight
+            while len(self._entries) > self._max_entries or (
+                self._max_weight is not None and self._weight > self._max_weight and len(self._entries) > 1
+            ):
+                old_key, (_, old_value) = self._entries.popitem(last=False)
+                self._unweigh(old_key)
+                evicted.append((old_key, old_value))
+                self._evictions += 1
+        self._evicted(evicted)
+
+    def _unweigh(self, key: Hashable) -> None:
+        self._weight -= self._weights.pop(key, 0)
+
+    def _evicted(self, entries: List[Tuple[Hashable, V]]) -> None:
+        if self._on_evict is not None:
+            for key, value in entries:
+                self._on_evict(key, value)
+
+    def peek(self, key: Hashable) -> Optional[V]:
+        """Return a live entry without counting a lookup or refreshing its recency."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            return None
+        return entry[1]
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """Remove and return an entry regardless of expiry."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            self._unweigh(key)
+        return entry[1] if entry else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit/miss/expiry counters."""
+        lookups = self._hits + self._misses
+        stats = {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "ttl_seconds": self._ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "expired": self._expired,
+            "evictions": self._evictions,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+        if self._weigher is not None:
+            stats["weight"] = self._weight
+            stats["max_weight"] = self._max_weight
+        return stats
@@ -0,0 +1,214 @@
+"""
+User Context Cache Service
+==========================
+Per-user cache of preprocessed ranking and feed contexts.
+
+The backend stamps each user context with a version. Once a version has been
+sent in full, later requests can carry just ``user_id`` and ``version`` and the
+routers reuse the cached, already-normalised form. A newer version replaces
+the old entry, while an older one arriving late is rejected rather than
+overwriting it; least recently used users are evicted once the cache is full.
+
+Ids are hashed to int64 keys with a stable, vectorized multiply-xorshift
+hash over their UTF-32 code units, so keys are the same in every process and
+across restarts (unlike the salted builtin ``hash``).
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, FrozenSet, Iterable, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+# Fields whose presence means the request carries a full context payload.
+CONTEXT_FIELDS = frozenset({
+    "persona",
+    "interests",
+    "skills",
+    "location",
+    "interaction_history",
+    "followed_users",
+    "followed_organizations",
+    "blocked_users",
+    "preferred_content_types",
+})
+
+
+@dataclass(frozen=True)
+class PreparedUserContext:
+    """Normalised user context ready for scoring."""
+    user_id: str
+    version: Optional[int]
+    persona: str
+    location: Optional[str]
+    interests: FrozenSet[str]
+    skills: FrozenSet[str]
+    followed_users: FrozenSet[str]
+    followed_organizations: FrozenSet[str]
+    blocked_users: FrozenSet[str]
+    preferred_content_types: FrozenSet[Any]
+    interaction_history: Deque[Dict[str, Any]]
+    
+    # Hashed id arrays for vectorised membership tests
+    interest_keys: np.ndarray
+    followed_user_keys: np.ndarray
+    followed_organization_keys: np.ndarray
+    blocked_user_keys: np.ndarray
+
+
+_SEED = np.uint64(0x9E3779B97F4A7C15)
+_MULTIPLIERS = (np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB))
+
+
+def hash_keys(values: Iterable[str]) -> np.ndarray:
+    """
+    Hash strings to an int64 array for use with np.isin.
+
+    Keys are stable across processes. Strings are read as fixed-width UTF-32
+    arrays and hashed 8 bytes (two code points) per step for all strings at
+    once; trailing NUL characters are ignored.
+    """
+    chars = np.array(values if isinstance(values, list) else list(values), dtype=str)
+    if not chars.size:
+        return np.zeros(0, dtype=np.int64)
+    width = chars.dtype.itemsize // 4
+    if width % 2:
+        chars = chars.astype(f"U{width + 1}")
+    words = np.ascontiguousarray(chars.view("<u8").reshape(len(chars), -1).T)
+    # Steps past a string's end are skipped, so keys do not depend on the padded width
+    used = words != 0
+    word_counts = np.where(used.any(axis=0), len(words) - np.argmax(used[::-1], axis=0), 0)
+    with np.errstate(over="ignore"):
+        keys = np.full(len(chars), _SEED, dtype=np.uint64)
+        for step, word in enumerate(words):
+            mixed = (keys ^ word) * _MULTIPLIERS[0]
+            mixed ^= mixed >> np.uint64(29)
+            keys = np.where(word_counts > step, mixed, keys)
+        keys *= _MULTIPLIERS[1]
+        keys ^= keys >> np.uint64(32)
+    return keys.view(np.int64)
+
+
+def _lowered(values: Iterable[str]) -> FrozenSet[str]:
+    return frozenset(sys.intern(v.lower()) for v in values)
+
+
+def _interned(values: Iterable[str]) -> FrozenSet[str]:
+    return frozenset(sys.intern(v) for v in values)
+
+
+def _has_context_payload(context: BaseModel) -> bool:
+    return bool(context.model_fields_set & CONTEXT_FIELDS)
+
+
+class UserContextCache:
+    """Bounded LRU cache of prepared user contexts keyed by user_id."""
+
+    def __init__(self, max_entries: int = 50000, history_size: int = 50) -> None:
+        self._max_entries = max_entries
+        self._history_size = history_size
+        self._entries: "OrderedDict[str, PreparedUserContext]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._stale = 0
+
+    def prepare(self, context: BaseModel) -> PreparedUserContext:
+        """Normalise a ranking or feed user context without caching it."""
+        location = getattr(context, "location", None)
+        interests = _lowered(getattr(context, "interests", ()))
+        followed_users = _interned(getattr(context, "followed_users", ()))
+        followed_organizations = _interned(getattr(context, "followed_organizations", ()))
+        blocked_users = _interned(getattr(context, "blocked_users", ()))
+        return PreparedUserContext(
+            user_id=sys.intern(context.user_id),
+            version=getattr(context, "version", None),
+            persona=getattr(context, "persona", "general"),
+            location=location.lower() if location else None,
+            interests=interests,
+            skills=_lowered(getattr(context, "skills", ())),
+            followed_users=followed_users,
+            followed_organizations=followed_organizations,
+            blocked_users=blocked_users,
+            preferred_content_types=frozenset(getattr(context, "preferred_content_types", ())),
+            interaction_history=deque(getattr(context, "interaction_history", ()), maxlen=self._history_size),
+            interest_keys=hash_keys(interests),
+            followed_user_keys=hash_keys(followed_users),
+            followed_organization_keys=hash_keys(followed_organizations),
+            blocked_user_keys=hash_keys(blocked_users),
+        )
+
+    def resolve(self, context: BaseModel) -> Optional[PreparedUserContext]:
+        """
+        Prepared context for a request.
+
+        Unversioned contexts are prepared per call. Versioned contexts are
+        served from the cache, or cached when the request carries the full
+        payload. Returns None for a bare ``user_id``/``version`` request whose
+        version is not cached, so the caller can ask for a resend, and for a
+        version older than the cached one.
+        """
+        version = getattr(context, "version", None)
+        if version is None:
+            return self.prepare(context)
+        cached = self.get(context.user_id, version)
+        if cached is not None:
+            return cached
+        if not _has_context_payload(context):
+            return None
+        return self.put(context)
+
+    def get(self, user_id: str, version: int) -> Optional[PreparedUserContext]:
+        """Return the cached context if it matches the requested version."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry.version != version:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self._hits += 1
+            return entry
+
+    def put(self, context: BaseModel) -> Optional[PreparedUserContext]:
+        """
+        Prepare a context and store it under its user_id and version.
+
+        Returns None, leaving the cache unchanged, if a newer version of the
+        user's context is already cached.
+        """
+        prepared = self.prepare(context)
+        with self._lock:
+            entry = self._entries.get(prepared.user_id)
+            if entry is not None and prepared.version is not None and (entry.version or 0) > prepared.version:
+                self._stale += 1
+                return None
+            self._entries[prepared.user_id] = prepared
+            self._entries.move_to_end(prepared.user_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return prepared
+
+    def invalidate(self, user_id: str) -> bool:
+        """Drop a user's cached context."""
+        with self._lock:
+            return self._entries.pop(user_id, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit/miss counters."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "stale_rejected": self._stale,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,116 @@
+"""
+Feed scoring benchmark: per-item scoring loop vs. the array-based scorer.
+
+Run from the ml/ directory:
+    python -m src.benchmarks.feed_scoring --sizes 1000 10000 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import numpy as np
+
+from src.api.routers.feed import (
+    FEED_ITEM_TYPES,
+    FeedCandidate,
+    FeedUserContext,
+    _score_candidates,
+)
+from src.api.services.candidate_store import CandidateStore
+from src.api.services.feed_scoring import FeedCandidateArrays
+from src.api.services.user_context_cache import UserContextCache
+
+TAGS = [f"tag{i}" for i in range(200)]
+
+
+def generate_candidates(n: int, seed: int = 7) -> List[FeedCandidate]:
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+    return [
+        FeedCandidate(
+            id=f"item_{i}",
+            item_type=FEED_ITEM_TYPES[int(rng.integers(len(FEED_ITEM_TYPES)))],
+            author_id=f"author_{int(rng.integers(5000))}",
+            created_at=now - timedelta(hours=float(rng.exponential(72))),
+            like_count=int(rng.poisson(40)),
+            comment_count=int(rng.poisson(5)),
+            share_count=int(rng.poisson(2)),
+            content_quality_score=float(rng.uniform()),
+            tags=[TAGS[int(t)] for t in rng.integers(len(TAGS), size=int(rng.integers(0, 6)))],
+            is_sponsored=bool(rng.uniform() < 0.05),
+        )
+        for i in range(n)
+    ]
+
+
+def reference_score(candidate: FeedCandidate, context: FeedUserContext) -> float:
+    """Per-item scoring as previously done in the feed router."""
+    score = candidate.content_quality_score * 30
+    if candidate.author_id in context.followed_users:
+        score += 25
+    if candidate.author_id in context.followed_organizations:
+        score += 20
+    user_interests = set(i.lower() for i in context.interests)
+    candidate_tags = set(t.lower() for t in candidate.tags)
+    score += min(20, len(user_interests & candidate_tags) * 5)
+    engagement = candidate.like_count + candidate.comment_count * 2 + candidate.share_count * 3
+    score += min(15, engagement / 100)
+    age_hours = (datetime.utcnow() - candidate.created_at).total_seconds() / 3600
+    score += max(0, 10 - (age_hours / 24))
+    if candidate.item_type in context.preferred_content_types:
+        score += 5
+    return min(100, score)
+
+
+def run(sizes: List[int], repeats: int) -> None:
+    context = FeedUserContext(
+        user_id="bench_user",
+        interests=TAGS[:20],
+        followed_users=[f"author_{i}" for i in range(0, 5000, 10)],
+        followed_organizations=[f"author_{i}" for i in range(3, 5000, 50)],
+        preferred_content_types=FEED_ITEM_TYPES[:2],
+    )
+    prepared = UserContextCache().prepare(context)
+
+    print(f"{'candidates':>10} {'per-item ms':>12} {'from models ms':>15} {'from store ms':>14} {'speedup':>8} {'max diff':>9}")
+    for n in sizes:
+        candidates = generate_candidates(n)
+        store = CandidateStore(FeedCandidate, initial_capacity=n)
+        store.upsert(candidates)
+        rows, _ = store.lookup([c.id for c in candidates])
+
+        best_ref = best_models = best_store = float("inf")
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            expected = np.array([reference_score(c, context) for c in candidates])
+            t1 = time.perf_counter()
+            arrays = FeedCandidateArrays.from_candidates(candidates, FEED_ITEM_TYPES)
+            scores, _, _ = _score_candidates(arrays, prepared, time.time(), None)
+            t2 = time.perf_counter()
+            _score_candidates(FeedCandidateArrays.from_store(store, rows), prepared, time.time(), None)
+            t3 = time.perf_counter()
+            best_ref = min(best_ref, t1 - t0)
+            best_models = min(best_models, t2 - t1)
+            best_store = min(best_store, t3 - t2)
+
+        diff = float(np.max(np.abs(expected - scores))) if n else 0.0
+        print(
+            f"{n:>10} {best_ref * 1000:>12.2f} {best_models * 1000:>15.2f} {best_store * 1000:>14.2f} "
+            f"{best_ref / best_models:>7.1f}x {diff:>9.1e}"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark feed candidate scoring")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="Candidate counts")
+    parser.add_argument("--repeats", type=int, default=3, help="Repetitions per size (best is reported)")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    run(args.sizes, args.repeats)
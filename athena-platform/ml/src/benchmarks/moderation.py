@@ -0,0 +1,84 @@
+"""
+Moderation benchmark: per-term substring loop vs. the Aho-Corasick automaton.
+
+Run from the ml/ directory:
+    python -m src.benchmarks.moderation --terms 100 1000 10000 --texts 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from src.api.services.pattern_matcher import AhoCorasick
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "sho", "vi", "de", "pa", "zu", "qe", "bri", "stom", "ex"]
+CATEGORIES = ["potential_spam", "harassment", "hate_speech", "self_harm", "scam", "adult", "violence", "drugs"]
+
+
+def generate_lexicon(n: int, seed: int = 3) -> List[Tuple[str, str]]:
+    rng = np.random.default_rng(seed)
+    terms = set()
+    while len(terms) < n:
+        terms.add("".join(SYLLABLES[int(i)] for i in rng.integers(len(SYLLABLES), size=int(rng.integers(3, 6)))))
+    return [(term, CATEGORIES[int(rng.integers(len(CATEGORIES)))]) for term in sorted(terms)]
+
+
+def generate_texts(n: int, lexicon: List[Tuple[str, str]], words: int = 120, seed: int = 5) -> List[str]:
+    """Texts of random syllable words, a few of them containing lexicon terms."""
+    rng = np.random.default_rng(seed)
+    texts = []
+    for _ in range(n):
+        tokens = ["".join(SYLLABLES[int(i)] for i in rng.integers(len(SYLLABLES), size=2)) for _ in range(words)]
+        for _ in range(int(rng.poisson(0.5))):
+            tokens[int(rng.integers(words))] = lexicon[int(rng.integers(len(lexicon)))][0].upper()
+        texts.append(" ".join(tokens))
+    return texts
+
+
+def naive_categories(text: str, lexicon: List[Tuple[str, str]]) -> List[str]:
+    """One substring check per term, as the moderation endpoint previously did."""
+    text_lower = text.lower()
+    found: List[str] = []
+    for term, category in lexicon:
+        if category not in found and term in text_lower:
+            found.append(category)
+    return found
+
+
+def run(sizes: List[int], n_texts: int) -> None:
+    print(f"{'terms':>7} {'build ms':>9} {'naive ms/text':>14} {'automaton ms/text':>18} {'speedup':>8} {'agree':>6}")
+    for n in sizes:
+        lexicon = generate_lexicon(n)
+        texts = generate_texts(n_texts, lexicon)
+
+        t0 = time.perf_counter()
+        automaton = AhoCorasick(lexicon)
+        t1 = time.perf_counter()
+        expected = [naive_categories(text, lexicon) for text in texts]
+        t2 = time.perf_counter()
+        found = [automaton.categories_in(text) for text in texts]
+        t3 = time.perf_counter()
+
+        agree = all(set(a) == set(b) for a, b in zip(expected, found))
+        naive_ms = (t2 - t1) / n_texts * 1000
+        automaton_ms = (t3 - t2) / n_texts * 1000
+        print(
+            f"{n:>7} {(t1 - t0) * 1000:>9.1f} {naive_ms:>14.3f} {automaton_ms:>18.3f} "
+            f"{naive_ms / automaton_ms:>7.1f}x {str(agree):>6}"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark lexicon moderation")
+    parser.add_argument("--terms", type=int, nargs="+", default=[100, 1000, 10000], help="Lexicon sizes")
+    parser.add_argument("--texts", type=int, default=1000, help="Number of texts to moderate")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    run(args.terms, args.texts)
@@ -0,0 +1,84 @@
+"""
+Bulk moderation CLI: moderate a JSON-lines file of ContentModerationRequest records.
+
+Near-duplicate checks run in this process, in input order, against one
+window. Records are then parsed and moderated in worker processes, in chunks, and result
+lines are written as they arrive (in input order unless ``--unordered``).
+Progress goes to stderr.
+
+Run from the ml/ directory:
+    python -m src.cli.moderate --input posts.jsonl --output moderation.jsonl --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Iterator, TextIO
+
+from src.api.services.process_pool import ChunkedProcessPool, Progress
+
+
+def read_records(file: TextIO) -> Iterator[str]:
+    for line in file:
+        if line.strip():
+            yield line
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.lexicon:
+        # Read at import time by the router, in this process and in every worker
+        os.environ["MODERATION_LEXICON_PATH"] = args.lexicon
+    from src.api.routers.safety_score import _bulk_records, _moderate_records
+
+    pool = ChunkedProcessPool(_moderate_records, workers=args.workers, chunk_size=args.chunk_size)
+    last_report = [0.0]
+
+    def report(progress: Progress) -> None:
+        if time.time() - last_report[0] >= args.progress_seconds:
+            last_report[0] = time.time()
+            print(
+                f"  {progress.completed} records moderated ({progress.records_per_second:,.0f}/s)",
+                file=sys.stderr
+            )
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    counts = {"approved": 0, "flagged": 0, "error": 0}
+    start = time.time()
+    try:
+        for line, outcome in pool.map(_bulk_records(read_records(source)), ordered=not args.unordered, progress=report):
+            sink.write(line + "\n")
+            counts[outcome] += 1
+    finally:
+        pool.close()
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.time() - start
+    total = sum(counts.values())
+    print(
+        f"Moderated {total} records in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f}/s) with {pool.workers} workers: "
+        f"{counts['approved']} approved, {counts['flagged']} flagged, {counts['error']} errors",
+        file=sys.stderr
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Moderate a JSONL file of content in parallel")
+    parser.add_argument("--input", default="-", help="JSONL input path, or - for stdin")
+    parser.add_argument("--output", default="-", help="JSONL output path, or - for stdout")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Records per worker task")
+    parser.add_argument("--unordered", action="store_true", help="Write results as chunks finish")
+    parser.add_argument("--lexicon", default=None, help="Moderation lexicon YAML (default: MODERATION_LEXICON_PATH)")
+    parser.add_argument("--progress-seconds", type=float, default=5.0, help="Seconds between progress lines")
+    return parser
+
+
+if __name__ == "__main__":
+    run(build_parser().parse_args())
@@ -0,0 +1,43 @@
+import numpy as np
+
+from src.api.services.ann_index import IVFIndex
+
+
+def clustered_vectors(count, dim=32, clusters=64, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(clusters, size=count)] + 0.3 * rng.normal(size=(count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def exact_top(vectors, query, n):
+    return set(np.argsort(-(vectors @ query))[:n].tolist())
+
+
+def test_small_index_is_exact():
+    vectors = clustered_vectors(500)
+    index = IVFIndex(vectors.shape[1])
+    index.set_vectors(np.arange(len(vectors)), vectors)
+    assert not index.trained
+    for query in vectors[:20]:
+        rows, _ = index.search(query, 10)
+        assert set(rows.tolist()) == exact_top(vectors, query, 10)
+
+
+def test_ivf_recall():
+    vectors = clustered_vectors(20000)
+    index = IVFIndex(vectors.shape[1], min_train_size=4096)
+    for start in range(0, len(vectors), 5000):
+        rows = np.arange(start, start + 5000)
+        index.set_vectors(rows, vectors[rows])
+    assert index.trained
+
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(len(vectors), size=100, replace=False)]
+    found = 0
+    for query in queries:
+        rows, similarities = index.search(query, 10)
+        assert np.all(np.diff(similarities) <= 1e-6)
+        found += len(set(rows.tolist()) & exact_top(vectors, query, 10))
+    assert found / (10 * len(queries)) >= 0.9
+    assert index.stats()["mean_scanned"] < len(vectors) / 2
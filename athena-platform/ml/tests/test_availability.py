@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from src.api.services.availability import (
+    WEEK_HOURS,
+    AvailabilityBitmaps,
+    popcount,
+    weekly_bitmap,
+    weekly_overlap,
+)
+
+WINTER = datetime(2026, 1, 14, tzinfo=timezone.utc)
+SUMMER = datetime(2026, 7, 15, tzinfo=timezone.utc)
+
+
+def hours(bitmap):
+    return [h for h in range(WEEK_HOURS) if int(bitmap[h // 64]) >> (h % 64) & 1]
+
+
+def test_bitmap_spans_all_168_hours():
+    full = weekly_bitmap([(day, 0, 24) for day in range(7)], "UTC", WINTER)
+    assert popcount(full) == WEEK_HOURS
+    assert hours(weekly_bitmap([(6, 23, 24)], "UTC", WINTER)) == [167]
+    assert hours(weekly_bitmap([(1, 0, 2)], "UTC", WINTER)) == [24, 25]
+
+
+def test_local_slots_shift_to_utc_and_wrap_the_week():
+    # Monday 09:00-11:00 in Lagos (UTC+1) is Monday 08:00-10:00 UTC
+    assert hours(weekly_bitmap([(0, 9, 11)], "Africa/Lagos", WINTER)) == [8, 9]
+    # Monday 00:00-02:00 in Tokyo (UTC+9) is Sunday 15:00-17:00 UTC
+    assert hours(weekly_bitmap([(0, 0, 2)], "Asia/Tokyo", WINTER)) == [159, 160]
+
+
+def test_daylight_saving_uses_the_reference_week():
+    assert hours(weekly_bitmap([(2, 12, 13)], "Europe/London", WINTER)) == [60]
+    assert hours(weekly_bitmap([(2, 12, 13)], "Europe/London", SUMMER)) == [59]
+
+
+def test_overlap_is_vectorized_and_unknown_without_slots():
+    mentee = weekly_bitmap([(0, 8, 12)], "UTC", WINTER)
+    pool = np.stack([
+        weekly_bitmap([(0, 10, 14)], "UTC", WINTER),
+        weekly_bitmap([(0, 8, 12), (6, 22, 24)], "UTC", WINTER),
+        weekly_bitmap([(3, 8, 12)], "UTC", WINTER),
+        weekly_bitmap([], "UTC", WINTER),
+    ])
+    assert weekly_overlap(mentee, pool).tolist() == [2.0, 4.0, 0.0, np.inf]
+
+
+def test_row_aligned_bitmaps_grow_and_default_to_empty():
+    store = AvailabilityBitmaps(initial_capacity=2)
+    bitmap = weekly_bitmap([(4, 9, 17)], "UTC", WINTER)
+    store.set(np.array([5]), bitmap[None])
+
+    assert popcount(store.get(np.array([5, 1, 100]))).tolist() == [8, 0, 0]
+    stats = store.stats()
+    assert stats["profiles"] == 6 and stats["profiles_with_slots"] == 1
+    assert stats["mean_weekly_hours"] == pytest.approx(8.0)
@@ -0,0 +1,48 @@
+from typing import List
+
+import numpy as np
+from pydantic import BaseModel
+
+from src.api.services.faceted_store import FacetedStore
+
+
+class Profile(BaseModel):
+    id: str
+    skills: List[str]
+
+
+def store(*profiles):
+    pool = FacetedStore(Profile, facets={"skill": "skills"})
+    pool.upsert(Profile(id=i, skills=s) for i, s in profiles)
+    return pool
+
+
+def dense(pool, facet="skill"):
+    matrix, vocabulary = pool.facet_matrix(facet)
+    return {pool.ids([row])[0]: {v for v, c in vocabulary.items() if matrix[row, c]} for row in range(len(pool))}
+
+
+def test_upsert_keeps_matrix_until_refresh():
+    pool = store(("a", ["Python"]), ("b", ["go", "sql"]))
+    matrix, _ = pool.facet_matrix("skill")
+
+    pool.upsert([Profile(id="a", skills=["rust"]), Profile(id="c", skills=["python"])])
+    stale, _ = pool.facet_matrix("skill")
+    assert stale.shape[0] == 3
+    assert stale[:2].nnz == matrix.nnz and stale[2].nnz == 0
+
+    assert pool.refresh_matrices() == 1
+    assert dense(pool) == {"a": {"rust"}, "b": {"go", "sql"}, "c": {"python"}}
+    assert pool.refresh_matrices() == 0
+
+
+def test_columns_are_stable_across_rebuilds():
+    pool = store(("a", ["python"]), ("b", ["go"]))
+    _, before = pool.facet_matrix("skill")
+
+    pool.upsert([Profile(id="a", skills=["rust"])])
+    pool.refresh_matrices()
+    matrix, after = pool.facet_matrix("skill")
+    assert all(after[value] == column for value, column in before.items())
+    assert matrix.shape[1] == len(after) == 3
+    assert np.all(matrix[:, after["python"]].toarray() == 0)
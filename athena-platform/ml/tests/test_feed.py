@@ -0,0 +1,222 @@
+import asyncio
+import base64
+import itertools
+import json
+import random
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routers import feed
+
+NOW = "2026-10-18T10:00:00"
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.include_router(feed.router, prefix="/api/v1/feed")
+    return TestClient(app)
+
+
+def candidates(prefix, count):
+    return [
+        {"id": f"{prefix}{i}", "item_type": "post", "author_id": f"{prefix}-author{i}", "created_at": NOW}
+        for i in range(count)
+    ]
+
+
+def generate(client, context, **body):
+    return client.post("/api/v1/feed/generate", json={"user_context": context, **body})
+
+
+def item_ids(response):
+    assert response.status_code == 200, response.text
+    return {item["id"] for item in response.json()["feed_items"]}
+
+
+def encode(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+# ===========================================
+# CURSORS
+# ===========================================
+
+def test_cursor_pages_through_session(client):
+    context = {"user_id": "cursor-user", "session_id": "cursor-session"}
+    first = generate(client, context, candidates=candidates("c", 30), page_size=10)
+    cursor = first.json()["next_cursor"]
+    assert cursor is not None
+
+    second = generate(client, context, cursor=cursor, page_size=10)
+    assert second.json()["page"] == 2
+    assert item_ids(first).isdisjoint(item_ids(second))
+
+    session_key, session, offset = feed._resolve_cursor(cursor)
+    assert session_key == ("cursor-user", "home", "cursor-session")
+    assert offset == 10
+    # Sessions keep only what feed items are built from
+    assert not hasattr(session.candidates, "tags")
+    assert feed.feed_sessions.stats()["weight"] >= len(session.candidates) == 30
+
+
+@pytest.mark.parametrize("cursor", [
+    "!!!",
+    encode(5),
+    encode([["u", "home", "s"], "token"]),
+    encode([[["nested"], "home", "s"], "token", 0]),
+    encode([[{"a": 1}, "home", "s"], "token", 0]),
+    encode([["u", "home", "s"], ["token"], 0]),
+    encode([["u", "home", "s"], "token", -10]),
+    encode([["u", "home", "s"], "token", "ten"]),
+])
+def test_malformed_cursor_is_rejected(client, cursor):
+    response = generate(client, {"user_id": "cursor-user"}, cursor=cursor)
+    assert response.status_code == 400
+
+
+def test_unknown_session_is_gone(client):
+    context = {"user_id": "gone-user", "session_id": "gone-session"}
+    cursor = generate(client, context, candidates=candidates("g", 30), page_size=10).json()["next_cursor"]
+    session_key, session, offset = feed._resolve_cursor(cursor)
+
+    stale_token = encode([list(session_key), session.token + "x", offset])
+    assert generate(client, context, cursor=stale_token).status_code == 410
+    unknown_session = encode([["gone-user", "home", "other-session"], session.token, offset])
+    assert generate(client, context, cursor=unknown_session).status_code == 410
+
+
+# ===========================================
+# PRECOMPUTED FEEDS
+# ===========================================
+
+def test_inline_candidates_bypass_precomputed_feed(client):
+    store = candidates("s", 15)
+    assert client.post("/api/v1/feed/candidates", json={"candidates": store}).status_code == 200
+    store_ids = {c["id"] for c in store}
+    inline = candidates("x", 5)
+    inline_ids = {c["id"] for c in inline}
+    context = {"user_id": "precompute-user", "version": 1, "interests": ["python"]}
+
+    assert item_ids(generate(client, context, candidates=inline)) == inline_ids
+    assert item_ids(generate(client, context)) <= store_ids
+
+    asyncio.run(feed.precomputer.run_once())
+    assert feed.precomputer.get("precompute-user", "home") is not None
+
+    hits = feed.precomputer.stats()["cache"]["hits"]
+    assert item_ids(generate(client, context, candidates=inline)) == inline_ids
+    assert feed.precomputer.stats()["cache"]["hits"] == hits
+    assert item_ids(generate(client, context)) <= store_ids
+    assert feed.precomputer.stats()["cache"]["hits"] == hits + 1
+
+
+def test_only_store_requests_mark_users_active(client):
+    inline = candidates("y", 5)
+    active = feed.precomputer.stats()["active_users"]
+
+    generate(client, {"user_id": "inline-user", "version": 1, "interests": ["python"]}, candidates=inline)
+    generate(client, {"user_id": "ids-user", "version": 1, "interests": ["python"]}, candidate_ids=["y0"])
+    generate(client, {"user_id": "unversioned-user", "interests": ["python"]})
+    assert feed.precomputer.stats()["active_users"] == active
+
+    generate(client, {"user_id": "store-user", "version": 1, "interests": ["python"]})
+    assert feed.precomputer.stats()["active_users"] == active + 1
+
+
+def test_precomputed_feed_rescores_updates_and_drops_blocked_authors(client):
+    store = candidates("u", 10)
+    client.post("/api/v1/feed/candidates", json={"candidates": store})
+    context = {"user_id": "update-user", "version": 1, "interests": ["python"]}
+    generate(client, context, page_size=50)
+    asyncio.run(feed.precomputer.run_once())
+
+    def scores():
+        response = generate(client, context, page_size=50)
+        assert response.status_code == 200, response.text
+        items = [item for item in response.json()["feed_items"] if item["id"].startswith("u")]
+        assert len(items) == len({item["id"] for item in items})
+        return {item["id"]: item["score"] for item in items}
+
+    before = scores()
+    updated = {**store[3], "like_count": 5000, "share_count": 800, "content_quality_score": 1.0}
+    client.post("/api/v1/feed/candidates", json={"candidates": [updated]})
+    client.post("/api/v1/feed/follow-graph", json={"users": [{"user_id": "update-user", "blocked_users": ["u-author5"]}]})
+
+    hits = feed.precomputer.stats()["cache"]["hits"]
+    after = scores()
+    assert feed.precomputer.stats()["cache"]["hits"] == hits + 1
+    assert after["u3"] > before["u3"]
+    assert "u5" in before and "u5" not in after
+
+
+def test_follow_graph_is_read_once_per_request(client, monkeypatch):
+    client.post("/api/v1/feed/follow-graph", json={"users": [
+        {"user_id": "graph-user", "followed_users": ["g-author3"], "blocked_users": ["g-author1"]},
+    ]})
+    calls = []
+    author_masks = feed.follow_graph.author_masks
+    monkeypatch.setattr(feed.follow_graph, "author_masks", lambda *args: calls.append(args) or author_masks(*args))
+
+    response = generate(client, {"user_id": "graph-user"}, candidates=candidates("g", 5), page_size=10)
+    reasons = {item["id"]: item["reason"] for item in response.json()["feed_items"]}
+    assert len(calls) == 1
+    assert "g1" not in reasons
+    assert reasons["g3"] == "From someone you follow"
+
+
+def test_candidate_store_tracks_changed_rows():
+    store = feed.CandidateStore(feed.FeedCandidate, initial_capacity=2)
+    records = [feed.FeedCandidate(**candidate) for candidate in candidates("v", 3)]
+    store.upsert(records)
+    version = store.version
+    assert store.changed_since(version).tolist() == []
+
+    store.upsert([records[1].model_copy(update={"like_count": 3})])
+    store.upsert([feed.FeedCandidate(**candidates("w", 1)[0])])
+    assert store.changed_since(version).tolist() == [1, 3]
+    assert store.changed_since(0).tolist() == [0, 1, 2, 3]
+
+
+# ===========================================
+# DIVERSITY
+# ===========================================
+
+def feed_items(spec):
+    return [
+        feed.FeedItem(id=str(i), item_type=item_type, score=1.0, position=0, reason="recommended", author_id=author)
+        for i, (item_type, author) in enumerate(spec)
+    ]
+
+
+def longest_run(values):
+    return max((len(list(group)) for _, group in itertools.groupby(values)), default=0)
+
+
+def test_type_runs_hold_whenever_possible():
+    rng = random.Random(3)
+    limit = feed.MAX_TYPE_RUN
+    for _ in range(2000):
+        types = rng.sample(["post", "video", "job", "course"], rng.randint(1, 4))
+        weights = [rng.random() for _ in types]
+        spec = [(rng.choices(types, weights)[0], f"author{i}") for i in range(rng.randint(1, 40))]
+        result = feed._ensure_diversity(feed_items(spec))
+
+        assert sorted(int(item.id) for item in result) == list(range(len(spec)))
+        counts = [sum(t == item_type for t, _ in spec) for item_type in types]
+        if all(count <= limit * (len(spec) - count + 1) for count in counts):
+            assert longest_run(item.item_type for item in result) <= limit
+
+
+def test_runs_carry_across_pages():
+    runs = feed.RunState()
+    first = feed._ensure_diversity(feed_items([("post", "a"), ("post", "b"), ("post", "c")]), runs)
+    second = feed._ensure_diversity(feed_items([("post", "d"), ("video", "a")]), runs)
+    assert [item.item_type.value for item in first + second] == ["post", "post", "post", "video", "post"]
+
+
+def test_author_runs_are_broken_on_short_pages():
+    result = feed._ensure_diversity(feed_items([("post", "a"), ("post", "a"), ("post", "a"), ("post", "b")]))
+    assert [item.author_id for item in result] == ["a", "a", "b", "a"]
@@ -0,0 +1,54 @@
+from collections import Counter
+
+import numpy as np
+
+from src.api.services.feed_mixer import FeedMixer, assign_buckets
+
+
+def mixer(sizes, ratios, seed=0):
+    names = list(sizes)
+    buckets = np.repeat(np.arange(len(names)), list(sizes.values()))
+    scores = np.random.default_rng(seed).random(len(buckets))
+    return FeedMixer(scores, buckets, names, ratios), buckets, scores
+
+
+def test_assign_buckets_follows_priority_and_fallback():
+    masks = {
+        "following": np.array([True, True, False, False]),
+        "jobs": np.array([False, True, True, False]),
+        "trending": np.array([True, False, True, False]),
+    }
+    names, buckets = assign_buckets(masks, {"following": 0.5, "jobs": 0.3, "recommended": 0.2}, 4)
+    assert [names[b] for b in buckets] == ["following", "following", "jobs", "recommended"]
+
+    # Without "recommended" the largest bucket takes the rest and yields to the others
+    names, buckets = assign_buckets(masks, {"trending": 0.2, "jobs": 0.6}, 4)
+    assert [names[b] for b in buckets] == ["trending", "jobs", "trending", "jobs"]
+
+
+def test_ratios_hold_within_and_across_pages():
+    feed, _, _ = mixer({"following": 100, "jobs": 100, "trending": 100}, {"following": 0.5, "jobs": 0.3, "trending": 0.2})
+    served = Counter()
+    for page in range(5):
+        served.update(name for _, name in feed.next_page(10))
+        total = 10 * (page + 1)
+        for name, ratio in {"following": 0.5, "jobs": 0.3, "trending": 0.2}.items():
+            assert abs(served[name] - ratio * total) <= 1
+
+
+def test_buckets_are_served_best_first_and_exhausted_buckets_give_way():
+    feed, buckets, scores = mixer({"following": 3, "jobs": 20}, {"following": 0.5, "jobs": 0.5})
+    picks = [index for _ in range(3) for index, _ in feed.next_page(8)]
+    assert len(picks) == len(set(picks)) == 23
+    assert feed.remaining == 0
+    for bucket in (0, 1):
+        served = [scores[i] for i in picks if buckets[i] == bucket]
+        assert served == sorted(served, reverse=True)
+
+
+def test_sponsored_items_never_fill_a_page_alone():
+    feed, _, _ = mixer({"sponsored": 5, "following": 2}, {"sponsored": 0.1, "following": 0.9})
+    page = feed.next_page(10)
+    assert [name for _, name in page].count("following") == 2
+    assert feed.remaining == 0
+    assert feed.next_page(10) == []
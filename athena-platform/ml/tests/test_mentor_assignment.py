@@ -0,0 +1,56 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from src.api.services.mentor_assignment import auction_assign, top_k_edges
+
+
+def random_graph(seed, mentees=60, mentors=15, k=5):
+    rng = np.random.default_rng(seed)
+    scores = rng.uniform(0, 1, size=(mentees, mentors))
+    columns, values = top_k_edges(lambda start, stop: scores[start:stop].copy(), mentees, mentors, k, min_score=0.2)
+    capacity = rng.integers(0, 4, size=mentors)
+    return columns, values, capacity
+
+
+def test_assignment_is_feasible():
+    for seed in range(10):
+        columns, values, capacity = random_graph(seed)
+        result = auction_assign(columns, values, capacity)
+
+        assigned = np.flatnonzero(result.mentor >= 0)
+        counts = np.bincount(result.mentor[assigned], minlength=len(capacity))
+        assert np.all(counts <= capacity)
+        for mentee in assigned:
+            edge = np.flatnonzero(columns[mentee] == result.mentor[mentee])
+            assert len(edge) == 1
+            assert np.isfinite(values[mentee, edge[0]])
+            assert result.score[mentee] == values[mentee, edge[0]]
+        assert np.all(np.isnan(result.score[result.mentor < 0]))
+
+
+def test_assignment_is_near_optimal():
+    epsilon = 0.01
+    for seed in range(10):
+        columns, values, capacity = random_graph(seed)
+        result = auction_assign(columns, values, capacity, epsilon=epsilon)
+
+        # Exact optimum: one column per mentor slot, missing edges worth 0 (unassigned)
+        slots = np.repeat(np.arange(len(capacity)), capacity)
+        benefit = np.zeros((len(columns), len(slots)))
+        for mentee, (row_columns, row_values) in enumerate(zip(columns, values)):
+            for mentor, value in zip(row_columns, row_values):
+                if mentor >= 0:
+                    benefit[mentee, slots == mentor] = value
+        rows, cols = linear_sum_assignment(benefit, maximize=True)
+        optimum = benefit[rows, cols].sum()
+
+        total = np.nansum(result.score)
+        assert total <= optimum + 1e-9
+        assert total >= optimum - len(columns) * epsilon
+
+
+def test_mentees_without_edges_stay_unassigned():
+    columns = np.array([[0, -1], [-1, -1]])
+    values = np.array([[0.5, -np.inf], [-np.inf, -np.inf]])
+    result = auction_assign(columns, values, np.array([1]))
+    assert result.mentor.tolist() == [0, -1]
@@ -0,0 +1,54 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.api.routers import mentor_match
+from src.api.routers.mentor_match import MenteeProfile, MentorUpsertRequest
+from src.benchmarks.mentor_retrieval import generate_mentors
+
+
+@pytest.fixture(scope="module")
+def large_pool():
+    mentors = generate_mentors(800)
+    niche = [
+        m.model_copy(update={
+            "user_id": f"niche_{i}",
+            "industry": "agriculture",
+            "expertise_areas": ["beekeeping"],
+            "languages": ["Shona"],
+        })
+        for i, m in enumerate(mentors[:30])
+    ]
+    asyncio.run(mentor_match.upsert_mentors(MentorUpsertRequest(mentors=mentors + niche)))
+    assert len(mentor_match.mentor_pool) > mentor_match.MATCH_RECALL_N
+    return mentors, niche
+
+
+def mentee(**fields):
+    profile = {
+        "user_id": "mentee",
+        "industry": "technology",
+        "role": "engineer",
+        "experience_years": 2,
+        "skills": ["data engineering"],
+        "goals": ["skill_development"],
+    }
+    return MenteeProfile(**{**profile, **fields})
+
+
+def test_large_pool_keeps_facet_filter(large_pool):
+    _, niche = large_pool
+    rows = mentor_match._retrieve_mentors(mentee(industry="agriculture", skills=["beekeeping"], languages=["Shona"]))
+    assert set(mentor_match.mentor_pool.ids(rows)) == {m.user_id for m in niche}
+
+
+def test_large_facet_match_is_narrowed_by_embeddings(large_pool):
+    profile = mentee(languages=["English"])
+    rows = mentor_match._retrieve_mentors(profile)
+    assert 0 < len(rows) <= mentor_match.MATCH_RECALL_N * mentor_match.MATCH_RECALL_OVERFETCH
+    facet_rows = mentor_match.mentor_pool.retrieve({
+        "expertise": profile.skills, "industry": [profile.industry], "language": profile.languages, "style": [],
+    })
+    assert len(facet_rows) > mentor_match.MATCH_RECALL_N
+    assert np.all(np.isin(rows, facet_rows))
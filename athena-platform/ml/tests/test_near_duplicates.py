@@ -0,0 +1,57 @@
+import time
+
+from src.api.services.near_duplicates import NearDuplicateIndex
+
+SPAM = "Join my exclusive group and earn five thousand dollars a week from home, message me now"
+OTHER = "Looking for advice on moving from backend engineering into product management next year"
+
+
+def variant(i):
+    return f"{SPAM} {'!' * i} friend{i}"
+
+
+def test_cluster_of_copies_across_authors():
+    index = NearDuplicateIndex(max_posts=1000)
+    now = time.time() - 100
+    clusters = [index.observe(f"c{i}", f"u{i % 3}", variant(i), now + i) for i in range(5)]
+    assert [c.size for c in clusters] == [1, 2, 3, 4, 5]
+    assert clusters[-1].authors == 3
+    assert set(clusters[-1].similar_ids) == {"c0", "c1", "c2", "c3"}
+
+    unrelated = index.observe("other", "u9", OTHER, now + 10)
+    assert unrelated.size == 1 and unrelated.similar_ids == []
+
+
+def test_short_texts_are_not_indexed():
+    index = NearDuplicateIndex(max_posts=1000)
+    for i in range(5):
+        assert index.observe(f"c{i}", f"u{i}", "Congratulations!!").size == 1
+    assert index.stats()["posts_in_window"] == 0
+    assert index.stats()["skipped_short"] == 5
+
+
+def test_posts_outside_the_window_expire():
+    index = NearDuplicateIndex(max_posts=1000, window_seconds=60)
+    now = time.time() - 1000
+    index.observe("old", "u1", variant(0), now)
+    assert index.observe("new", "u2", variant(1), now + 120).size == 1
+    assert index.stats()["posts_in_window"] == 1
+
+
+def test_out_of_order_posts():
+    index = NearDuplicateIndex(max_posts=1000, window_seconds=3600)
+    now = time.time() - 1000
+    for i in range(3):
+        index.observe(f"c{i}", f"u{i}", variant(i), now + i)
+
+    # A backfilled copy from hours ago is not compared with current posts and does not evict them
+    backfilled = index.observe("backfill", "u7", variant(3), now - 3 * 3600)
+    assert backfilled.size == 1
+    assert index.stats()["posts_in_window"] == 3
+
+    # A future timestamp does not move the window ahead
+    index.observe("future", "u8", OTHER, time.time() + 10 * 3600)
+    assert index.observe("c3", "u3", variant(4), now + 5).size == 4
+
+    # A late post inside the window is still matched
+    assert index.observe("late", "u4", variant(5), now - 600).size == 5
@@ -0,0 +1,48 @@
+import random
+
+from src.api.services.pattern_matcher import AhoCorasick
+
+
+def naive_matches(patterns, text):
+    text = text.lower()
+    found = set()
+    for term, category in patterns:
+        term = term.strip().lower()
+        start = text.find(term)
+        while term and start >= 0:
+            found.add((start, start + len(term), category))
+            start = text.find(term, start + 1)
+    return found
+
+
+def random_patterns(rng, count):
+    # A small alphabet makes overlapping and nested terms common
+    return [
+        ("".join(rng.choice("abcA") for _ in range(rng.randint(1, 5))), rng.choice(["spam", "scam", "harassment"]))
+        for _ in range(count)
+    ]
+
+
+def test_matches_agree_with_naive_search():
+    rng = random.Random(7)
+    for _ in range(200):
+        patterns = random_patterns(rng, rng.randint(1, 12))
+        automaton = AhoCorasick(patterns)
+        text = "".join(rng.choice("abcAB ") for _ in range(rng.randint(0, 60)))
+        assert set(automaton.matches(text)) == naive_matches(patterns, text)
+
+
+def test_categories_in_agree_with_naive_search():
+    rng = random.Random(11)
+    for _ in range(200):
+        patterns = random_patterns(rng, rng.randint(1, 12))
+        automaton = AhoCorasick(patterns)
+        text = "".join(rng.choice("abcAB ") for _ in range(rng.randint(0, 60)))
+        expected = {category for _, _, category in naive_matches(patterns, text)}
+        assert set(automaton.categories_in(text)) == expected
+
+
+def test_empty_terms_are_ignored():
+    automaton = AhoCorasick([("", "spam"), ("  ", "scam"), ("Free", "spam")])
+    assert automaton.matches("FREE free") == [(0, 4, "spam"), (5, 9, "spam")]
+    assert automaton.categories_in("nothing here") == []
@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routers import feed, ranker
+from src.api.services.candidate_store import CandidateStore
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.include_router(ranker.router, prefix="/api/v1/ranker")
+    return TestClient(app)
+
+
+CANDIDATES = [
+    {"id": "r1", "content_type": "job", "features": {"tags": ["Python"], "required_skills": ["SQL"], "location": "Lagos"}},
+    {"id": "r2", "content_type": "post", "features": {"tags": ["design"], "engagement_rate": 0.9}},
+    {"id": "r3", "content_type": "course", "features": {"freshness_score": 1.0}},
+]
+USER = {"user_id": "ranker-user", "interests": ["python"], "skills": ["sql"], "location": "lagos"}
+
+
+def rank(client, **body):
+    response = client.post("/api/v1/ranker/rank", json={"user_context": USER, "diversity_factor": 0, **body})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_stored_candidates_rank_like_inline_ones(client):
+    client.post("/api/v1/ranker/candidates", json={"candidates": CANDIDATES})
+    inline = rank(client, candidates=CANDIDATES)["ranked_items"]
+    stored = rank(client, candidate_ids=["r3", "missing", "r1", "r2"])
+    assert stored["missing_candidate_ids"] == ["missing"]
+    assert stored["ranked_items"] == inline
+
+
+def test_interests_match_tags_case_insensitively(client):
+    items = {item["id"]: item for item in rank(client, candidates=CANDIDATES)["ranked_items"]}
+    assert items["r1"]["score_breakdown"]["interest_match"] == 10
+    assert items["r1"]["score_breakdown"]["skill_match"] == 8
+    assert items["r2"]["score_breakdown"]["interest_match"] == 0
+
+
+def test_materialized_timestamps_are_utc():
+    created_at = datetime(2026, 10, 18, 10, 0, tzinfo=timezone.utc)
+    store = CandidateStore(feed.FeedCandidate)
+    store.upsert([feed.FeedCandidate(id="c", item_type="post", author_id="a", created_at=created_at)])
+    restored, = store.materialize(store.lookup(["c"])[0])
+    assert restored.created_at == created_at and restored.created_at.tzinfo is not None
@@ -0,0 +1,43 @@
+from src.api.services.recommendation_cache import RecommendationCache, request_digest
+
+
+def test_digest_is_stable_and_order_insensitive_for_mappings():
+    assert request_digest({"a": 1, "b": [2, 3]}, 5) == request_digest({"b": [2, 3], "a": 1}, 5)
+    assert request_digest({"a": 1}, 5) != request_digest({"a": 2}, 5)
+
+
+def test_only_entries_with_a_changed_mentor_are_dropped():
+    cache = RecommendationCache()
+    cache.set("m1", ["r1"], ["a", "b"])
+    cache.set("m2", ["r2"], ["b", "c"])
+    cache.set("m3", ["r3"], ["d"])
+
+    assert cache.invalidate_mentors(["b", "b"]) == 2
+    assert cache.get("m1") is None and cache.get("m2") is None
+    assert cache.get("m3") == ["r3"]
+    # The dropped entries no longer hold their other mentors in the index
+    assert cache.invalidate_mentors(["a", "c"]) == 0
+    stats = cache.stats()
+    assert stats["indexed_mentors"] == 1 and stats["reverse_links"] == 1
+    assert stats["invalidated_entries"] == 2 and stats["max_fan_out"] == 2
+
+
+def test_replacing_an_entry_relinks_its_mentors():
+    cache = RecommendationCache()
+    cache.set("m1", ["old"], ["a"])
+    cache.set("m1", ["new"], ["b"])
+
+    assert cache.invalidate_mentors(["a"]) == 0
+    assert cache.get("m1") == ["new"]
+    assert cache.invalidate_mentors(["b"]) == 1
+
+
+def test_evicted_entries_leave_the_reverse_index():
+    cache = RecommendationCache(max_entries=2)
+    for i in range(5):
+        cache.set(f"m{i}", [i], [f"mentor{i}", "shared"])
+
+    stats = cache.stats()
+    assert stats["indexed_mentors"] == 3  # two mentors of their own plus "shared"
+    assert stats["reverse_links"] == 4
+    assert cache.invalidate_mentors(["shared"]) == 2
@@ -0,0 +1,53 @@
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+from src.api.routers import safety_score
+from src.api.routers.safety_score import SafetySignal, UserSafetyProfile
+
+
+def report(user_id, signal_type, value, confidence=1.0):
+    signal = SafetySignal(signal_type=signal_type, signal_name="test", value=value, confidence=confidence)
+    return asyncio.run(safety_score.report_safety_signal(user_id, signal))
+
+
+@pytest.mark.parametrize("user_id, signals", [
+    # Pushes behavior below 0 before bringing it back
+    ("reported", [("report", -1.0)] * 4 + [("report", 1.0)]),
+    ("mixed", [("verification", 0.8), ("interaction", -0.5), ("content", -1.0), ("behavioral", 0.3)]),
+    # Pushes content above 100 before bringing it back
+    ("saturated", [("content", 1.0)] * 8 + [("content", -1.0)] * 3),
+])
+def test_incremental_score_matches_fresh_score(user_id, signals):
+    profile = UserSafetyProfile(user_id=user_id, account_age_days=30, report_count_received=4)
+    safety_score._cached_user_safety(profile)
+
+    for signal_type, value in signals:
+        assert report(user_id, signal_type, value, confidence=0.9)["impact"] == "score_updated"
+
+    incremental = safety_score._cached_user_safety(profile)
+    fresh = safety_score._calculate_user_safety(profile)
+    assert incremental.safety_score == pytest.approx(fresh.safety_score, abs=0.1)
+    assert incremental.risk_level == fresh.risk_level
+    for name, value in fresh.components.items():
+        assert incremental.components[name] == pytest.approx(value, abs=0.1)
+
+
+def test_signal_without_cached_score_waits_for_recalculation():
+    result = report("uncached-user", "report", -1.0)
+    assert result["impact"] == "pending_recalculation"
+    fresh = safety_score._calculate_user_safety(UserSafetyProfile(user_id="uncached-user", account_age_days=30))
+    baseline = safety_score._calculate_user_safety(UserSafetyProfile(user_id="never-reported", account_age_days=30))
+    assert fresh.components["behavior"] < baseline.components["behavior"]
+
+
+def test_near_duplicate_index_is_created_on_first_use():
+    code = (
+        "from src.api.routers import safety_score as s\n"
+        "assert s._near_duplicates is None\n"
+        "s._is_near_duplicate('p1', 'a1', 'buy followers now at the best price in town', None)\n"
+        "assert s._near_duplicates is not None\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,50 @@
+from src.api.services.seen_filter import SeenItemFilter
+from src.api.services.user_context_cache import hash_keys
+
+DAY = 86400.0
+START = 1000 * DAY  # start of a period
+
+
+def seen(filter_, user_id, ids, now):
+    return filter_.seen_mask(user_id, hash_keys(ids), now=now).tolist()
+
+
+def test_marked_items_are_seen_with_few_false_positives():
+    filter_ = SeenItemFilter()
+    shown = [f"item{i}" for i in range(500)]
+    filter_.mark_seen("u", shown, now=START)
+
+    assert all(seen(filter_, "u", shown, START))
+    false_positives = sum(seen(filter_, "u", [f"other{i}" for i in range(5000)], START))
+    assert false_positives / 5000 < 0.01
+    assert not any(seen(filter_, "someone-else", shown, START))
+
+
+def test_items_expire_after_the_generations_rotate():
+    filter_ = SeenItemFilter(generations=2, period_seconds=DAY)
+    filter_.mark_seen("u", ["early"], now=START + 0.9 * DAY)
+    filter_.mark_seen("u", ["late"], now=START + 1.5 * DAY)
+
+    # Still filtered during the next period, gone one period later
+    assert seen(filter_, "u", ["early", "late"], START + 1.9 * DAY) == [True, True]
+    assert seen(filter_, "u", ["early", "late"], START + 2.1 * DAY) == [False, True]
+    assert seen(filter_, "u", ["early", "late"], START + 3.1 * DAY) == [False, False]
+
+
+def test_long_idle_users_lose_every_generation():
+    filter_ = SeenItemFilter(generations=3, period_seconds=DAY)
+    filter_.mark_seen("u", ["a"], now=START)
+    assert seen(filter_, "u", ["a"], START + 10 * DAY) == [False]
+
+
+def test_users_are_evicted_least_recently_used_first():
+    filter_ = SeenItemFilter(max_users=2)
+    filter_.mark_seen("a", ["x"], now=START)
+    filter_.mark_seen("b", ["x"], now=START)
+    seen(filter_, "a", ["x"], START)
+    filter_.mark_seen("c", ["x"], now=START)
+
+    assert filter_.stats()["evictions"] == 1
+    assert seen(filter_, "a", ["x"], START) == [True]
+    assert seen(filter_, "b", ["x"], START) == [False]
+    assert filter_.stats()["bytes_per_user"] == 2 * 8192 // 8 + 200
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.api.services.signal_store import DecayedSignalStore
+
+DAY = 86400.0
+
+
+def test_signals_decay_with_half_life():
+    store = DecayedSignalStore(["report"], half_life_days=30.0)
+    now = time.time()
+    store.record("u", "report", 4.0, confidence=0.5, at=now - 30 * DAY)
+    values = store.aggregates("u", now=now)["report"]
+    assert values["sum"] == pytest.approx(1.0, rel=1e-5)
+    assert values["confidence"] == pytest.approx(0.25, rel=1e-5)
+    assert values["count"] == 1
+
+
+def test_out_of_order_signals_decay_by_their_own_age():
+    now = time.time()
+    times = [now - 10 * DAY, now - 40 * DAY, now - 1 * DAY, now - 70 * DAY]
+    in_order = DecayedSignalStore(["report"])
+    shuffled = DecayedSignalStore(["report"])
+    for at in sorted(times):
+        in_order.record("u", "report", 1.0, at=at)
+    for at in times:
+        shuffled.record("u", "report", 1.0, at=at)
+
+    expected = sum(in_order.decay(now - at) for at in times)
+    assert shuffled.sums("u", now=now)["report"] == pytest.approx(expected, rel=1e-5)
+    assert in_order.sums("u", now=now)["report"] == pytest.approx(expected, rel=1e-5)
+
+
+def test_future_signals_are_clamped_to_now():
+    store = DecayedSignalStore(["report"])
+    store.record("u", "report", 1.0, at=time.time() + 365 * DAY)
+    assert store.sums("u")["report"] == pytest.approx(1.0, rel=1e-5)
+
+
+def test_stop_waits_for_a_periodic_save(tmp_path, monkeypatch):
+    store = DecayedSignalStore(["report"])
+    store.record("u", "report", 1.0)
+    saving = threading.Event()
+    calls = []
+    save = DecayedSignalStore.save
+
+    def slow_save(self, path):
+        calls.append("start")
+        saving.set()
+        time.sleep(0.2)
+        save(self, path)
+        calls.append("end")
+
+    monkeypatch.setattr(DecayedSignalStore, "save", slow_save)
+
+    async def run():
+        await store.start(tmp_path / "signals.npz", interval_seconds=0.01)
+        await asyncio.to_thread(saving.wait)
+        await store.stop()
+
+    asyncio.run(run())
+    assert calls == ["start", "end", "start", "end"]
+    restored = DecayedSignalStore(["report"])
+    assert restored.load(tmp_path / "signals.npz")
+    assert restored.sums("u")["report"] == pytest.approx(1.0, rel=1e-3)
@@ -0,0 +1,111 @@
+import asyncio
+import math
+import threading
+import time
+
+import pytest
+
+from src.api.services.trending import DecayedTopK, TrendingEngine
+
+HOUR = 3600.0
+
+
+# ===========================================
+# COUNT-MIN SKETCH
+# ===========================================
+
+def test_sketch_never_underestimates():
+    topk = DecayedTopK(capacity=8, width=64, depth=3)
+    counts = {f"k{i}": float(i % 7 + 1) for i in range(500)}
+    for key, count in counts.items():
+        topk.add(key, count)
+    assert all(topk.estimate(key) >= count for key, count in counts.items())
+
+
+def test_heavy_hitters_are_tracked_exactly_enough():
+    topk = DecayedTopK(capacity=4)
+    for i in range(200):
+        topk.add(f"light{i}", 1.0)
+        if i % 4 == 0:
+            topk.add("heavy", 10.0)
+    assert len(topk.top) == 4
+    key, count = topk.largest(1)[0]
+    assert key == "heavy" and count == pytest.approx(500.0)
+
+
+# ===========================================
+# FORWARD DECAY
+# ===========================================
+
+def test_counts_halve_every_half_life():
+    engine = TrendingEngine(half_life_hours=6.0)
+    start = engine._landmark
+    engine.record("a", tags=["Python"], weight=8.0, now=start)
+
+    (_, count), = engine.top_items(1, now=start + 6 * HOUR)
+    assert count == pytest.approx(4.0)
+    (tag, count), = engine.top_tags(1, now=start + 12 * HOUR + 1)
+    assert tag == "python" and count == pytest.approx(2.0, rel=1e-3)
+
+
+def test_recent_engagement_outranks_older_engagement():
+    engine = TrendingEngine(half_life_hours=1.0)
+    start = engine._landmark
+    engine.record("old", weight=3.0, now=start)
+    engine.record("new", weight=2.0, now=start + HOUR)
+    assert [key for key, _ in engine.top_items(2, now=start + HOUR)] == ["new", "old"]
+
+
+def test_landmark_moves_before_overflow():
+    engine = TrendingEngine(half_life_hours=1.0)
+    start = engine._landmark
+    engine.record("a", weight=1.0, now=start)
+    later = start + 400 * HOUR  # exponent well past the rescale limit
+    engine.record("b", weight=1.0, now=later)
+
+    assert engine._landmark == later
+    top = dict(engine.top_items(2, now=later))
+    assert top["b"] == pytest.approx(1.0)
+    assert math.isfinite(top["a"]) and top["a"] < 1e-100
+
+
+# ===========================================
+# SNAPSHOTS
+# ===========================================
+
+def test_snapshot_round_trip(tmp_path):
+    engine = TrendingEngine()
+    now = engine._landmark
+    engine.record("a", tags=["go"], weight=5.0, now=now)
+    engine.save(tmp_path / "trending.npz")
+
+    restored = TrendingEngine()
+    assert restored.load(tmp_path / "trending.npz")
+    assert restored.top_items(1, now=now) == pytest.approx(engine.top_items(1, now=now))
+    assert not TrendingEngine(half_life_hours=1.0).load(tmp_path / "trending.npz")
+
+
+def test_stop_waits_for_a_periodic_save(tmp_path, monkeypatch):
+    engine = TrendingEngine()
+    saving = threading.Event()
+    calls = []
+    save = TrendingEngine.save
+
+    def slow_save(self, path):
+        calls.append("start")
+        saving.set()
+        time.sleep(0.2)
+        save(self, path)
+        calls.append("end")
+
+    monkeypatch.setattr(TrendingEngine, "save", slow_save)
+
+    async def run():
+        await engine.start(tmp_path / "trending.npz", interval_seconds=0.01)
+        await asyncio.to_thread(saving.wait)
+        await engine.stop()
+
+    asyncio.run(run())
+    # The periodic save finished before the final one started
+    assert calls == ["start", "end", "start", "end"]
+    assert TrendingEngine().load(tmp_path / "trending.npz")
@@ -0,0 +1,43 @@
+from src.api.services.ttl_cache import TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire():
+    clock = Clock()
+    cache = TTLCache(max_entries=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_total_weight_is_bounded():
+    evicted = []
+    cache = TTLCache(
+        max_entries=10, ttl_seconds=60, weigher=len, max_weight=10,
+        on_evict=lambda key, value: evicted.append(key)
+    )
+    cache.set("a", [0] * 4)
+    cache.set("b", [0] * 4)
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.set("c", [0] * 4)
+    assert evicted == ["b"]
+    assert cache.stats()["weight"] == 8
+
+    cache.set("a", [0] * 1)
+    assert cache.stats()["weight"] == 5
+    cache.pop("c")
+    assert cache.stats()["weight"] == 1
+
+    # A single entry heavier than the bound is kept on its own
+    cache.set("d", [0] * 20)
+    assert len(cache) == 1 and cache.get("d") is not None
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routers import ranker
+from src.api.routers.ranker import UserContext
+from src.api.services.user_context_cache import UserContextCache, hash_keys
+
+CANDIDATES = [{"id": "v1", "content_type": "post", "features": {"tags": ["go"]}}]
+
+
+def rank(client, context):
+    return client.post("/api/v1/ranker/rank", json={"user_context": context, "candidates": CANDIDATES})
+
+
+def test_versions_are_cached_and_replaced_by_newer_ones():
+    cache = UserContextCache()
+    assert cache.resolve(UserContext(user_id="u", version=1, interests=["Go"])).interests == {"go"}
+    assert cache.resolve(UserContext(user_id="u", version=1)).interests == {"go"}
+    assert cache.resolve(UserContext(user_id="u", version=2)) is None
+
+    cache.resolve(UserContext(user_id="u", version=2, interests=["Rust"]))
+    assert cache.resolve(UserContext(user_id="u", version=2)).interests == {"rust"}
+
+
+def test_late_older_version_does_not_replace_newer_one():
+    cache = UserContextCache()
+    cache.resolve(UserContext(user_id="u", version=5, interests=["rust"]))
+    assert cache.resolve(UserContext(user_id="u", version=4, interests=["go"])) is None
+    assert cache.get("u", 5).interests == {"rust"}
+    assert cache.stats()["stale_rejected"] == 1
+
+
+def test_conflicting_versions_return_409():
+    app = FastAPI()
+    app.include_router(ranker.router, prefix="/api/v1/ranker")
+    client = TestClient(app)
+
+    assert rank(client, {"user_id": "409-user", "version": 1}).status_code == 409
+    assert rank(client, {"user_id": "409-user", "version": 2, "interests": ["go"]}).status_code == 200
+    assert rank(client, {"user_id": "409-user", "version": 2}).status_code == 200
+    assert rank(client, {"user_id": "409-user", "version": 1, "interests": ["python"]}).status_code == 409
+    assert rank(client, {"user_id": "409-user", "version": 2}).status_code == 200
+
+
+def test_hash_keys_are_stable_across_processes():
+    code = "from src.api.services.user_context_cache import hash_keys; print(hash_keys(['a', 'user-1']).tolist())"
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True,
+            env={**os.environ, "PYTHONHASHSEED": seed}
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert outputs == {f"{hash_keys(['a', 'user-1']).tolist()}\n"}
+
+
+def test_hash_keys_do_not_depend_on_batch():
+    values = ["u3", "é", "", "a much longer identifier than the others"]
+    alone = [int(hash_keys([v])[0]) for v in values]
+    assert hash_keys(values).tolist() == alone
+    assert hash_keys(v for v in values).tolist() == alone
+    assert len(set(alone)) == len(alone)